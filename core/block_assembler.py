@@ -0,0 +1,149 @@
+import asyncio
+import re
+from typing import Callable
+
+from core.chat_classifier import ChatCategory, classify, BLOCK_CATEGORIES
+from core.colors import Color
+from core.config import SettingsConfig
+
+__all__ = ("BlockAssembler",)
+
+# The line right after the opening dashes (or a few lines further down for /g info,
+# which starts with the centered guild name) tells us which command the block belongs to.
+_HEADERS = (
+    (ChatCategory.GUILD_LIST, re.compile(r"^Guild Name: ")),
+    (ChatCategory.GUILD_TOP, re.compile(r"Top Guild Experience")),
+    (ChatCategory.NO_GUILD_EXPERIENCE, re.compile(r"No one earned guild experience on")),
+    (ChatCategory.GUILD_INFO, re.compile(r"^Created: ")),
+)
+# content lines to look at before giving up on an unknown block
+_HEADER_LINES = 4
+# blocks that are only worth anything complete, a cut off one is dropped instead
+_WHOLE_BLOCKS = frozenset((ChatCategory.GUILD_INFO, ChatCategory.GUILD_LIST))
+
+
+def _is_open(line: str) -> bool:
+    return line.startswith("-----") and line.endswith("-----")
+
+
+def _is_close(line: str) -> bool:
+    return line.startswith("----------") or line.endswith("----------")
+
+
+class BlockAssembler:
+    """
+    Frames dash-delimited command output (/g info, /g list, /g top) into one block.
+
+    Lives on the asyncio loop. A block is flushed as soon as its closing dashes
+    arrive, when `timeout` seconds pass after the opening line, or when it grows past
+    `max_lines`. Blocks that never identify themselves by a known header are dropped.
+
+    After flushing or dropping a block early the assembler drains: the rest of that
+    block, up to and including its real closing dashes, is swallowed, so the close
+    isn't mistaken for the start of a new block. /g info and /g list are only emitted
+    on their real close, a cut off one is dropped.
+    """
+
+    def __init__(
+            self,
+            emit: Callable[[str, ChatCategory], None],
+            *,
+            timeout: float = 3.0,
+            max_lines: int = 100,
+    ):
+        self.emit = emit
+        self.timeout = timeout
+        self.max_lines = max_lines
+        self._lines: list[str] = []
+        self._category: ChatCategory | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        self._draining = False
+
+    @property
+    def open(self) -> bool:
+        return bool(self._lines)
+
+    @property
+    def draining(self) -> bool:
+        return self._draining
+
+    def feed(self, line: str):
+        if self._draining:
+            if _is_close(line):
+                self._stop_draining()
+            return
+        if not self._lines:
+            if _is_open(line):
+                self._lines.append(line)
+                self._timer = asyncio.get_running_loop().call_later(self.timeout, self._expire)
+                if SettingsConfig.printChat:
+                    print(f"{Color.GREEN}Minecraft{Color.RESET} > Buffering chat...")
+            return
+        if _is_close(line):
+            if SettingsConfig.printChat:
+                print(f"{Color.GREEN}Minecraft{Color.RESET} > End of chat buffer")
+            self.flush(complete=True)
+            return
+        self._lines.append(line)
+        if self._category is None:
+            for category, regex in _HEADERS:
+                if regex.search(line):
+                    self._category = category
+                    break
+            else:
+                if len(self._lines) > _HEADER_LINES:
+                    self.reset("Unknown chat block, discarding")
+                    self._drain()
+                    return
+        if len(self._lines) >= self.max_lines:
+            self.flush()
+            self._drain()
+
+    def flush(self, *, complete: bool = False):
+        """Emit the buffered block, `complete` when its closing dashes have arrived."""
+        text = "\n".join(self._lines)
+        category = self._category
+        self.reset()
+        if category in _WHOLE_BLOCKS and not complete:
+            if SettingsConfig.printChat:
+                print(f"{Color.GREEN}Minecraft{Color.RESET} > Incomplete {category.name} block, discarding")
+            return
+        if category is None:
+            if SettingsConfig.printChat:
+                print(f"{Color.GREEN}Minecraft{Color.RESET} > No useful text found, discarding")
+            return
+        # the header only frames the block, the classifier has the final say (e.g. /g info
+        # with no experience history yet)
+        category = classify(text)
+        if category in BLOCK_CATEGORIES:
+            self.emit(text, category)
+        elif SettingsConfig.printChat:
+            print(f"{Color.GREEN}Minecraft{Color.RESET} > No useful text found, discarding")
+
+    def reset(self, reason: str = None):
+        if reason is not None and SettingsConfig.printChat:
+            print(f"{Color.GREEN}Minecraft{Color.RESET} > {reason}")
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._lines.clear()
+        self._category = None
+        self._draining = False
+
+    def _drain(self):
+        # the close may never come (e.g. a kicked bot), give up after another `timeout`
+        self._draining = True
+        self._timer = asyncio.get_running_loop().call_later(self.timeout, self._stop_draining)
+
+    def _stop_draining(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._draining = False
+
+    def _expire(self):
+        self._timer = None
+        if SettingsConfig.printChat:
+            print(f"{Color.GREEN}Minecraft{Color.RESET} > Chat buffer timed out")
+        self.flush()
+        self._drain()
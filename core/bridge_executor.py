@@ -0,0 +1,209 @@
+import asyncio
+import concurrent.futures
+import enum
+import functools
+import inspect
+import re
+import time
+from typing import Callable
+
+from core.bridge_metrics import bridge_metrics
+from core.colors import Color
+from core.errors import BridgeUnavailable
+
+__all__ = ("BreakerState", "BridgeExecutor")
+
+# pythonia raises a bare Exception with one of these when Node doesn't answer in time,
+# errors thrown on the JS side come through as JavaScriptError instead
+_PYTHONIA_TIMEOUT = re.compile(r"Timed out accessing '|Execution timed out|Call to '.*' timed out\.", re.S)
+
+
+def _is_pythonia_timeout(error: Exception) -> bool:
+    return type(error) is Exception and _PYTHONIA_TIMEOUT.match(str(error)) is not None
+
+
+class BreakerState(enum.Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+
+class BridgeExecutor:
+    """
+    Runs blocking pythonia calls on one dedicated thread, behind a circuit breaker.
+
+    Calls are serialized, so a hung Node side holds up at most this one thread instead
+    of filling the loop's default executor. A call that takes longer than `call_timeout`,
+    or a failed watchdog ping, trips the breaker: queued and new calls fail fast with
+    `BridgeUnavailable`, the thread is abandoned for a fresh one and `on_trip` is called
+    so the bot can be reconnected on a new runtime. After `cooldown` seconds one call is
+    let through as a probe, and the breaker closes again if it succeeds.
+    """
+
+    def __init__(
+            self,
+            *,
+            call_timeout: float = 15.0,
+            ping_interval: float = 15.0,
+            cooldown: float = 30.0,
+            on_trip: Callable[[str], None] = None,
+    ):
+        self.call_timeout = call_timeout
+        self.ping_interval = ping_interval
+        self.cooldown = cooldown
+        self.on_trip = on_trip
+        self.state = BreakerState.CLOSED
+        self.in_flight = 0
+        self.calls = 0
+        self.failures = 0
+        self.rejected = 0
+        self.trips = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.last_latency: float | None = None
+        self._tripped_at = 0.0
+        self._executor = self._new_executor()
+        self._task: asyncio.Task | None = None
+        self._ping: Callable[[], bool] | None = None
+        self._should_ping: Callable[[], bool] | None = None
+
+    @staticmethod
+    def _new_executor():
+        return concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="bridge")
+
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    def start(self, ping: Callable[[], bool], *, when: Callable[[], bool] = None):
+        """
+        Start the watchdog.
+
+        `ping` is a cheap blocking call that returns whether the bridge is healthy,
+        it's only made while `when` returns True (e.g. while a bot is online).
+        """
+        if self.running:
+            return
+        self._ping = ping
+        self._should_ping = when
+        self._task = asyncio.create_task(self._watchdog())
+
+    def stop(self):
+        if self.running:
+            self._task.cancel()
+        self._task = None
+
+    def close(self):
+        self.stop()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, func, *args, timeout: float = None, name: str = None, **kwargs):
+        """
+        Run `func` on the bridge thread. Raises `BridgeUnavailable` while the breaker is open.
+
+        `name` labels the call in logs and metrics. Pass it for JS proxies, reading
+        `__name__` off one would itself be a bridge call.
+        """
+        if name is None:
+            name = func.__name__ if inspect.isroutine(func) else "call"
+        if self.state is BreakerState.OPEN:
+            if time.monotonic() - self._tripped_at < self.cooldown:
+                self.rejected += 1
+                raise BridgeUnavailable("The Minecraft bridge is not responding")
+            self.state = BreakerState.HALF_OPEN
+        elif self.state is BreakerState.HALF_OPEN:
+            # a probe is already in flight
+            self.rejected += 1
+            raise BridgeUnavailable("The Minecraft bridge is not responding")
+        executor = self._executor
+        started = time.perf_counter()
+        self.in_flight += 1
+        try:
+            future = asyncio.get_running_loop().run_in_executor(executor, functools.partial(func, *args, **kwargs))
+            result = await asyncio.wait_for(future, timeout=timeout or self.call_timeout)
+        except asyncio.TimeoutError:
+            self.failures += 1
+            if executor is self._executor:
+                self.trip(f"{name} took longer than {timeout or self.call_timeout:g}s")
+            raise
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling() or executor is self._executor:
+                raise
+            # dropped from the queue of an executor abandoned by `trip`
+            self.rejected += 1
+            raise BridgeUnavailable("The Minecraft bridge is not responding")
+        except Exception as e:
+            self.failures += 1
+            if self.state is BreakerState.HALF_OPEN:
+                self.trip("probe call failed")
+            elif _is_pythonia_timeout(e) and executor is self._executor:
+                # pythonia gave up waiting for Node before we did
+                self.trip(f"{name} timed out in pythonia")
+            raise
+        finally:
+            self.in_flight -= 1
+        latency = time.perf_counter() - started
+        self.calls += 1
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+        self.last_latency = latency
+        bridge_metrics.record(name, latency)
+        if self.state is BreakerState.HALF_OPEN:
+            self.reset()
+        return result
+
+    def trip(self, reason: str):
+        if self.state is BreakerState.OPEN:
+            return
+        self.trips += 1
+        self.state = BreakerState.OPEN
+        self._tripped_at = time.monotonic()
+        print(
+            f"{Color.GREEN}Minecraft{Color.RESET} > {Color.RED}[ERROR]{Color.RESET} "
+            f"Bridge is wedged ({reason}), failing calls fast"
+        )
+        # the stuck thread is left to finish on its own, queued calls are cancelled
+        old, self._executor = self._executor, self._new_executor()
+        old.shutdown(wait=False, cancel_futures=True)
+        if self.on_trip is not None:
+            self.on_trip(reason)
+
+    def reset(self):
+        """Close the breaker, e.g. once a bot is up on a fresh runtime."""
+        if self.state is not BreakerState.CLOSED:
+            print(f"{Color.GREEN}Minecraft{Color.RESET} > Bridge is responding again")
+        self.state = BreakerState.CLOSED
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state.value,
+            "in_flight": self.in_flight,
+            "calls": self.calls,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "trips": self.trips,
+            "latency_avg": self.latency_total / self.calls if self.calls else 0.0,
+            "latency_max": self.latency_max,
+            "latency_last": self.last_latency,
+        }
+
+    async def _watchdog(self):
+        try:
+            while True:
+                await asyncio.sleep(self.ping_interval)
+                # a slow call in flight is caught by its own timeout
+                if self.state is not BreakerState.CLOSED or self.in_flight:
+                    continue
+                if self._should_ping is not None and not self._should_ping():
+                    continue
+                try:
+                    healthy = await self.run(self._ping, timeout=self.call_timeout, name="ping")
+                except asyncio.TimeoutError:
+                    continue
+                except Exception as e:
+                    healthy = False
+                    print(f"{Color.GREEN}Minecraft{Color.RESET} > Bridge ping failed: {e}")
+                if not healthy and self.state is BreakerState.CLOSED:
+                    self.trip("watchdog ping failed")
+        except asyncio.CancelledError:
+            pass
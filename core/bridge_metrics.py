@@ -0,0 +1,165 @@
+import asyncio
+import bisect
+import contextlib
+import time
+import traceback
+
+from core.colors import Color
+
+__all__ = ("LatencyHistogram", "BridgeMetrics", "bridge_metrics")
+
+# bucket upper bounds in seconds, the last bucket is everything slower
+_BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0, 10.0)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram, cheap enough to record every bridge call."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        self.counts[bisect.bisect_left(_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the `q` quantile, capped at the slowest call seen."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(_BUCKETS[index], self.max) if index < len(_BUCKETS) else self.max
+        return self.max
+
+    def stats(self) -> dict:
+        return {
+            "count": self.count,
+            "avg": self.total / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+        }
+
+
+class BridgeMetrics:
+    """
+    Optional latency histograms for the calls we make into Node, per kind of call.
+
+    Recording is a no-op until `enabled` is set. While running, the Node event-loop
+    lag is sampled through the bridge executor and a summary is logged every `interval` seconds.
+    The lag monitor is started along with each runtime (or right away, if a bot is already up).
+    Each summary covers only its own window, the histograms start over after it; `stats`
+    shows the last complete window.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.interval = 60
+        # the window being recorded, and the last one reported
+        self.histograms: dict[str, LatencyHistogram] = {}
+        self.last_window: dict[str, LatencyHistogram] = {}
+        # last Node event-loop delay sample, in seconds
+        self.loop_lag: dict[str, float] = {}
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    def start(self, client, *, interval: int = 60):
+        if self.running:
+            return
+        self.enabled = True
+        self.interval = interval
+        self._task = asyncio.create_task(self._run(client))
+
+    def stop(self):
+        if self.running:
+            self._task.cancel()
+        self._task = None
+
+    def record(self, name: str, seconds: float):
+        if not self.enabled:
+            return
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        histogram.record(seconds)
+
+    @contextlib.contextmanager
+    def timed(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def stats(self) -> dict:
+        stats = {}
+        for name, histogram in sorted(self.last_window.items()):
+            for key, value in histogram.stats().items():
+                stats[f"{name}_{key}"] = value
+        for key, value in self.loop_lag.items():
+            stats[f"node_lag_{key}"] = value
+        return stats
+
+    def report(self):
+        """Log the window that just ended and start a new one."""
+        self.last_window, self.histograms = self.histograms, {}
+        parts = [
+            f"{name} n={histogram.count} p50={histogram.quantile(0.5) * 1000:.0f}ms "
+            f"p99={histogram.quantile(0.99) * 1000:.0f}ms max={histogram.max * 1000:.0f}ms"
+            for name, histogram in sorted(self.last_window.items())
+        ]
+        if self.loop_lag:
+            parts.append(
+                f"node lag p50={self.loop_lag['p50'] * 1000:.1f}ms "
+                f"p99={self.loop_lag['p99'] * 1000:.1f}ms max={self.loop_lag['max'] * 1000:.1f}ms"
+            )
+        if parts:
+            print(
+                f"{Color.GREEN}Minecraft{Color.RESET} > Bridge latency over the last {self.interval}s: "
+                + ", ".join(parts)
+            )
+
+    async def _run(self, client):
+        # imported here, minecraft_bot records into this module
+        from core.minecraft_bot import sample_loop_lag, start_loop_lag_monitor
+
+        try:
+            if client.mineflayer_bot is not None:
+                # enabled on a running bot, later runtimes start it in createbot
+                try:
+                    await client.bridge.run(start_loop_lag_monitor, name="loop_lag")
+                except Exception as e:
+                    print(f"{Color.GREEN}Minecraft{Color.RESET} > Could not start the Node event-loop lag monitor: {e}")
+            while True:
+                await asyncio.sleep(self.interval)
+                if client.mineflayer_bot is not None:
+                    try:
+                        self.loop_lag = await client.bridge.run(sample_loop_lag, name="loop_lag")
+                    except Exception as e:
+                        print(f"{Color.GREEN}Minecraft{Color.RESET} > Could not sample Node event-loop lag: {e}")
+                try:
+                    self.report()
+                except Exception:
+                    traceback.print_exc()
+        except asyncio.CancelledError:
+            pass
+
+
+bridge_metrics = BridgeMetrics()
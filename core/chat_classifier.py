@@ -0,0 +1,147 @@
+import enum
+import re
+
+__all__ = (
+    "ChatCategory",
+    "classify",
+    "FORWARDED_CATEGORIES",
+    "BLOCK_CATEGORIES",
+    "prefilter_pattern",
+)
+
+
+class ChatCategory(enum.Enum):
+    GUILD_CHAT = enum.auto()
+    GUILD_PRESENCE = enum.auto()  # Guild > X joined. / Guild > X left.
+    OFFICER_CHAT = enum.auto()
+    GUILD_LOG = enum.auto()
+    MEMBER_JOIN = enum.auto()
+    MEMBER_LEAVE = enum.auto()
+    MEMBER_PROMOTE = enum.auto()
+    MEMBER_DEMOTE = enum.auto()
+    MEMBER_KICK = enum.auto()
+    NOTIFICATIONS_DISABLED = enum.auto()
+    NOTIFICATIONS_ENABLED = enum.auto()
+    SAME_MESSAGE_TWICE = enum.auto()
+    COMMANDS_TOO_FAST = enum.auto()
+    NO_OFFICER_ACCESS = enum.auto()
+    INVITE_SENT = enum.auto()
+    INVITE_IN_OTHER_GUILD = enum.auto()
+    INVITE_IN_THIS_GUILD = enum.auto()
+    INVITE_BLOCKED = enum.auto()
+    INVITE_ALREADY_SENT = enum.auto()
+    JOIN_REQUEST = enum.auto()
+    GUILD_FULL = enum.auto()
+    GUILD_CHAT_MUTED = enum.auto()
+    GUILD_CHAT_UNMUTED = enum.auto()
+    MEMBER_MUTE = enum.auto()
+    MEMBER_UNMUTE = enum.auto()
+    BOT_GUILD_MUTED = enum.auto()
+    BOT_MUTED = enum.auto()
+    MUTE_ID = enum.auto()
+    GUILD_INVITE_RECEIVED = enum.auto()
+    COMMENT_BLOCKED = enum.auto()
+    GUILD_INFO = enum.auto()
+    GUILD_LIST = enum.auto()
+    GUILD_TOP = enum.auto()
+    NO_GUILD_EXPERIENCE = enum.auto()
+    UNKNOWN_COMMAND = enum.auto()
+    OTHER = enum.auto()
+
+
+# Known Hypixel phrases, in priority order. When a line contains more than one
+# of these, the one listed first wins (same as the old if/elif chains).
+# Text in the guild log may conflict with other messages, so it goes first.
+# Wildcards only ever go in a lookahead after a literal start, a phrase must not
+# consume text another phrase could start in, see `classify`.
+_PHRASES = (
+    (ChatCategory.GUILD_LOG, r"Guild Log"),
+    (ChatCategory.MEMBER_JOIN, r" joined the guild!"),
+    (ChatCategory.MEMBER_LEAVE, r" left the guild!"),
+    (ChatCategory.MEMBER_PROMOTE, r" was promoted from "),
+    (ChatCategory.MEMBER_DEMOTE, r" was demoted from "),
+    (ChatCategory.MEMBER_KICK, r" was kicked from the guild(?:!| by )"),
+    (ChatCategory.NOTIFICATIONS_DISABLED, r"Disabled guild join/leave notifications!"),
+    (ChatCategory.NOTIFICATIONS_ENABLED, r"Enabled guild join/leave notifications!"),
+    (ChatCategory.SAME_MESSAGE_TWICE, r"You cannot say the same message twice!"),
+    (ChatCategory.COMMANDS_TOO_FAST, r"You are sending commands too fast!"),
+    (ChatCategory.NO_OFFICER_ACCESS, r"You don't have access to the officer chat!"),
+    (
+        ChatCategory.INVITE_SENT,
+        r"You invited (?=.*to your guild\. They have 5 minutes to accept\.)|You sent an offline invite to",
+    ),
+    (ChatCategory.INVITE_IN_OTHER_GUILD, r" is already in another guild!"),
+    (ChatCategory.INVITE_IN_THIS_GUILD, r"is already in your guild!"),
+    (ChatCategory.INVITE_BLOCKED, r"You cannot invite this player to your guild!"),
+    (ChatCategory.INVITE_ALREADY_SENT, r"You've already invited (?=.*to your guild! Wait for them to accept!)"),
+    (ChatCategory.JOIN_REQUEST, r"(?i: has requested to join the guild!)"),
+    (ChatCategory.GUILD_FULL, r"Your guild is full!"),
+    (ChatCategory.GUILD_CHAT_MUTED, r"has muted the guild chat"),
+    (ChatCategory.GUILD_CHAT_UNMUTED, r"has unmuted the guild chat"),
+    (ChatCategory.MEMBER_MUTE, r"has muted (?=.*for)"),
+    (ChatCategory.MEMBER_UNMUTE, r"has unmuted"),
+    (ChatCategory.BOT_GUILD_MUTED, r"You're currently guild muted"),
+    (ChatCategory.BOT_MUTED, r"Your mute will expire in "),
+    (ChatCategory.MUTE_ID, r"Mute ID: "),
+    (ChatCategory.GUILD_INVITE_RECEIVED, r"Click here to accept or type /guild accept "),
+    (ChatCategory.COMMENT_BLOCKED, r"We blocked your comment"),
+    (ChatCategory.GUILD_INFO, r"Created:(?=[\s\S]*?Members:)"),
+    (ChatCategory.GUILD_LIST, r"(?:Offline|Online) Members:"),
+    (ChatCategory.GUILD_TOP, r"Top Guild Experience"),
+    (ChatCategory.NO_GUILD_EXPERIENCE, r"No one earned guild experience on"),
+    (ChatCategory.UNKNOWN_COMMAND, r"Unknown command"),
+)
+
+# At each position the alternation takes the first listed phrase, `classify` keeps
+# the best one across positions. Phrases only consume their literal start, so one
+# starting inside another's wildcard span (e.g. "has muted (?=.*for)") is still seen.
+# The empty group naming each phrase goes last: a group in front stops `re` from
+# skipping ahead to the phrases' first characters, which makes the scan ~10x slower.
+_PRIORITY = {category.name: (index, category) for index, (category, _) in enumerate(_PHRASES)}
+_PHRASE_REGEX = re.compile("|".join(f"(?:{pattern})(?P<{category.name}>)" for category, pattern in _PHRASES))
+
+# Lines the Minecraft side hands to Discord directly. Everything else is
+# either noise or part of a multi-line block (/g info, /g list, /g top).
+FORWARDED_CATEGORIES = frozenset(
+    (ChatCategory.GUILD_CHAT, ChatCategory.GUILD_PRESENCE, ChatCategory.OFFICER_CHAT)
+) | frozenset(
+    category for category, _ in _PHRASES
+    if category not in (ChatCategory.GUILD_INFO, ChatCategory.GUILD_LIST, ChatCategory.GUILD_TOP)
+)
+# Categories that make a buffered block worth sending.
+BLOCK_CATEGORIES = frozenset(
+    (ChatCategory.GUILD_INFO, ChatCategory.GUILD_LIST, ChatCategory.GUILD_TOP, ChatCategory.NO_GUILD_EXPERIENCE)
+)
+
+
+def classify(message: str) -> ChatCategory:
+    """Assign a chat line (or assembled block) to a category in a single scan, the first listed phrase wins."""
+    if message.startswith("Guild >"):
+        return ChatCategory.GUILD_CHAT if ":" in message else ChatCategory.GUILD_PRESENCE
+    if message.startswith("Officer >"):
+        return ChatCategory.OFFICER_CHAT
+    best = None
+    for match in _PHRASE_REGEX.finditer(message):
+        found = _PRIORITY[match.lastgroup]
+        if best is None or found[0] < best[0]:
+            best = found
+            if found[0] == 0:
+                break
+    if best is None:
+        return ChatCategory.OTHER
+    return best[1]
+
+
+def prefilter_pattern() -> str:
+    """
+    A JavaScript regex source matching every line `classify` would forward.
+
+    Used by the Node-side chat filter with the `i` flag, so it may match a bit more
+    than the classifier does, but never less.
+    """
+    phrases = (
+        pattern.replace("(?i:", "(?:")
+        for category, pattern in _PHRASES
+        if category in FORWARDED_CATEGORIES
+    )
+    return "^(?:Guild|Officer) >|" + "|".join(phrases)
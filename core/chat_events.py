@@ -0,0 +1,474 @@
+"""
+Typed chat events.
+
+Every line (or assembled block) coming from Minecraft is parsed exactly once into
+one of these objects, so consumers get the player name, rank and payload without
+re-tokenizing the raw string.
+"""
+import datetime
+import re
+import zoneinfo
+from dataclasses import dataclass, field
+
+from core.chat_classifier import ChatCategory, classify
+
+__all__ = (
+    "ChatEvent",
+    "PlayerEvent",
+    "GuildChat",
+    "OfficerChat",
+    "MemberPresence",
+    "MemberJoin",
+    "MemberLeave",
+    "RankChange",
+    "MemberKick",
+    "InviteSent",
+    "InviteFailed",
+    "JoinRequest",
+    "GuildChatMute",
+    "GuildChatUnmute",
+    "MemberMute",
+    "MemberUnmute",
+    "BotMuted",
+    "GuildInviteReceived",
+    "CommentBlocked",
+    "GuildLog",
+    "GuildInfo",
+    "GuildList",
+    "GuildTop",
+    "Notice",
+    "parse_event",
+    "parse_duration",
+)
+
+_PLAYER = r"(?:\[(?P<rank>[^\]]+)\] )?(?P<username>\w+)"
+
+_chat_regex = re.compile(
+    r"(?P<channel>Guild|Officer) > " + _PLAYER + r"(?: \[(?P<guild_rank>[^\]]+)\])?: (?P<message>[\s\S]*)"
+)
+_presence_regex = re.compile(r"Guild > " + _PLAYER + r" (?P<action>joined|left)\.")
+_join_regex = re.compile(_PLAYER + r" joined the guild!")
+_leave_regex = re.compile(_PLAYER + r" left the guild!")
+_rank_change_regex = re.compile(_PLAYER + r" was (?:promoted|demoted) from (?P<from_rank>.+) to (?P<to_rank>.+?)\s*$", re.M)
+_kick_regex = re.compile(
+    _PLAYER + r" was kicked from the guild(?: by (?:\[[^\]]+\] )?(?P<kicker>\w+))?!"
+)
+_invite_regex = re.compile(r"You invited " + _PLAYER + r" to your guild\.")
+_offline_invite_regex = re.compile(r"You sent an offline invite to " + _PLAYER + r"!")
+_other_guild_regex = re.compile(_PLAYER + r" is already in another guild!")
+_this_guild_regex = re.compile(_PLAYER + r" is already in your guild!")
+_already_invited_regex = re.compile(r"You've already invited " + _PLAYER + r" to your guild!")
+_join_request_regex = re.compile(_PLAYER + r" has requested to join the guild!", re.I)
+_guild_chat_mute_regex = re.compile(_PLAYER + r" has muted the guild chat for (?P<duration>\w+)")
+_guild_chat_unmute_regex = re.compile(_PLAYER + r" has unmuted the guild chat")
+_mute_regex = re.compile(
+    r"(?:\[[^\]]+\] )?(?P<muter>\w+) has muted (?:\[[^\]]+\] )?(?P<muted>\w+) for (?P<duration>\w+)"
+)
+_unmute_regex = re.compile(r"(?:\[[^\]]+\] )?(?P<muter>\w+) has unmuted (?:\[[^\]]+\] )?(?P<muted>\w+)")
+_bot_guild_muted_regex = re.compile(r"You're currently guild muted for (?P<remaining>.+?)!?\s*$", re.M)
+_bot_muted_regex = re.compile(r"Your mute will expire in (?P<remaining>.+?)\s*$", re.M)
+_guild_invite_regex = re.compile(r"type /guild accept (?P<username>\w+)")
+_comment_blocked_regex = re.compile(r"\"(?P<username>[^\"]+?): (?P<message>[^\"]*)\"")
+_page_regex = re.compile(r"\(Page (\d+) of (\d+)\)")
+
+_MONTHS = {
+    "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+    "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12,
+}
+_TZ_OFFSETS = {
+    "EST": -5,
+    "EDT": -4,
+}
+
+
+def parse_duration(duration: str) -> datetime.timedelta | None:
+    """Convert a Hypixel mute duration (`30m`, `1h`, `7d`) to a timedelta."""
+    # hypixel does not allow specific durations (e.g. 1d 1h, only 1h or 1d)
+    try:
+        amount = int(duration[:-1])
+    except ValueError:
+        return None
+    unit = duration[-1:]
+    if unit == "d":
+        return datetime.timedelta(days=amount)
+    if unit == "h":
+        return datetime.timedelta(hours=amount)
+    if unit == "m":
+        return datetime.timedelta(minutes=amount)
+    return None
+
+
+@dataclass(slots=True)
+class ChatEvent:
+    category: ChatCategory
+    raw: str
+
+
+@dataclass(slots=True)
+class PlayerEvent(ChatEvent):
+    username: str | None
+    rank: str | None = None
+
+
+@dataclass(slots=True)
+class GuildChat(PlayerEvent):
+    guild_rank: str | None = None
+    message: str = ""
+
+
+@dataclass(slots=True)
+class OfficerChat(GuildChat):
+    pass
+
+
+@dataclass(slots=True)
+class MemberPresence(PlayerEvent):
+    joined: bool = True
+    # the line without the "Guild >" prefix, e.g. "Foo joined."
+    text: str = ""
+
+
+@dataclass(slots=True)
+class MemberJoin(PlayerEvent):
+    pass
+
+
+@dataclass(slots=True)
+class MemberLeave(PlayerEvent):
+    pass
+
+
+@dataclass(slots=True)
+class RankChange(PlayerEvent):
+    from_rank: str = ""
+    to_rank: str = ""
+
+    @property
+    def promoted(self) -> bool:
+        return self.category is ChatCategory.MEMBER_PROMOTE
+
+
+@dataclass(slots=True)
+class MemberKick(PlayerEvent):
+    kicker: str | None = None
+
+
+@dataclass(slots=True)
+class InviteSent(PlayerEvent):
+    offline: bool = False
+
+
+@dataclass(slots=True)
+class InviteFailed(PlayerEvent):
+    # matches the reasons returned by DiscordBridgeBot.send_invite
+    reason: str = ""
+
+
+@dataclass(slots=True)
+class JoinRequest(PlayerEvent):
+    pass
+
+
+@dataclass(slots=True)
+class GuildChatMute(PlayerEvent):
+    duration: str = ""
+
+
+@dataclass(slots=True)
+class GuildChatUnmute(PlayerEvent):
+    pass
+
+
+@dataclass(slots=True)
+class MemberMute(ChatEvent):
+    muter: str
+    muted: str
+    duration: str
+    expires_in: datetime.timedelta | None = None
+
+
+@dataclass(slots=True)
+class MemberUnmute(ChatEvent):
+    muter: str
+    muted: str
+
+
+@dataclass(slots=True)
+class BotMuted(ChatEvent):
+    # guild mute (BOT_GUILD_MUTED) or server mute (BOT_MUTED)
+    remaining: str
+
+
+@dataclass(slots=True)
+class GuildInviteReceived(PlayerEvent):
+    pass
+
+
+@dataclass(slots=True)
+class CommentBlocked(ChatEvent):
+    username: str
+    message: str
+
+
+@dataclass(slots=True)
+class GuildLog(ChatEvent):
+    page: int | None = None
+    max_pages: int | None = None
+    entries: list[tuple[datetime.datetime, str]] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class GuildInfo(ChatEvent):
+    name: str
+    created: datetime.datetime
+    members: str
+    description: str
+    experience: str
+    experience_rank: str
+    level: str
+    # (day label, experience), oldest first
+    experience_history: list[tuple[str, int]] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class GuildList(ChatEvent):
+    name: str
+    lines: list[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class GuildTop(ChatEvent):
+    date: datetime.date
+    # (place, hypixel rank or None, name, amount)
+    entries: list[tuple[str, str | None, str, str]] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Notice(ChatEvent):
+    """Anything without a structured payload: system messages, unknown lines."""
+
+    @property
+    def text(self) -> str:
+        return self.raw
+
+
+def _player(regex: re.Pattern, message: str) -> tuple[str | None, str | None]:
+    match = regex.search(message)
+    if match is None:
+        return None, None
+    return match.group("username"), match.group("rank")
+
+
+def _parse_chat(category, message):
+    match = _chat_regex.match(message)
+    if match is None:
+        # any "Guild >" line with a colon lands here, send it on as it is
+        return Notice(ChatCategory.OTHER, message)
+    cls = OfficerChat if category is ChatCategory.OFFICER_CHAT else GuildChat
+    return cls(
+        category, message, match.group("username"), match.group("rank"),
+        guild_rank=match.group("guild_rank"), message=match.group("message"),
+    )
+
+
+def _parse_presence(category, message):
+    match = _presence_regex.match(message)
+    text = message.replace("Guild >", "", 1).strip()
+    if match is None:
+        # unknown format, fall back to the first word that isn't a rank
+        words = text.split()
+        if not words:
+            return Notice(ChatCategory.OTHER, message)
+        username = words[1] if words[0].startswith("[") and len(words) > 1 else words[0]
+        return MemberPresence(category, message, username, joined=" joined." in text, text=text)
+    return MemberPresence(
+        category, message, match.group("username"), match.group("rank"),
+        joined=match.group("action") == "joined", text=text,
+    )
+
+
+def _parse_simple(cls, regex):
+    def parser(category, message):
+        return cls(category, message, *_player(regex, message))
+    return parser
+
+
+def _parse_rank_change(category, message):
+    match = _rank_change_regex.search(message)
+    return RankChange(
+        category, message, match.group("username"), match.group("rank"),
+        from_rank=match.group("from_rank"), to_rank=match.group("to_rank"),
+    )
+
+
+def _parse_kick(category, message):
+    match = _kick_regex.search(message)
+    return MemberKick(category, message, match.group("username"), match.group("rank"), kicker=match.group("kicker"))
+
+
+def _parse_invite_sent(category, message):
+    match = _invite_regex.search(message)
+    offline = match is None
+    if offline:
+        match = _offline_invite_regex.search(message)
+    return InviteSent(category, message, match.group("username"), match.group("rank"), offline=offline)
+
+
+def _parse_invite_failed(reason, regex=None):
+    def parser(category, message):
+        username, rank = _player(regex, message) if regex is not None else (None, None)
+        return InviteFailed(category, message, username, rank, reason=reason)
+    return parser
+
+
+def _parse_guild_chat_mute(category, message):
+    match = _guild_chat_mute_regex.search(message)
+    return GuildChatMute(
+        category, message, match.group("username"), match.group("rank"), duration=match.group("duration")
+    )
+
+
+def _parse_mute(category, message):
+    match = _mute_regex.search(message)
+    duration = match.group("duration")
+    return MemberMute(
+        category, message, match.group("muter"), match.group("muted"), duration,
+        expires_in=parse_duration(duration),
+    )
+
+
+def _parse_unmute(category, message):
+    match = _unmute_regex.search(message)
+    return MemberUnmute(category, message, match.group("muter"), match.group("muted"))
+
+
+def _parse_bot_muted(regex):
+    def parser(category, message):
+        return BotMuted(category, message, regex.search(message).group("remaining"))
+    return parser
+
+
+def _parse_guild_invite(category, message):
+    match = _guild_invite_regex.search(message)
+    return GuildInviteReceived(category, message, match.group("username"))
+
+
+def _parse_comment_blocked(category, message):
+    match = _comment_blocked_regex.search(message)
+    return CommentBlocked(category, message, match.group("username"), match.group("message"))
+
+
+def _parse_guild_log(category, message):
+    lines = message.splitlines()
+    event = GuildLog(category, message)
+    matches = _page_regex.findall(lines[1])
+    if matches:
+        event.page = int(matches[0][0])
+        event.max_pages = int(matches[0][1])
+    # remove first 3 lines, and last line
+    for entry in lines[3:-1]:
+        entry = entry.split()
+        month = _MONTHS[entry[0]]
+        day = int(entry[1])
+        year = int(entry[2])
+        hour, minute = entry[3].split(":")
+        tz_offset = _TZ_OFFSETS.get(entry[4][:-1], 0)
+        dt = datetime.datetime(
+            year, month, day, int(hour), int(minute), 0,
+            tzinfo=datetime.timezone(datetime.timedelta(hours=tz_offset)),
+        )
+        event.entries.append((dt, " ".join(entry[5:])))
+    return event
+
+
+def _parse_guild_info(category, message):
+    lines = message.splitlines()
+    date, time, _ = lines[3].split(": ")[1].split(" ")  # 2025-11-11 10:12 EST
+    year, month, day = date.split("-")
+    hour, minute = time.split(":")
+    created = datetime.datetime(
+        int(year), int(month), int(day), int(hour), int(minute),
+        tzinfo=zoneinfo.ZoneInfo("America/New_York"),
+    )
+    history = []
+    for entry in lines[11:-1]:
+        label, value = entry.split(":")
+        history.insert(0, (label.strip(), int(value.strip().rstrip(" Guild Experience"))))
+    return GuildInfo(
+        category, message,
+        name=lines[1].strip(),
+        created=created,
+        members=lines[4].split(": ")[1],
+        description=lines[5].split(": ")[1],
+        experience=lines[8].split(": ")[1].split(" ")[0],
+        experience_rank=lines[8].split("(")[1].rstrip(")"),
+        level=lines[9].split(": ")[1],
+        experience_history=history,
+    )
+
+
+def _parse_guild_list(category, message):
+    lines = message.splitlines()
+    return GuildList(category, message, lines[1].split(": ")[1], lines[3:])
+
+
+def _parse_guild_top(category, message):
+    lines = message.splitlines()
+    month, day, year = lines[1].split()[3].split("/")
+    event = GuildTop(category, message, datetime.date(month=int(month), day=int(day), year=int(year)))
+    for line in lines[2:]:
+        split = line.split()
+        if len(split) == 6:
+            place, rank, name, amount, _, _ = split
+        else:
+            place, name, amount, _, _ = split
+            rank = None
+        event.entries.append((place, rank, name, amount))
+    return event
+
+
+_PARSERS = {
+    ChatCategory.GUILD_CHAT: _parse_chat,
+    ChatCategory.OFFICER_CHAT: _parse_chat,
+    ChatCategory.GUILD_PRESENCE: _parse_presence,
+    ChatCategory.GUILD_LOG: _parse_guild_log,
+    ChatCategory.MEMBER_JOIN: _parse_simple(MemberJoin, _join_regex),
+    ChatCategory.MEMBER_LEAVE: _parse_simple(MemberLeave, _leave_regex),
+    ChatCategory.MEMBER_PROMOTE: _parse_rank_change,
+    ChatCategory.MEMBER_DEMOTE: _parse_rank_change,
+    ChatCategory.MEMBER_KICK: _parse_kick,
+    ChatCategory.INVITE_SENT: _parse_invite_sent,
+    ChatCategory.INVITE_IN_OTHER_GUILD: _parse_invite_failed("inGuild", _other_guild_regex),
+    ChatCategory.INVITE_IN_THIS_GUILD: _parse_invite_failed("inThisGuild", _this_guild_regex),
+    ChatCategory.INVITE_BLOCKED: _parse_invite_failed("invitesOff"),
+    ChatCategory.INVITE_ALREADY_SENT: _parse_invite_failed("alreadyInvited", _already_invited_regex),
+    ChatCategory.GUILD_FULL: _parse_invite_failed("guildFull"),
+    ChatCategory.JOIN_REQUEST: _parse_simple(JoinRequest, _join_request_regex),
+    ChatCategory.GUILD_CHAT_MUTED: _parse_guild_chat_mute,
+    ChatCategory.GUILD_CHAT_UNMUTED: _parse_simple(GuildChatUnmute, _guild_chat_unmute_regex),
+    ChatCategory.MEMBER_MUTE: _parse_mute,
+    ChatCategory.MEMBER_UNMUTE: _parse_unmute,
+    ChatCategory.BOT_GUILD_MUTED: _parse_bot_muted(_bot_guild_muted_regex),
+    ChatCategory.BOT_MUTED: _parse_bot_muted(_bot_muted_regex),
+    ChatCategory.GUILD_INVITE_RECEIVED: _parse_guild_invite,
+    ChatCategory.COMMENT_BLOCKED: _parse_comment_blocked,
+    ChatCategory.GUILD_INFO: _parse_guild_info,
+    ChatCategory.GUILD_LIST: _parse_guild_list,
+    ChatCategory.GUILD_TOP: _parse_guild_top,
+}
+
+
+def parse_event(message: str, category: ChatCategory = None) -> ChatEvent:
+    """
+    Parse a chat line or assembled block into its typed event.
+
+    Raises if the line matches a known category but not the expected format,
+    which usually means Hypixel changed a message. Guild and officer lines are only
+    classified by their prefix, those fall back to an `OTHER` notice instead.
+    """
+    if category is None:
+        category = classify(message)
+    parser = _PARSERS.get(category)
+    if parser is None:
+        return Notice(category, message)
+    return parser(category, message)
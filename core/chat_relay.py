@@ -0,0 +1,152 @@
+import asyncio
+import collections
+import threading
+import traceback
+from typing import Awaitable, Callable
+
+from core.block_assembler import BlockAssembler
+from core.chat_classifier import ChatCategory
+from core.colors import Color
+
+__all__ = ("ChatRelay",)
+
+
+class ChatRelay:
+    """
+    Hands chat lines from the pythonia callback thread to the event loop.
+
+    The JS thread only appends to a bounded buffer under a lock and wakes the loop
+    once per batch; a single consumer task drains it and delivers lines strictly in
+    arrival order. Lines pushed without a category are block candidates and go
+    through the `BlockAssembler` instead of straight to Discord.
+
+    When the buffer is full the oldest line is dropped and counted in `dropped`.
+    """
+
+    def __init__(self, deliver: Callable[[str, ChatCategory], Awaitable[None]], *, capacity: int = 1024):
+        self.deliver = deliver
+        self.capacity = capacity
+        self.assembler = BlockAssembler(self._emit_block)
+        self.pushed = 0
+        self.dropped = 0
+        self.batches = 0
+        self.high_watermark = 0
+        self._buffer: collections.deque[tuple[str, ChatCategory | None]] = collections.deque()
+        self._lock = threading.Lock()
+        self._wake_pending = False
+        self._reported_drops = 0
+        self._blocks: collections.deque[tuple[str, ChatCategory]] = collections.deque()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    def __len__(self):
+        return len(self._buffer)
+
+    def start(self):
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            # lines pushed before the loop was up (e.g. the spawn message)
+            self._wake_pending = bool(self._buffer)
+        if self._wake_pending:
+            self._wakeup.set()
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self.running:
+            self._task.cancel()
+        self._task = None
+        self.assembler.reset()
+
+    def push(self, message: str, category: ChatCategory | None):
+        """Queue a line from any thread. `category=None` marks a block candidate."""
+        with self._lock:
+            if len(self._buffer) >= self.capacity:
+                self._buffer.popleft()
+                self.dropped += 1
+            self._buffer.append((message, category))
+            self.pushed += 1
+            if len(self._buffer) > self.high_watermark:
+                self.high_watermark = len(self._buffer)
+            if self._wake_pending or self._loop is None:
+                return
+            self._wake_pending = True
+        self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._buffer),
+            "capacity": self.capacity,
+            "pushed": self.pushed,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "high_watermark": self.high_watermark,
+        }
+
+    def _emit_block(self, text: str, category: ChatCategory):
+        # called by the assembler, either from the consumer or from its deadline timer
+        self._blocks.append((text, category))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _deliver(self, message: str, category: ChatCategory):
+        try:
+            await self.deliver(message, category)
+        except Exception as e:
+            print(f"{Color.GREEN}Minecraft{Color.RESET} > Failed to deliver chat line: {e}")
+            traceback.print_exc()
+
+    async def _deliver_blocks(self):
+        while self._blocks:
+            await self._deliver(*self._blocks.popleft())
+
+    async def _run(self):
+        # the consumer must outlive any bad line, otherwise all chat to Discord stops
+        while True:
+            try:
+                await self._consume()
+            except asyncio.CancelledError:
+                return
+            except Exception as e:
+                print(
+                    f"{Color.GREEN}Minecraft{Color.RESET} > {Color.RED}[ERROR]{Color.RESET} "
+                    f"Chat relay crashed, restarting: {e}"
+                )
+                traceback.print_exc()
+                self.assembler.reset()
+
+    async def _consume(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            with self._lock:
+                batch, self._buffer = self._buffer, collections.deque()
+                self._wake_pending = False
+                dropped = self.dropped
+            if dropped != self._reported_drops:
+                print(
+                    f"{Color.GREEN}Minecraft{Color.RESET} > {Color.YELLOW}[WARNING]{Color.RESET} "
+                    f"Chat buffer overflowed, dropped {dropped - self._reported_drops} line(s)"
+                )
+                self._reported_drops = dropped
+            if batch:
+                self.batches += 1
+            await self._deliver_blocks()
+            for message, category in batch:
+                if category is None:
+                    try:
+                        self.assembler.feed(message)
+                    except Exception as e:
+                        print(f"{Color.GREEN}Minecraft{Color.RESET} > Failed to frame chat line: {e}")
+                        traceback.print_exc()
+                        self.assembler.reset()
+                    await self._deliver_blocks()
+                else:
+                    await self._deliver(message, category)
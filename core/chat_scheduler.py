@@ -0,0 +1,464 @@
+import asyncio
+import collections
+import enum
+import re
+import time
+import traceback
+
+from core.colors import Color
+
+__all__ = ("ChatLane", "ChatScheduler", "lane_for")
+
+
+class ChatLane(enum.IntEnum):
+    """Outbound priority, lower goes first."""
+    MODERATION = 0
+    OFFICER = 1
+    GUILD = 2
+    COMMAND = 3
+    # background traffic, e.g. the RTT probe
+    IDLE = 4
+
+
+_MODERATION_REGEX = re.compile(
+    r"^/(?:g|guild) (?:kick|mute|unmute|setrank|promote|demote|invite|accept)\b", re.IGNORECASE
+)
+_OFFICER_REGEX = re.compile(r"^/(?:oc|ochat)\b", re.IGNORECASE)
+_GUILD_REGEX = re.compile(r"^/(?:gc|gchat)\b", re.IGNORECASE)
+# "/gc user: text", as built by DiscordBridgeBot.send_minecraft_user_message
+_USER_LINE_REGEX = re.compile(r"^(/\S+) ([^:]+): (.*)$", re.DOTALL)
+# Hypixel's chat length limit
+MAX_LINE = 256
+# appended to a chat line that would repeat a recent one, see ChatScheduler._dedupe
+_VARIANT_MARKS = (".", ",", "'", "`", "^", "~", "-", "_")
+_CHAT_LANES = frozenset((ChatLane.OFFICER, ChatLane.GUILD))
+
+
+def _fingerprint(message: str) -> str:
+    return " ".join(message.lower().split())
+
+
+def _chat_channel(message: str) -> str | None:
+    """The channel a line is said in, as its echo starts ("Guild" / "Officer"), None for other commands."""
+    if _GUILD_REGEX.match(message):
+        return "Guild"
+    if _OFFICER_REGEX.match(message):
+        return "Officer"
+    return None
+
+
+def lane_for(message: str) -> ChatLane:
+    """Guess the lane of an outbound line from the command it uses."""
+    if _MODERATION_REGEX.match(message):
+        return ChatLane.MODERATION
+    if _OFFICER_REGEX.match(message):
+        return ChatLane.OFFICER
+    if _GUILD_REGEX.match(message):
+        return ChatLane.GUILD
+    return ChatLane.COMMAND
+
+
+def _pack(items: list["_Outgoing"]) -> tuple[str, int]:
+    """
+    Pack as many leading user lines as fit into one, returns the line and how many it holds.
+
+    Messages by the same author share the prefix and are separated by " | ",
+    a different author starts a new " || author: " section.
+    """
+    command, last_author, _ = _USER_LINE_REGEX.match(items[0].message).groups()
+    line = items[0].message
+    count = 1
+    for item in items[1:]:
+        match = _USER_LINE_REGEX.match(item.message)
+        if match is None or match.group(1) != command:
+            break
+        _, author, text = match.groups()
+        part = f" | {text}" if author == last_author else f" || {author}: {text}"
+        if len(line) + len(part) > MAX_LINE:
+            break
+        line += part
+        last_author = author
+        count += 1
+    return line, count
+
+
+class _Outgoing:
+    __slots__ = ("manager", "message", "lane", "future", "queued_at", "retried", "coalesce")
+
+    def __init__(self, manager, message: str, lane: ChatLane, future: asyncio.Future, coalesce: bool = False):
+        self.manager = manager
+        self.message = message
+        self.lane = lane
+        self.future = future
+        self.queued_at = time.perf_counter()
+        self.retried = False
+        self.coalesce = coalesce
+
+
+class _LaneStats:
+    __slots__ = ("sent", "dropped", "wait_total", "wait_max")
+
+    def __init__(self):
+        self.sent = 0
+        self.dropped = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+
+class ChatScheduler:
+    """
+    Paces everything the bridge says in Minecraft through one token bucket.
+
+    Lines are queued per `ChatLane` and always taken from the highest priority lane
+    that has something waiting, so moderation commands never wait behind chat relays.
+    The bucket refills at `rate` lines per second up to `burst`. When Hypixel answers
+    with "You are sending commands too fast" the rate is halved (down to `min_rate`),
+    the blocked line is sent again, and the rate creeps back up with every line that
+    goes through.
+
+    Each lane holds at most `lane_capacity` lines, the oldest one is dropped when full.
+
+    With a `coalesce_window`, consecutive user messages queued with `coalesce=True`
+    are packed into as few lines as possible. A user message waits at most that long
+    for others to join it, a line that is already full goes out straight away.
+
+    Hypixel refuses to repeat a chat line, so officer and guild chat lines that match
+    one sent in the last `repeat_window` seconds get a short mark appended. A line
+    refused anyway ("You cannot say the same message twice!") is sent again as a variant.
+    Hypixel answers chat lines in order, so every guild and officer chat line sent, from
+    any lane, waits in a FIFO until its own echo confirms it, and a refusal belongs to
+    the oldest unconfirmed one. Only relayed chat is resent, a refused command line
+    (e.g. game command output) is reported back to the caller instead.
+    """
+
+    # a rejection arriving later than this is not about a line we sent
+    THROTTLE_WINDOW = 2.0
+
+    def __init__(
+            self,
+            *,
+            rate: float = 1.0,
+            burst: int = 3,
+            min_rate: float = 0.25,
+            recovery: float = 0.05,
+            lane_capacity: int = 100,
+            coalesce_window: float = 0.0,
+            repeat_window: float = 120.0,
+    ):
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.recovery = recovery
+        self.lane_capacity = lane_capacity
+        self.coalesce_window = coalesce_window
+        self.repeat_window = repeat_window
+        self.tokens = float(burst)
+        self.throttles = 0
+        # user messages that were packed into another line instead of using their own
+        self.coalesced = 0
+        # chat lines refused as repeats, and lines sent as a variant to avoid that
+        self.repeats = 0
+        self.variants = 0
+        # fingerprint -> when it was last sent, oldest first
+        self._recent: collections.OrderedDict[str, float] = collections.OrderedDict()
+        self._refilled_at = time.perf_counter()
+        self._lanes: dict[ChatLane, collections.deque[_Outgoing]] = {lane: collections.deque() for lane in ChatLane}
+        self._stats = {lane: _LaneStats() for lane in ChatLane}
+        # (item, sent at) for the last few lines, to match rejections to them
+        self._history: collections.deque[tuple[_Outgoing, float]] = collections.deque(maxlen=8)
+        # (item, line as sent, channel, sent at) for chat lines not echoed back yet, oldest first
+        self._unconfirmed: collections.deque[tuple[_Outgoing, str, str, float]] = collections.deque(maxlen=16)
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    def __len__(self):
+        return sum(len(queue) for queue in self._lanes.values())
+
+    def start(self):
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        if len(self):
+            self._wakeup.set()
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self.running:
+            self._task.cancel()
+        self._task = None
+        for queue in self._lanes.values():
+            while queue:
+                item = queue.popleft()
+                if not item.future.done():
+                    item.future.set_result(False)
+
+    async def send(self, manager, message: str, lane: ChatLane = None, *, coalesce: bool = False) -> bool:
+        """
+        Queue a line for `manager` and wait until it was sent. Returns False if it was dropped.
+
+        `coalesce` marks a "/gc user: text" line that may be packed with its neighbours.
+        """
+        if lane is None:
+            lane = lane_for(message)
+        if not self.running:
+            await manager.send_chat(message)
+            return True
+        coalesce = coalesce and self.coalesce_window > 0 and _USER_LINE_REGEX.match(message) is not None
+        item = _Outgoing(manager, message, lane, asyncio.get_running_loop().create_future(), coalesce)
+        self._enqueue(item)
+        return await item.future
+
+    def throttled(self):
+        """Hypixel rejected the last line for being sent too fast."""
+        self.throttles += 1
+        self.rate = max(self.min_rate, self.rate / 2)
+        self.tokens = 0.0
+        print(
+            f"{Color.GREEN}Minecraft{Color.RESET} > {Color.YELLOW}[WARNING]{Color.RESET} "
+            f"Sending too fast, slowing down to {self.rate:.2f} lines/s"
+        )
+        self._resend()
+
+    def confirmed(self, echo: str):
+        """The bot's own "Guild > name: text" / "Officer > name: text" line came back, so that line went through."""
+        channel = echo.partition(" > ")[0]
+        echo = _fingerprint(echo)
+        oldest = None
+        for index, (_, message, sent_in, _) in enumerate(self._unconfirmed):
+            if sent_in != channel:
+                continue
+            if oldest is None:
+                oldest = index
+            # the echo ends with what followed the command, e.g. "user: text" of "/gc user: text"
+            if echo.endswith(_fingerprint(message.partition(" ")[2])):
+                del self._unconfirmed[index]
+                return
+        if oldest is not None:
+            # Hypixel changed the text (e.g. filtered a word), it's still the oldest one's echo
+            del self._unconfirmed[oldest]
+
+    def rejected(self, at: float = None) -> bool:
+        """
+        Hypixel refused a chat line as a repeat, `at` is when the refusal arrived (perf_counter).
+
+        Returns whether the refused line is relayed chat that is being resent as a variant,
+        False if it was another line or can't be told apart.
+        """
+        self.repeats += 1
+        at = time.perf_counter() if at is None else at
+        while self._unconfirmed:
+            item, _, _, sent_at = self._unconfirmed.popleft()
+            if at - sent_at <= self.THROTTLE_WINDOW:
+                return item.lane in _CHAT_LANES and self._requeue(item)
+            # never echoed nor refused in time, not what this refusal is about
+        return False
+
+    def _resend(self) -> bool:
+        # the rejection is about the most recent line, if it was sent recently enough
+        if not self._history:
+            return False
+        item, sent_at = self._history.pop()
+        if time.perf_counter() - sent_at > self.THROTTLE_WINDOW:
+            return False
+        return self._requeue(item)
+
+    def _requeue(self, item: _Outgoing) -> bool:
+        if item.retried:
+            return False
+        item.retried = True
+        for entry in [entry for entry in self._unconfirmed if entry[0] is item]:
+            self._unconfirmed.remove(entry)
+        item.future = asyncio.get_running_loop().create_future()
+        self._lanes[item.lane].appendleft(item)
+        self._wakeup.set()
+        return True
+
+    def _dedupe(self, message: str) -> str:
+        """Return `message`, or a marked variant of it if it was sent recently."""
+        cutoff = time.monotonic() - self.repeat_window
+        while self._recent and next(iter(self._recent.values())) < cutoff:
+            self._recent.popitem(last=False)
+        if _fingerprint(message) not in self._recent:
+            return message
+        base = message[:MAX_LINE - 2]
+        for mark in _VARIANT_MARKS:
+            variant = f"{base} {mark}"
+            if _fingerprint(variant) not in self._recent:
+                self.variants += 1
+                return variant
+        return message
+
+    def _remember(self, message: str):
+        fingerprint = _fingerprint(message)
+        self._recent.pop(fingerprint, None)
+        self._recent[fingerprint] = time.monotonic()
+        while len(self._recent) > 64:
+            self._recent.popitem(last=False)
+
+    def stats(self) -> dict:
+        stats = {
+            "rate": self.rate,
+            "tokens": self.tokens,
+            "throttles": self.throttles,
+            "coalesced": self.coalesced,
+            "repeats": self.repeats,
+            "variants": self.variants,
+        }
+        for lane in ChatLane:
+            lane_stats = self._stats[lane]
+            name = lane.name.lower()
+            stats[f"{name}_pending"] = len(self._lanes[lane])
+            stats[f"{name}_sent"] = lane_stats.sent
+            stats[f"{name}_dropped"] = lane_stats.dropped
+            stats[f"{name}_wait_avg"] = lane_stats.wait_total / lane_stats.sent if lane_stats.sent else 0.0
+            stats[f"{name}_wait_max"] = lane_stats.wait_max
+        return stats
+
+    def _enqueue(self, item: _Outgoing):
+        queue = self._lanes[item.lane]
+        if len(queue) >= self.lane_capacity:
+            dropped = queue.popleft()
+            self._stats[dropped.lane].dropped += 1
+            if not dropped.future.done():
+                dropped.future.set_result(False)
+        queue.append(item)
+        self._wakeup.set()
+
+    def _head(self) -> collections.deque[_Outgoing] | None:
+        for queue in self._lanes.values():
+            # the caller gave up waiting
+            while queue and queue[0].future.done():
+                queue.popleft()
+            if queue:
+                return queue
+        return None
+
+    @staticmethod
+    def _run_of(queue: collections.deque[_Outgoing]) -> list[_Outgoing]:
+        # the user messages at the front of a lane that may share a line
+        run = []
+        for item in queue:
+            if not item.coalesce:
+                break
+            if not item.future.done():
+                run.append(item)
+        return run
+
+    def _hold(self) -> float:
+        """How much longer the next line should wait for more messages to pack with it."""
+        queue = self._head()
+        if queue is None or not queue[0].coalesce:
+            return 0.0
+        remaining = queue[0].queued_at + self.coalesce_window - time.perf_counter()
+        if remaining <= 0:
+            return 0.0
+        run = self._run_of(queue)
+        _, count = _pack(run)
+        # stop waiting once the line is full
+        return remaining if count == len(run) else 0.0
+
+    def _next(self) -> _Outgoing | None:
+        queue = self._head()
+        if queue is None:
+            return None
+        if not queue[0].coalesce:
+            return queue.popleft()
+        run = self._run_of(queue)
+        line, count = _pack(run)
+        packed = run[:count]
+        while queue and queue[0] is not packed[-1]:
+            queue.popleft()
+        queue.popleft()
+        if count == 1:
+            return packed[0]
+        self.coalesced += count - 1
+        head = packed[0]
+        item = _Outgoing(head.manager, line, head.lane, asyncio.get_running_loop().create_future())
+        item.queued_at = head.queued_at
+        item.future.add_done_callback(lambda future: self._settle(packed, future))
+        return item
+
+    @staticmethod
+    def _settle(items: list[_Outgoing], future: asyncio.Future):
+        for item in items:
+            if item.future.done():
+                continue
+            if future.cancelled():
+                item.future.set_result(False)
+            elif future.exception() is not None:
+                item.future.set_exception(future.exception())
+            else:
+                item.future.set_result(future.result())
+
+    def _refill(self):
+        now = time.perf_counter()
+        self.tokens = min(self.burst, self.tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    async def _send(self, item: _Outgoing):
+        lane_stats = self._stats[item.lane]
+        if not item.manager.is_online():
+            # queued for a bot that has since disconnected
+            lane_stats.dropped += 1
+            item.future.set_result(False)
+            return
+        wait = time.perf_counter() - item.queued_at
+        lane_stats.sent += 1
+        lane_stats.wait_total += wait
+        lane_stats.wait_max = max(lane_stats.wait_max, wait)
+        message = item.message
+        if item.lane in _CHAT_LANES:
+            message = self._dedupe(message)
+            self._remember(message)
+        self._history.append((item, time.perf_counter()))
+        channel = _chat_channel(message)
+        if channel is not None:
+            self._unconfirmed.append((item, message, channel, time.perf_counter()))
+        try:
+            await item.manager.send_chat(message)
+        except Exception as e:
+            if item.retried:
+                # nobody is waiting for a resend
+                print(f"{Color.GREEN}Minecraft{Color.RESET} > Failed to resend chat line: {e}")
+            elif not item.future.done():
+                item.future.set_exception(e)
+            return
+        if not item.future.done():
+            item.future.set_result(True)
+        if self.rate < self.base_rate:
+            self.rate = min(self.base_rate, self.rate + self.recovery)
+
+    async def _run(self):
+        try:
+            while True:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                while len(self):
+                    self._refill()
+                    if self.tokens < 1:
+                        await asyncio.sleep((1 - self.tokens) / self.rate)
+                        continue
+                    hold = self._hold()
+                    if hold > 0:
+                        self._wakeup.clear()
+                        try:
+                            await asyncio.wait_for(self._wakeup.wait(), timeout=hold)
+                        except asyncio.TimeoutError:
+                            pass
+                        continue
+                    item = self._next()
+                    if item is None:
+                        break
+                    self.tokens -= 1
+                    try:
+                        await self._send(item)
+                    except Exception as e:
+                        print(f"{Color.GREEN}Minecraft{Color.RESET} > Failed to send chat line: {e}")
+                        traceback.print_exc()
+        except asyncio.CancelledError:
+            pass
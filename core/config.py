@@ -273,6 +273,8 @@ class AccountConfig(ConfigObject, base_key="account"):
 class DataConfig(ConfigObject, base_key="data"):
     current_version: str = ConfigKey(str, "")
     latest_version: str = ConfigKey(str, "")
+    latest_sha: str = ConfigKey(str, "")
+    last_update_check: int = ConfigKey(int, 0)
 
 
 class DiscordConfig(ConfigObject, base_key="discord"):
@@ -307,6 +309,16 @@ class SettingsConfig(ConfigObject, base_key="settings"):
     extensions: List[str] = ConfigKey(list, [], list_type=str)
     printChat: bool = ConfigKey(bool, False)
     hideInviteMessages: bool = ConfigKey(bool, False)
+    updateCheckInterval: int = ConfigKey(int, 3600)  # seconds
+    rawChatPackets: bool = ConfigKey(bool, False)
+    leanProfile: bool = ConfigKey(bool, False)
+    hotStandby: bool = ConfigKey(bool, False)
+    coalesceWindow: float = ConfigKey(float, 0.0)  # seconds, 0 disables coalescing
+    bridgeMetrics: bool = ConfigKey(bool, False)
+    embedBatchWindow: float = ConfigKey(float, 0.0)  # seconds, 0 only packs embeds that are already queued
+    presenceDigestWindow: float = ConfigKey(float, 0.0)  # seconds, 0 sends every join/leave notice
+    rttProbeInterval: int = ConfigKey(int, 60)  # seconds
+    heldMessageMaxAge: int = ConfigKey(int, 60)  # seconds a message held during a failover may wait
 
 
 class HypixelAPIConfig(ConfigObject, base_key="hypixel_api"):
@@ -0,0 +1,122 @@
+import asyncio
+import collections
+import re
+import traceback
+from typing import Callable
+
+from core.colors import Color
+
+__all__ = ("DebugSink",)
+
+MAX_POST = 2000  # Discord message length limit
+_FENCE = re.compile(r"```(\w*)")
+
+
+def _chunks(line: str) -> list[str]:
+    """
+    Split `line` into posts of at most `MAX_POST` characters, preferably at newlines.
+
+    A code block cut in two is closed at the end of one chunk and reopened (with its
+    language) at the start of the next, like RedisManager does for its tracebacks.
+    """
+    chunks = []
+    fence = None  # language of the code block open at the end of the last chunk
+    while line:
+        prefix = f"```{fence}\n" if fence is not None else ""
+        # leave room for a closing fence
+        room = MAX_POST - len(prefix) - 4
+        piece, line = line[:room], line[room:]
+        if line:
+            cut = piece.rfind("\n")
+            if cut > room // 2:
+                piece, line = piece[:cut], piece[cut + 1:] + line
+        for match in _FENCE.finditer(piece):
+            fence = match.group(1) if fence is None else None
+        chunks.append(prefix + piece + ("\n```" if fence is not None and line else ""))
+    return chunks
+
+
+class DebugSink:
+    """
+    Buffers debug lines and posts them together every `interval` seconds.
+
+    `write` never blocks, so the chat path can log freely. At most `capacity` lines are
+    buffered between posts, further lines are dropped and counted in the next post.
+    Lines too long for one post (e.g. tracebacks) are split into fenced chunks.
+    """
+
+    def __init__(self, post: Callable[[str], None], *, interval: float = 2.0, capacity: int = 200):
+        self.post = post
+        self.interval = interval
+        self.capacity = capacity
+        self.written = 0
+        self.dropped = 0
+        self.posts = 0
+        self._lines: collections.deque[str] = collections.deque()
+        self._dropped_since = 0
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        """Stop posting and hand off whatever is still buffered."""
+        if self.running:
+            self._task.cancel()
+        self._task = None
+        self.flush()
+
+    def write(self, line: str):
+        if len(self._lines) >= self.capacity:
+            self.dropped += 1
+            self._dropped_since += 1
+            return
+        self.written += 1
+        if len(line) > MAX_POST:
+            self._lines.extend(_chunks(line))
+        else:
+            self._lines.append(line)
+
+    def flush(self):
+        if self._dropped_since:
+            self._lines.append(f"... dropped {self._dropped_since} debug lines")
+            self._dropped_since = 0
+        post = ""
+        while self._lines:
+            line = self._lines.popleft()
+            if post and len(post) + 1 + len(line) > MAX_POST:
+                self._post(post)
+                post = ""
+            post = f"{post}\n{line}" if post else line
+        if post:
+            self._post(post)
+
+    def stats(self) -> dict:
+        return {
+            "buffered": len(self._lines),
+            "written": self.written,
+            "dropped": self.dropped,
+            "posts": self.posts,
+        }
+
+    def _post(self, content: str):
+        self.posts += 1
+        try:
+            self.post(content)
+        except Exception as e:
+            print(f"{Color.CYAN}Discord{Color.RESET} > Failed to send debug message: {e}")
+            traceback.print_exc()
+
+    async def _run(self):
+        try:
+            while True:
+                await asyncio.sleep(self.interval)
+                self.flush()
+        except asyncio.CancelledError:
+            pass
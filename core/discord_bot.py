@@ -1,24 +1,36 @@
 import asyncio
+import collections
 import os
 import re
+import sys
 import traceback
-import zoneinfo
 import datetime
+import functools
 from typing import Any, Union
 
-import aiohttp
 import discord
 import pygal
 from discord import Embed
 from discord.ext import commands
 
+from core.chat_classifier import ChatCategory
+from core.chat_events import ChatEvent, InviteFailed, parse_event
+from core.chat_relay import ChatRelay
+from core.bridge_executor import BridgeExecutor
+from core.bridge_metrics import bridge_metrics
+from core.chat_scheduler import ChatScheduler
 from core.colors import Color
 from core.config import DiscordConfig, RedisConfig, DataConfig, SettingsConfig
-from core.minecraft_bot import MinecraftBotManager
+from core.debug_sink import DebugSink
+from core.discord_delivery import DeliveryLane, DiscordDelivery
+from core.error_aggregator import ErrorAggregator
+from core.minecraft_bot import runtime_alive
+from core.minecraft_supervisor import ConnectionState, MinecraftSupervisor
+from core.presence_digest import DigestKind, PresenceDigest
 from core.redis_handler import RedisManager
-
-regex = re.compile(r"Guild > ([\[\]+ a-zA-Z0-9_]+): (.+)")
-regex_officer = re.compile(r"Officer > ([\[\]+ a-zA-Z0-9_]+): (.+)")
+from core.rtt_probe import RttProbe
+from core.token_refresher import TokenRefresher
+from core.update_checker import UpdateChecker
 
 emoji_regex = re.compile(r"<a?:(\w+):\d+>")
 mention_regex = re.compile(r"<@!?(\d+)>")
@@ -28,6 +40,33 @@ slash_mention_regex = re.compile(r"</([\w\- ]+):\d+>")
 link_regex = re.compile(r"(\S+)(\.+)(\S+)")
 
 
+# (requests, per seconds), a little under what Discord allows
+_WEBHOOK_LIMIT = (5, 2.0)
+_CHANNEL_LIMIT = (5, 5.0)
+# send_message kwargs that still allow an embed to be packed with others
+_BATCHABLE_KWARGS = frozenset({"embed", "allowed_mentions", "username", "avatar_url"})
+# Discord messages held for replay while a hot standby failover is in progress
+_MAX_HELD = 50
+
+# Discord lane for chat events, anything not listed goes by officer/non-officer
+_CATEGORY_LANES = {
+    ChatCategory.GUILD_PRESENCE: DeliveryLane.NOTICE,
+    ChatCategory.MEMBER_JOIN: DeliveryLane.NOTICE,
+    ChatCategory.MEMBER_LEAVE: DeliveryLane.NOTICE,
+    ChatCategory.MEMBER_KICK: DeliveryLane.URGENT,
+    ChatCategory.MEMBER_MUTE: DeliveryLane.URGENT,
+    ChatCategory.MEMBER_UNMUTE: DeliveryLane.URGENT,
+    ChatCategory.MEMBER_PROMOTE: DeliveryLane.URGENT,
+    ChatCategory.MEMBER_DEMOTE: DeliveryLane.URGENT,
+    ChatCategory.GUILD_CHAT_MUTED: DeliveryLane.URGENT,
+    ChatCategory.GUILD_CHAT_UNMUTED: DeliveryLane.URGENT,
+    ChatCategory.INVITE_SENT: DeliveryLane.URGENT,
+    ChatCategory.GUILD_FULL: DeliveryLane.URGENT,
+    ChatCategory.BOT_MUTED: DeliveryLane.URGENT,
+    ChatCategory.BOT_GUILD_MUTED: DeliveryLane.URGENT,
+}
+
+
 def emoji_repl(match):
     return f":{match.group(1)}:"
 
@@ -35,27 +74,6 @@ def emoji_repl(match):
 def slash_mention_repl(match):
     return f"/{match.group(1)}"
 
-async def get_latest_commit_sha() -> str:
-    """Fetch the latest commit SHA from GitHub using the API"""
-    try:
-        current_branch = os.getenv("GIT_BRANCH", "main")
-        async with aiohttp.ClientSession() as sesh:
-            # Use GitHub API to get latest commit
-            url = f"https://api.github.com/repos/SkyKings-Network/GuildBridgeBot/commits/{current_branch}"
-            async with sesh.get(url, headers={'Accept': 'application/vnd.github.v3+json'}) as resp:
-                data = await resp.json()
-                return data['sha']
-    except Exception as e:
-        print(f"{Color.CYAN}Discord{Color.RESET} > Failed to get latest git SHA: {e}")
-        return "unknown"
-    
-async def is_outdated() -> bool:
-    current_sha = os.getenv("GIT_SHA", "unknown")
-    latest_sha = await get_latest_commit_sha()
-    if current_sha == "unknown" or latest_sha == "unknown":
-        return False
-    return current_sha != latest_sha
-
 
 class DiscordBridgeBot(commands.Bot):
     def __init__(self):
@@ -78,17 +96,45 @@ class DiscordBridgeBot(commands.Bot):
         self.debug_webhook: discord.Webhook | None = None
         self.name = None
         self.startup_messages = []
+        self.update_checker = UpdateChecker(SettingsConfig.updateCheckInterval)
+        self.chat_relay = ChatRelay(self.send_discord_message)
+        # every message posted to Discord goes through this, see DiscordDelivery
+        self.delivery = DiscordDelivery(
+            batch_window=SettingsConfig.embedBatchWindow, on_connection_error=self.init_webhooks
+        )
+        self.debug_sink = DebugSink(self._post_debug)
+        # keeps a storm of the same exception to one full report per minute
+        self.error_aggregator = ErrorAggregator(self.debug)
+        self.presence_digest = PresenceDigest(
+            lambda embed: self.send_message(embed=embed, lane=DeliveryLane.NOTICE),
+            window=SettingsConfig.presenceDigestWindow,
+        )
+        self.chat_scheduler = ChatScheduler(coalesce_window=SettingsConfig.coalesceWindow)
+        self.minecraft = MinecraftSupervisor(self)
+        # every request/response call into Node goes through this, see BridgeExecutor
+        self.bridge = BridgeExecutor(on_trip=self.minecraft.bridge_wedged)
+        self.token_refresher = TokenRefresher(self.bridge)
+        self.rtt_probe = RttProbe(self, interval=SettingsConfig.rttProbeInterval)
+        # Discord messages sent while a hot standby failover is in progress
+        self._held_messages: collections.deque[tuple[discord.Message, bool]] = collections.deque()
         self.add_check(self.ready_check)
 
     async def ready_check(self, ctx):
-        return self.is_ready() and self.mineflayer_bot.is_ready()
+        return self.is_ready() and self.mineflayer_bot is not None and self.mineflayer_bot.is_ready()
 
     def get_intents(self) -> discord.Intents:
         """Returns a mutable intents class for the bot."""
         return self._connection._intents
 
     async def on_error(self, event_method: str, /, *args: Any, **kwargs: Any) -> None:
-        await self.send_debug_message(
+        error = sys.exc_info()[1]
+        if error is not None and not self.error_aggregator.record(event_method, error):
+            print(
+                f"{Color.CYAN}Discord{Color.RESET} > {Color.RED}[ERROR]{Color.RESET} "
+                f"{type(error).__name__} in {event_method} again: {error}"
+            )
+            return
+        self.debug(
             f"An error occurred in {event_method} with args {args} and kwargs {kwargs}\n\n"
             f"```py\n"
             f"{traceback.format_exc()}\n"
@@ -108,6 +154,36 @@ class DiscordBridgeBot(commands.Bot):
             self._proc_inv_task = asyncio.create_task(self._process_invites())
         return await fut
 
+    async def collect_stats(self) -> dict:
+        """Runtime gauges for the `stats` command and the redis `stats` endpoint."""
+        stats = {
+            "relay": self.chat_relay.stats(),
+            "delivery": self.delivery.stats(),
+            "digest": self.presence_digest.stats(),
+            "debug": self.debug_sink.stats(),
+            "errors": self.error_aggregator.stats(),
+            "chat": self.chat_scheduler.stats(),
+            "executor": self.bridge.stats(),
+            "minecraft": {
+                "state": self.minecraft.state.value,
+                "attempts": self.minecraft.attempts,
+                "failovers": len(self.minecraft.failovers),
+                "last_failover": self.minecraft.failovers[-1] if self.minecraft.failovers else None,
+            },
+        }
+        stats["auth"] = self.token_refresher.stats()
+        stats["rtt"] = self.rtt_probe.stats()
+        if bridge_metrics.enabled:
+            stats["latency"] = bridge_metrics.stats()
+        mineflayer_bot = self.mineflayer_bot
+        if mineflayer_bot is not None:
+            stats["connect"] = dict(mineflayer_bot.relog_timings)
+            try:
+                stats["bridge"] = await self.bridge.run(mineflayer_bot.runtime_stats)
+            except Exception as e:
+                stats["bridge"] = {"error": str(e) or type(e).__name__}
+        return stats
+
     def init_webhooks(self):
         if DiscordConfig.webhookURL:
             self.webhook = discord.Webhook.from_url(DiscordConfig.webhookURL, client=self)
@@ -117,15 +193,29 @@ class DiscordBridgeBot(commands.Bot):
             print(f"{Color.CYAN}Discord{Color.RESET} > {Color.YELLOW}[WARNING]{Color.RESET} Debugging is enabled!")
             self.debug_webhook = discord.Webhook.from_url(DiscordConfig.debugWebhookURL, client=self)
 
-    async def send_debug_message(self, *args, **kwargs) -> None:
+    def debug(self, *args) -> None:
+        """Log a debug line, it's posted to the debug webhook in batches by the debug sink. Never blocks."""
         if self.debug_webhook:
             print(f"{Color.BLACK}Debug{Color.RESET} >", *args)
-            kwargs["username"] = self.user.display_name
-            kwargs["avatar_url"] = self.user.display_avatar.url
-            try:
-                await self.debug_webhook.send(*args, **kwargs)
-            except Exception as e:
-                print(f"{Color.CYAN}Discord{Color.RESET} > Failed to send debug message: {e}")
+            self.debug_sink.write(" ".join(str(arg) for arg in args))
+
+    async def send_debug_message(self, *args, **kwargs) -> None:
+        if not kwargs:
+            self.debug(*args)
+        elif self.debug_webhook:
+            print(f"{Color.BLACK}Debug{Color.RESET} >", *args)
+            self._post_debug(*args, **kwargs)
+
+    def _post_debug(self, *args, **kwargs) -> None:
+        kwargs["username"] = self.user.display_name
+        kwargs["avatar_url"] = self.user.display_avatar.url
+        # looked up at send time, init_webhooks may have replaced it
+        self.delivery.submit(
+            "debug_webhook",
+            DeliveryLane.DEBUG,
+            lambda: self.debug_webhook.send(*args, **kwargs),
+            limit=_WEBHOOK_LIMIT,
+        )
 
     async def on_ready(self):
         print(f"{Color.CYAN}Discord{Color.RESET} > Bot Running as {self.user}")
@@ -136,20 +226,33 @@ class DiscordBridgeBot(commands.Bot):
                 )
             return await self.close()
         self.init_webhooks()
-        if self.mineflayer_bot is None:
+        if self.debug_webhook and not self.debug_sink.running:
+            self.debug_sink.start()
+        if not self.error_aggregator.running:
+            self.error_aggregator.start()
+        if not self.chat_relay.running:
+            self.chat_relay.start()
+        if not self.chat_scheduler.running:
+            self.chat_scheduler.start()
+        if not self.bridge.running:
+            self.bridge.start(runtime_alive, when=lambda: self.minecraft.state is ConnectionState.ONLINE)
+        if SettingsConfig.bridgeMetrics and not bridge_metrics.running:
+            bridge_metrics.start(self)
+        if not self.minecraft.running:
             print(f"{Color.CYAN}Discord{Color.RESET} > Starting the Minecraft bot...")
-            try:
-                self.mineflayer_bot = MinecraftBotManager.createbot(self)
-            except Exception as e:
-                print(f"{Color.CYAN}Discord{Color.RESET} > Failed to start Minecraft bot: {e}")
-                traceback.print_exc()
-                return await self.close()
+            self.minecraft.start()
+        if not self.token_refresher.running:
+            self.token_refresher.start(when=lambda: self.minecraft.state is ConnectionState.ONLINE)
+        if not self.rtt_probe.running:
+            self.rtt_probe.start()
         if self.redis_manager is None and RedisConfig.host:
             print(f"{Color.CYAN}Discord{Color.RESET} > Starting the Redis manager...")
             self.redis_manager = await RedisManager.create(self, self.mineflayer_bot)
         if self._proc_inv_task is None or self._proc_inv_task.done():
             print(f"{Color.CYAN}Discord{Color.RESET} > Starting the invite processor...")
             self._proc_inv_task = asyncio.create_task(self._process_invites())
+        if not self.update_checker.running:
+            self.update_checker.start()
         # warning message
         if (
                 DiscordConfig.allowCrosschat or DiscordConfig.allowOfficerCrosschat) and not DiscordConfig.ignoreCrosschatWarning:
@@ -167,7 +270,13 @@ class DiscordBridgeBot(commands.Bot):
             if str(message.content).startswith(DiscordConfig.prefix) and message.channel.id in (DiscordConfig.channel,
                                                                                                 DiscordConfig.officerChannel):
                 await self.process_commands(message)
-            elif not self.mineflayer_bot.is_online():
+            elif self.mineflayer_bot is None or not self.mineflayer_bot.is_online():
+                if SettingsConfig.hotStandby and self.minecraft.state in (
+                        ConnectionState.CONNECTING, ConnectionState.BACKOFF, ConnectionState.ONLINE
+                ) and message.channel.id in (DiscordConfig.channel, DiscordConfig.officerChannel):
+                    # replayed once the new bot is up, see on_minecraft_ready
+                    await self._expire_held(room=1)
+                    self._held_messages.append((message, message.channel.id == DiscordConfig.officerChannel))
                 return
             elif message.channel.id == DiscordConfig.channel:
                 await self.send_minecraft_user_message(message.author.display_name, message)
@@ -189,7 +298,7 @@ class DiscordBridgeBot(commands.Bot):
                     return
                 username = embed.author.name
                 # failsafe, if we get the bot's username something went wrong
-                if self.mineflayer_bot is None or username == self.user.display_name or username == self.mineflayer_bot.bot.username:
+                if self.mineflayer_bot is None or username == self.user.display_name or username == self.mineflayer_bot.username:
                     return
                 message = embed.description
                 # empty message
@@ -200,6 +309,31 @@ class DiscordBridgeBot(commands.Bot):
                     return
                 await self.send_minecraft_user_message(username, message, officer=officer)
 
+    async def on_minecraft_ready(self):
+        while self._held_messages and self.mineflayer_bot is not None and self.mineflayer_bot.is_online():
+            await self._expire_held()
+            if not self._held_messages:
+                break
+            message, officer = self._held_messages.popleft()
+            await self.send_minecraft_user_message(message.author.display_name, message, officer=officer)
+
+    async def _expire_held(self, *, room: int = 0):
+        """
+        Drop held messages older than `heldMessageMaxAge`, and the oldest ones until `room` more fit.
+
+        They'd arrive too late to make sense in the conversation, a ❌ tells the author it didn't go through.
+        """
+        max_age = datetime.timedelta(seconds=SettingsConfig.heldMessageMaxAge)
+        while self._held_messages and (
+                len(self._held_messages) + room > _MAX_HELD
+                or discord.utils.utcnow() - self._held_messages[0][0].created_at > max_age
+        ):
+            message, _ = self._held_messages.popleft()
+            try:
+                await message.add_reaction("❌")
+            except discord.HTTPException:
+                pass
+
     async def on_command(self, ctx):
         print(f"{Color.CYAN}Discord{Color.RESET} > Command {ctx.command} has been invoked by {ctx.author}")
 
@@ -208,14 +342,25 @@ class DiscordBridgeBot(commands.Bot):
 
     async def close(self):
         print(f"{Color.CYAN}Discord{Color.RESET} > Bot {self.user} is shutting down...")
-        if self.mineflayer_bot is not None:
-            print(f"{Color.CYAN}Discord{Color.RESET} > Stopping Minecraft bot...")
-            self.mineflayer_bot.stop(False)
-            print(f"{Color.CYAN}Discord{Color.RESET} > Minecraft bot has been stopped.")
+        print(f"{Color.CYAN}Discord{Color.RESET} > Stopping Minecraft bot...")
+        await self.minecraft.stop()
+        print(f"{Color.CYAN}Discord{Color.RESET} > Minecraft bot has been stopped.")
         if self.redis_manager is not None:
             print(f"{Color.CYAN}Discord{Color.RESET} > Stopping redis...")
             await self.redis_manager.close()
             print(f"{Color.CYAN}Discord{Color.RESET} > Redis has been stopped.")
+        self.update_checker.stop()
+        self.token_refresher.stop()
+        self.rtt_probe.stop()
+        self.chat_relay.stop()
+        self.chat_scheduler.stop()
+        self.bridge.close()
+        await self.presence_digest.close()
+        self.error_aggregator.stop()
+        self.debug_sink.stop()
+        print(f"{Color.CYAN}Discord{Color.RESET} > Flushing {len(self.delivery)} queued Discord messages...")
+        await self.delivery.close()
+        bridge_metrics.stop()
         await super().close()
 
     async def _process_invites(self):
@@ -243,17 +388,67 @@ class DiscordBridgeBot(commands.Bot):
             traceback.print_exc()
         print(f"{Color.CYAN}Discord{Color.RESET} > Invite processor has been stopped.")
 
-    async def _send_message(self, *args, **kwargs) -> Union[discord.Message, discord.WebhookMessage, None]:
+    def _destination(self, is_officer: bool, officer_maybe: bool) -> str:
+        """Delivery key for where `_send_message` will post, one rate limit bucket per key."""
+        if officer_maybe:
+            if self.officer_webhook or self.webhook:
+                return "officer_webhook" if self.officer_webhook else "webhook"
+            return f"channel:{DiscordConfig.officerChannel or DiscordConfig.channel}"
+        if self.officer_webhook if is_officer else self.webhook:
+            return "officer_webhook" if is_officer else "webhook"
+        return f"channel:{DiscordConfig.officerChannel if is_officer else DiscordConfig.channel}"
+
+    async def _send_message(
+            self, *args, is_officer: bool, officer_maybe: bool, **kwargs
+    ) -> Union[discord.Message, discord.WebhookMessage, None]:
+        # the webhook/channel is looked up at send time, init_webhooks may have replaced it
+        if officer_maybe:
+            webhook = self.officer_webhook or self.webhook
+        else:
+            webhook = self.officer_webhook if is_officer else self.webhook
+        # discord.py closes a File after trying to send it, so attachments are passed as
+        # factories and every attempt gets fresh ones
+        if callable(kwargs.get("file")):
+            kwargs = {**kwargs, "file": kwargs["file"]()}
+
+        if webhook:
+            kwargs["wait"] = True
+            if not 'username' in kwargs.keys():
+                self.name = DiscordConfig.serverName if not DiscordConfig.serverName == "" else "Bridge Bot"
+                return await webhook.send(username=self.name, *args, **kwargs)
+            return await webhook.send(*args, **kwargs)
+        if officer_maybe:
+            channel_id = DiscordConfig.officerChannel or DiscordConfig.channel
+        else:
+            channel_id = DiscordConfig.officerChannel if is_officer else DiscordConfig.channel
+        channel = self.get_channel(channel_id)
+        if channel is None:
+            if channel_id:
+                print(
+                    f"{Color.CYAN}Discord{Color.RESET} > Channel {channel_id} not found! Please set the correct channel ID!"
+                    )
+            return None
+        return await channel.send(*args, **kwargs)
+
+    async def send_message(self, *args, lane: DeliveryLane = None, **kwargs) -> asyncio.Future:
+        """
+        Queue a message for the main or officer webhook/channel, see DiscordDelivery.
+
+        Returns without waiting for Discord, await the returned future for the sent message.
+        Officer messages default to the urgent lane, everything else to the chat lane.
+        Pass `file` as a callable returning a `discord.File` so a retry can send it again.
+        """
         kwargs["allowed_mentions"] = discord.AllowedMentions.none()
-        if not args and 'content' not in kwargs and 'embed' not in kwargs:
+        if not args and 'content' not in kwargs and 'embed' not in kwargs and 'embeds' not in kwargs:
             print(
                 f"{Color.CYAN}Discord{Color.RESET} > {Color.YELLOW}[WARNING]{Color.RESET} Attempted to send an empty message"
                 )
-            return None
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(None)
+            return future
 
-        is_bot_outdated = await is_outdated()
         # Add a footer to the embed if the bot is outdated
-        if is_bot_outdated:
+        if self.update_checker.outdated:
             footer_text = "📩 Bridge Update available!"
             if 'embed' in kwargs:
                 embed = kwargs['embed']
@@ -262,64 +457,32 @@ class DiscordBridgeBot(commands.Bot):
                         embed.set_footer(text=embed.footer.text + " | " + footer_text)
                     else:
                         embed.set_footer(text=footer_text)
-            else:
+            elif 'embeds' not in kwargs:
                 kwargs['embed'] = discord.Embed(description=" ", colour=0xFF6347)
                 kwargs['embed'].set_footer(text=footer_text)
-                
+
         is_officer = kwargs.pop("officer", False)
         officer_maybe = kwargs.pop("officer_maybe", False)
-        if officer_maybe:
-            webhook = self.officer_webhook or self.webhook
-        else:
-            webhook = self.officer_webhook if is_officer else self.webhook
-
-        if webhook:
-            kwargs["wait"] = True
-            try:
-                if not 'username' in kwargs.keys():
-                    self.name = DiscordConfig.serverName if not DiscordConfig.serverName == "" else "Bridge Bot"
-                    return await webhook.send(username=self.name, *args, **kwargs)
-                else:
-                    return await webhook.send(*args, **kwargs)
-            except Exception as e:
-                print(
-                    f"{Color.CYAN}Discord{Color.RESET} > Failed to send message to {'officer ' if is_officer else ''}webhook: {e}"
-                    )
-                await self.send_debug_message(traceback.format_exc())
-        else:
-            if officer_maybe:
-                channel_id = DiscordConfig.officerChannel or DiscordConfig.channel
-            else:
-                channel_id = DiscordConfig.officerChannel if is_officer else DiscordConfig.channel
-            channel = self.get_channel(channel_id)
-            if channel is None:
-                if channel_id:
-                    print(
-                        f"{Color.CYAN}Discord{Color.RESET} > Channel {channel_id} not found! Please set the correct channel ID!"
-                        )
-                return None
-            is_officer_channel = channel.id == DiscordConfig.officerChannel
-            try:
-                return await channel.send(*args, **kwargs)
-            except Exception as e:
-                print(
-                    f"{Color.CYAN}Discord{Color.RESET} > Failed to send message to {'officer ' if is_officer_channel else ''}channel {channel}: {e}"
-                )
-                await self.send_debug_message(traceback.format_exc())
-
-    async def send_message(self, *args, **kwargs) -> Union[discord.Message, discord.WebhookMessage, None]:
-        retry = kwargs.pop("retry", True)
-        try:
-            return await self._send_message(*args, **kwargs)
-        except aiohttp.ClientError as e:
-            if retry:
-                self.init_webhooks()
-                return await self.send_message(*args, **kwargs, retry=False)
+        if lane is None:
+            lane = DeliveryLane.URGENT if is_officer else DeliveryLane.CHAT
+        key = self._destination(is_officer, officer_maybe)
+        limit = _CHANNEL_LIMIT if key.startswith("channel:") else _WEBHOOK_LIMIT
+        send = functools.partial(self._send_message, *args, is_officer=is_officer, officer_maybe=officer_maybe)
+        embed = kwargs.get("embed")
+        if not args and isinstance(embed, discord.Embed) and kwargs.keys() <= _BATCHABLE_KWARGS:
+            # a plain embed can share a send with the embeds queued around it
+            rest = {k: v for k, v in kwargs.items() if k != "embed"}
+            group = (rest.get("username"), rest.get("avatar_url"))
+            return self.delivery.submit(
+                key, lane, lambda embeds: send(embeds=embeds, **rest), limit=limit, embeds=[embed], group=group
+            )
+        return self.delivery.submit(key, lane, functools.partial(send, **kwargs), limit=limit)
 
     async def send_user_message(
-        self, username, message, *, officer: bool = False, command: bool = False, head: str = None
-    ) -> Union[discord.Message, discord.WebhookMessage, None]:
-        await self.send_debug_message("Sending user message")
+        self, username, message, *, officer: bool = False, command: bool = False, head: str = None,
+        lane: DeliveryLane = None,
+    ) -> asyncio.Future:
+        self.debug("Sending user message")
         head = ("https://www.mc-heads.net/avatar/" + username) if not head else head
         if self.webhook:
             if command:
@@ -328,17 +491,19 @@ class DiscordBridgeBot(commands.Bot):
                     avatar_url=head,
                     embeds=[Embed(description=message, colour=0x1ABC9C)],
                     officer=officer,
+                    lane=lane,
                 )
             return await self.send_message(
                 username=discord.utils.escape_markdown(username),
                 avatar_url=head,
                 content=discord.utils.escape_markdown(message),
                 officer=officer,
+                lane=lane,
             )
         else:
             embed = Embed(description=discord.utils.escape_markdown(message), colour=0x1ABC9C, timestamp=discord.utils.utcnow())
             embed.set_author(name=("🤖 " + username) if command else username, icon_url=head)
-            return await self.send_message(embed=embed, officer=officer)
+            return await self.send_message(embed=embed, officer=officer, lane=lane)
 
     async def send_minecraft_user_message(self, username, message: discord.Message, *, officer: bool = False):
         content = message.content
@@ -446,9 +611,24 @@ class DiscordBridgeBot(commands.Bot):
         content = content.encode("ascii", "ignore").decode("ascii")
         if len(content) > 256:
             content = content[:253] + "..."
-        await self.mineflayer_bot.chat(content)
+        await self.mineflayer_bot.chat(content, coalesce=True)
+
+    def _is_own_message(self, username) -> bool:
+        return self.mineflayer_bot is not None and username == self.mineflayer_bot.username
+
+    _invite_failed_debug = {
+        "inGuild": "Sending invited player in guild message",
+        "inThisGuild": "Sending invited player in our guild message",
+        "invitesOff": "Sending invites disabled message",
+        "alreadyInvited": "Sending invites disabled message",
+    }
+
+    def _resolve_invite(self, result):
+        if self._current_invite_future is not None and not self._current_invite_future.done():
+            self._current_invite_future.set_result(result)
 
     # custom client events:
+    # hypixel_chat_event (the parsed ChatEvent, for every line)
     # hypixel_guild_message
     # hypixel_guild_officer_message
     # hypixel_guild_invite_recieved
@@ -461,501 +641,282 @@ class DiscordBridgeBot(commands.Bot):
     # hypixel_guild_member_invite
     # hypixel_guild_member_invite_failed
     # hypixel_guild_message_send_failed
-    async def send_discord_message(self, message):
+    async def send_discord_message(self, message, category: ChatCategory = None):
         try:
-            if "Unknown command" in message:
+            event = message if isinstance(message, ChatEvent) else parse_event(message, category)
+            message = event.raw
+            category = event.category
+            lane = _CATEGORY_LANES.get(category)
+            self.dispatch("hypixel_chat_event", event)
+            if category is ChatCategory.UNKNOWN_COMMAND:
                 self.dispatch("minecraft_pong")
-            if message.startswith("Guild >"):
-                if ":" not in message:
-                    message = message.replace("Guild >", "")
-                    # Member join/leave game notification
-                    if "[VIP]" in message or "[VIP+]" in message or "[MVP]" in message or "[MVP+]" in message or "[MVP++]" in message:
-                        memberusername = message.split()[1]
-                    else:
-                        memberusername = message.split()[0]
-                    if self.mineflayer_bot and self.mineflayer_bot.bot.username in memberusername:
-                        return
-                    if " joined." in message:
-                        embed = Embed(timestamp=discord.utils.utcnow(), colour=0x56F98A)
-                        embed.set_author(name=message, icon_url="https://www.mc-heads.net/avatar/" + memberusername)
-                    else:
-                        embed = Embed(timestamp=discord.utils.utcnow(), colour=0xFF6347)
-                        embed.set_author(name=message, icon_url="https://www.mc-heads.net/avatar/" + memberusername)
-                    await self.send_debug_message("Sending player connection message")
-                    await self.send_message(embed=embed)
-                else:
-                    username, message = regex.match(message).groups()
-                    if self.mineflayer_bot and self.mineflayer_bot.bot.username in username:
-                        return
-                    if username.startswith("["):
-                        username = username.split(" ")[1]
-                    else:
-                        username = username.split(" ")[0]
-                    username = username.strip()
 
-                    self.dispatch("hypixel_guild_message", username, message)
-                    await self.send_user_message(username, message)
+            if category is ChatCategory.GUILD_PRESENCE:
+                # Member join/leave game notification
+                if self._is_own_message(event.username):
+                    return
+                embed = Embed(timestamp=discord.utils.utcnow(), colour=0x56F98A if event.joined else 0xFF6347)
+                embed.set_author(name=event.text, icon_url="https://www.mc-heads.net/avatar/" + event.username)
+                self.debug("Sending player connection message")
+                await self.presence_digest.add(
+                    DigestKind.ONLINE if event.joined else DigestKind.OFFLINE, event.username, embed
+                )
 
-            elif message.startswith("Officer >"):
+            elif category is ChatCategory.GUILD_CHAT:
+                if self._is_own_message(event.username):
+                    return
+                self.dispatch("hypixel_guild_message", event.username, event.message)
+                await self.send_user_message(event.username, event.message)
+
+            elif category is ChatCategory.OFFICER_CHAT:
                 channel = self.get_channel(DiscordConfig.officerChannel)
                 if channel is None:
                     return
-
-                username, message = regex_officer.match(message).groups()
-                if self.mineflayer_bot and self.mineflayer_bot.bot.username in username:
+                if self._is_own_message(event.username):
                     return
-                if username.startswith("["):
-                    username = username.split(" ")[1]
-                else:
-                    username = username.split(" ")[0]
-                username = username.strip()
-
-                self.dispatch("hypixel_guild_officer_message", username, message)
-                await self.send_user_message(username, message, officer=True)
-
-            # Text in log may conflict with other messages, so we do guild log first
-            elif "Guild Log" in message:
-                message = message.splitlines()
-                entries = []
-                page = None
-                max_pages = None
-                # header
-                header = message[1]
-                page_regex = r"\(Page (\d+) of (\d+)\)"
-                matches = re.findall(page_regex, header)
-                if matches:
-                    page = int(matches[0][0])
-                    max_pages = int(matches[0][1])
-                # remove first 3 lines, and last line
-                for line in message[3:-1]:
-                    entries.append(line)
-                months = {
-                    "Jan": 1,
-                    "Feb": 2,
-                    "Mar": 3,
-                    "Apr": 4,
-                    "May": 5,
-                    "Jun": 6,
-                    "Jul": 7,
-                    "Aug": 8,
-                    "Sep": 9,
-                    "Oct": 10,
-                    "Nov": 11,
-                    "Dec": 12,
-                }
+                self.dispatch("hypixel_guild_officer_message", event.username, event.message)
+                await self.send_user_message(event.username, event.message, officer=True)
+
+            elif category is ChatCategory.GUILD_LOG:
                 desc = ""
-                tz_offsets = {
-                    "EST": -5,
-                    "EDT": -4,
-                }
-                for entry in entries:
-                    entry = entry.split()
-                    month = months[entry[0]]
-                    day = int(entry[1])
-                    year = int(entry[2])
-                    time = entry[3].split(":")
-                    hour = int(time[0])
-                    minute = int(time[1])
-                    tz = entry[4][:-1]
-                    tz_offset = tz_offsets.get(tz, 0)
-                    message = discord.utils.escape_markdown(" ".join(entry[5:]))
-                    dt = datetime.datetime(year, month, day, hour, minute, 0)
-                    dt = dt.replace(tzinfo=datetime.timezone(datetime.timedelta(hours=tz_offset)))
-                    desc += f"<t:{int(dt.timestamp())}:f> {message}\n"
+                for dt, entry in event.entries:
+                    desc += f"<t:{int(dt.timestamp())}:f> {discord.utils.escape_markdown(entry)}\n"
                 embed = discord.Embed(color=0x1ABC9C, title="Guild Log", description=desc)
-                embed.set_footer(text=f"Page {page}/{max_pages}")
-                await self.send_message(embed=embed, officer_maybe=True)
+                embed.set_footer(text=f"Page {event.page}/{event.max_pages}")
+                await self.send_message(lane=lane, embed=embed, officer_maybe=True)
 
             # Someone joined/left the guild
-            elif " joined the guild!" in message:
-                message = message.split()
-                if "[VIP]" in message or "[VIP+]" in message or "[MVP]" in message or "[MVP+]" in message or "[MVP++]" in message:
-                    playername = message[1]
-                else:
-                    playername = message[0]
+            elif category is ChatCategory.MEMBER_JOIN:
                 embed = Embed(timestamp=discord.utils.utcnow(), colour=0x1ABC9C)
                 embed.set_author(
-                    name=f"{playername} has joined the guild!", icon_url="https://www.mc-heads.net/avatar/" + playername
+                    name=f"{event.username} has joined the guild!",
+                    icon_url="https://www.mc-heads.net/avatar/" + event.username
                 )
-                self.dispatch("hypixel_guild_member_join", playername)
-                await self.send_debug_message("Sending guild member joined message")
-                await self.send_message(embed=embed)
-            elif " left the guild!" in message:
-                message = message.split()
-                if "[VIP]" in message or "[VIP+]" in message or "[MVP]" in message or "[MVP+]" in message or "[MVP++]" in message:
-                    playername = message[1]
-                else:
-                    playername = message[0]
+                self.dispatch("hypixel_guild_member_join", event.username)
+                self.debug("Sending guild member joined message")
+                await self.presence_digest.add(DigestKind.GUILD_JOIN, event.username, embed)
+            elif category is ChatCategory.MEMBER_LEAVE:
                 embed = Embed(timestamp=discord.utils.utcnow(), colour=0x1ABC9C)
                 embed.set_author(
-                    name=f"{playername} has left the guild!", icon_url="https://www.mc-heads.net/avatar/" + playername
+                    name=f"{event.username} has left the guild!",
+                    icon_url="https://www.mc-heads.net/avatar/" + event.username
                 )
-                self.dispatch("hypixel_guild_member_leave", playername)
-                await self.send_debug_message("Sending guild member left message")
-                await self.send_message(embed=embed)
+                self.dispatch("hypixel_guild_member_leave", event.username)
+                self.debug("Sending guild member left message")
+                await self.presence_digest.add(DigestKind.GUILD_LEAVE, event.username, embed)
 
             # Someone was promoted/demoted
-            elif " was promoted from " in message:
-                message = message.split()
-                if "[VIP]" in message or "[VIP+]" in message or "[MVP]" in message or "[MVP+]" in message or "[MVP++]" in message:
-                    playername = message[1]
-                else:
-                    playername = message[0]
-                from_rank = message[-3]
-                to_rank = message[-1]
+            elif category is ChatCategory.MEMBER_PROMOTE or category is ChatCategory.MEMBER_DEMOTE:
+                action = "promoted" if event.promoted else "demoted"
                 embed = Embed(timestamp=discord.utils.utcnow(), colour=0x1ABC9C)
                 embed.set_author(
-                    name=f"{playername} has been promoted from {from_rank} to {to_rank}!",
-                    icon_url="https://www.mc-heads.net/avatar/" + playername
+                    name=f"{event.username} has been {action} from {event.from_rank} to {event.to_rank}!",
+                    icon_url="https://www.mc-heads.net/avatar/" + event.username
                 )
-                self.dispatch("hypixel_guild_member_promote", playername, from_rank, to_rank)
-                await self.send_debug_message("Sending member promoted message")
-                await self.send_message(embed=embed)
-            elif " was demoted from " in message:
-                message = message.split()
-                if "[VIP]" in message or "[VIP+]" in message or "[MVP]" in message or "[MVP+]" in message or "[MVP++]" in message:
-                    playername = message[1]
-                else:
-                    playername = message[0]
-                from_rank = message[-3]
-                to_rank = message[-1]
-                embed = Embed(timestamp=discord.utils.utcnow(), colour=0x1ABC9C)
-                embed.set_author(
-                    name=f"{playername} has been demoted from {from_rank} to {to_rank}!",
-                    icon_url="https://www.mc-heads.net/avatar/" + playername
-                )
-                self.dispatch("hypixel_guild_member_demote", playername, from_rank, to_rank)
-                await self.send_debug_message("Sending member demoted message")
-                await self.send_message(embed=embed)
+                self.dispatch(f"hypixel_guild_member_{action[:-1]}", event.username, event.from_rank, event.to_rank)
+                self.debug(f"Sending member {action} message")
+                await self.send_message(lane=lane, embed=embed)
 
             # Someone was kicked
-            elif " was kicked from the guild!" in message:
-                message = message.split()
-                if "[VIP]" in message[0] or "[VIP+]" in message[0] or "[MVP]" in message[0] or "[MVP+]" in message[
-                    0] or "[MVP++]" in message[0]:
-                    playername = message[1]
-                else:
-                    playername = message[0]
-                embed = Embed(timestamp=discord.utils.utcnow(), colour=0x1ABC9C)
-                embed.set_author(
-                    name=f"{playername} was kicked from the guild!",
-                    icon_url="https://www.mc-heads.net/avatar/" + playername
-                )
-                self.dispatch("hypixel_guild_member_kick", playername)
-                await self.send_debug_message("Sending member kicked message")
-                await self.send_message(embed=embed)
-            elif " was kicked from the guild by " in message:
-                message = message.split()
-                if "[VIP]" in message[0] or "[VIP+]" in message[0] or "[MVP]" in message[0] or "[MVP+]" in message[
-                    0] or "[MVP++]" in message[0]:
-                    playername = message[1]
-                else:
-                    playername = message[0]
+            elif category is ChatCategory.MEMBER_KICK:
                 embed = Embed(timestamp=discord.utils.utcnow(), colour=0x1ABC9C)
                 embed.set_author(
-                    name=f"{playername} was kicked from the guild!",
-                    icon_url="https://www.mc-heads.net/avatar/" + playername
+                    name=f"{event.username} was kicked from the guild!",
+                    icon_url="https://www.mc-heads.net/avatar/" + event.username
                 )
-                self.dispatch("hypixel_guild_member_kick", playername)
-                await self.send_debug_message("Sending member kicked message")
-                await self.send_message(embed=embed)
+                self.dispatch("hypixel_guild_member_kick", event.username)
+                self.debug("Sending member kicked message")
+                await self.send_message(lane=lane, embed=embed)
 
             # Join/leave notifications toggled
-            elif "Disabled guild join/leave notifications!" in message:
+            elif category is ChatCategory.NOTIFICATIONS_DISABLED:
                 embed = Embed(description="Disabled guild join/leave notifications!", colour=0x1ABC9C)
-                await self.send_debug_message("Sending notification disabled message")
-                await self.send_message(embed=embed)
-            elif "Enabled guild join/leave notifications!" in message:
+                self.debug("Sending notification disabled message")
+                await self.send_message(lane=lane, embed=embed)
+            elif category is ChatCategory.NOTIFICATIONS_ENABLED:
                 embed = Embed(description="Enabled guild join/leave notifications!", colour=0x1ABC9C)
-                await self.send_debug_message("Sending notification enabled message")
-                await self.send_message(embed=embed)
+                self.debug("Sending notification enabled message")
+                await self.send_message(lane=lane, embed=embed)
 
             # Hypixel antispam filter
-            elif "You cannot say the same message twice!" in message:
+            elif category is ChatCategory.SAME_MESSAGE_TWICE:
                 embed = Embed(description="You cannot say the same message twice!", colour=0x1ABC9C)
                 self.dispatch("hypixel_guild_message_send_failed", message)
-                await self.send_debug_message("Sending 'same message twice' message")
-                await self.send_message(embed=embed)
+                self.debug("Sending 'same message twice' message")
+                await self.send_message(lane=lane, embed=embed)
 
             # Bot cannot access officer chat
-            elif "You don't have access to the officer chat!" in message:
+            elif category is ChatCategory.NO_OFFICER_ACCESS:
                 embed = Embed(description="You don't have access to the officer chat!", colour=0x1ABC9C)
                 self.dispatch("hypixel_guild_message_send_failed", message)
-                await self.send_debug_message("Sending no officer chat access message")
-                await self.send_message(embed=embed)
+                self.debug("Sending no officer chat access message")
+                await self.send_message(lane=lane, embed=embed)
 
             # Bot invited someone
-            elif (
-                    ("You invited" in message and "to your guild. They have 5 minutes to accept." in message)
-                    or ("You sent an offline invite to" in message)
-            ):
-                message = message.split()
-                if message[2] == "an" and message[3] == "offline":
-                    if "[VIP]" in message or "[VIP+]" in message or "[MVP]" in message or "[MVP+]" in message or "[MVP++]" in message:
-                        playername = message[7][:-1]
-                    else:
-                        playername = message[6][:-1]
-                else:
-                    if "[VIP]" in message or "[VIP+]" in message or "[MVP]" in message or "[MVP+]" in message or "[MVP++]" in message:
-                        playername = message[3]
-                    else:
-                        playername = message[2]
-                self._current_invite_future.set_result((True, None))
-                self.dispatch("hypixel_guild_member_invite", playername)
-                if not SettingsConfig.hideInviteMessages:
-                    embed = Embed(timestamp=discord.utils.utcnow(), colour=0x1ABC9C)
-                    embed.set_author(
-                        name=f"{playername} has been invited to the guild!",
-                        icon_url="https://www.mc-heads.net/avatar/" + playername
-                    )
-                    await self.send_debug_message("Sending invite sent message")
-                    await self.send_message(embed=embed)
-
-            # Person bot invited is in another guild
-            elif " is already in another guild!" in message:
-                message = message.split()
-                if "[VIP]" in message or "[VIP+]" in message or "[MVP]" in message or "[MVP+]" in message or "[MVP++]" in message:
-                    playername = message[1]
-                else:
-                    playername = message[0]
-                self._current_invite_future.set_result((False, 'inGuild'))
-                self.dispatch("hypixel_guild_member_invite_failed", playername)
-                if not SettingsConfig.hideInviteMessages:
-                    embed = Embed(timestamp=discord.utils.utcnow(), colour=0x1ABC9C)
-                    embed.set_author(
-                        name=f"{playername} is already in another guild!",
-                        icon_url="https://www.mc-heads.net/avatar/" + playername
-                    )
-                    await self.send_debug_message("Sending invited player in guild message")
-                    await self.send_message(embed=embed)
-
-            # Person bot invited is in already in the guild
-            elif " is already in your guild!" in message:
-                message = message.split()
-                if "[VIP]" in message or "[VIP+]" in message or "[MVP]" in message or "[MVP+]" in message or "[MVP++]" in message:
-                    playername = message[1]
-                else:
-                    playername = message[0]
-                self._current_invite_future.set_result((False, 'inThisGuild'))
-                self.dispatch("hypixel_guild_member_invite_failed", playername)
+            elif category is ChatCategory.INVITE_SENT:
+                self._resolve_invite((True, None))
+                self.dispatch("hypixel_guild_member_invite", event.username)
                 if not SettingsConfig.hideInviteMessages:
                     embed = Embed(timestamp=discord.utils.utcnow(), colour=0x1ABC9C)
                     embed.set_author(
-                        name=f"{playername} is already in your guild!",
-                        icon_url="https://www.mc-heads.net/avatar/" + playername
+                        name=f"{event.username} has been invited to the guild!",
+                        icon_url="https://www.mc-heads.net/avatar/" + event.username
                     )
-                    await self.send_debug_message("Sending invited player in our guild message")
-                    await self.send_message(embed=embed)
-
-            # Person bot invited has guild invites disabled (can't figure out who)
-            elif "You cannot invite this player to your guild!" in message:
-                self._current_invite_future.set_result((False, 'invitesOff'))
-                self.dispatch("hypixel_guild_member_invite_failed", None)
-                if not SettingsConfig.hideInviteMessages:
-                    embed = Embed(timestamp=discord.utils.utcnow(), colour=0x1ABC9C)
-                    embed.set_author(
-                        name=f"You cannot invite this player to your guild!",
-                    )
-                    await self.send_debug_message("Sending invites disabled message")
-                    await self.send_message(embed=embed)
-
-            # Person bot invited has already been invited
-            elif "You've already invited" in message and "to your guild! Wait for them to accept!" in message:
-                message = message.split()
-                if "[VIP]" in message or "[VIP+]" in message or "[MVP]" in message or "[MVP+]" in message or "[MVP++]" in message:
-                    playername = message[4]
-                else:
-                    playername = message[3]
-                self._current_invite_future.set_result((False, 'alreadyInvited'))
-                self.dispatch("hypixel_guild_member_invite_failed", None)
+                    self.debug("Sending invite sent message")
+                    await self.send_message(lane=lane, embed=embed)
+
+            # Invite failed: in another guild, already in ours, invites disabled, already invited
+            elif isinstance(event, InviteFailed) and category is not ChatCategory.GUILD_FULL:
+                self._resolve_invite((False, event.reason))
+                # for disabled invites hypixel doesn't tell us who it was
+                self.dispatch(
+                    "hypixel_guild_member_invite_failed",
+                    event.username if event.reason in ("inGuild", "inThisGuild") else None,
+                )
                 if not SettingsConfig.hideInviteMessages:
                     embed = Embed(timestamp=discord.utils.utcnow(), colour=0x1ABC9C)
-                    embed.set_author(
-                        name=f"{playername} has already been invited! Wait for them to accept!",
-                    )
-                    await self.send_debug_message("Sending invites disabled message")
-                    await self.send_message(embed=embed)
+                    if event.reason == "inGuild":
+                        embed.set_author(
+                            name=f"{event.username} is already in another guild!",
+                            icon_url="https://www.mc-heads.net/avatar/" + event.username
+                        )
+                    elif event.reason == "inThisGuild":
+                        embed.set_author(
+                            name=f"{event.username} is already in your guild!",
+                            icon_url="https://www.mc-heads.net/avatar/" + event.username
+                        )
+                    elif event.reason == "invitesOff":
+                        embed.set_author(name=f"You cannot invite this player to your guild!")
+                    else:
+                        embed.set_author(name=f"{event.username} has already been invited! Wait for them to accept!")
+                    self.debug(self._invite_failed_debug[event.reason])
+                    await self.send_message(lane=lane, embed=embed)
 
             # Someone requested to join
-            elif " has requested to join the guild!" in message.lower():  # case might be weird?
-                message = message.split()
-                if "[VIP]" in message or "[VIP+]" in message or "[MVP]" in message or "[MVP+]" in message or "[MVP++]" in message:
-                    playername = message[1]
-                else:
-                    playername = message[0]
+            elif category is ChatCategory.JOIN_REQUEST:
+                playername = event.username
                 embed = Embed(timestamp=discord.utils.utcnow(), colour=0x1ABC9C)
                 embed.set_author(
                     name=f"{playername} has requested to join the guild!",
                     icon_url="https://www.mc-heads.net/avatar/" + playername
                 )
                 self.dispatch("hypixel_guild_join_request", playername)
-                await self.send_debug_message("Sending join request message")
-                await self.send_message(embed=embed)
-                if SettingsConfig.acceptGuildJoinRequests:
-                    await self.send_debug_message("Accepting join request for " + playername)
-                    await self.mineflayer_bot.chat(f"/g accept {playername}")
+                self.debug("Sending join request message")
+                await self.send_message(lane=lane, embed=embed)
+                mineflayer_bot = self.mineflayer_bot
+                if SettingsConfig.acceptGuildJoinRequests and mineflayer_bot is not None:
+                    self.debug("Accepting join request for " + playername)
+                    # not awaited, the relay shouldn't wait for the line to get through the scheduler
+                    asyncio.create_task(mineflayer_bot.chat(f"/g accept {playername}"))
 
             # Guild is full
-            elif "Your guild is full!" in message:
+            elif category is ChatCategory.GUILD_FULL:
                 embed = Embed(colour=0x1ABC9C)
                 embed.set_author(
                     name=f"The guild is full!",
                 )
-                self._current_invite_future.set_result((False, 'guildFull'))
+                self._resolve_invite((False, event.reason))
                 self.dispatch("hypixel_guild_member_invite_failed", None)
-                await self.send_debug_message("Sending guild full message")
-                await self.send_message(embed=embed)
+                self.debug("Sending guild full message")
+                await self.send_message(lane=lane, embed=embed)
 
             # mute stuff
-            elif "has muted the guild chat" in message:
-                splitmsg = message.split()
-                playername = splitmsg[0]
-                if ("[VIP]" in splitmsg or "[VIP+]" in splitmsg or
-                        "[MVP]" in splitmsg or "[MVP+]" in splitmsg or "[MVP++]" in splitmsg):
-                    playername = splitmsg[1]
-                duration = splitmsg[-1]
+            elif category is ChatCategory.GUILD_CHAT_MUTED:
                 embed = Embed(colour=0x1ABC9C)
                 embed.set_author(
-                    name=f"The guild chat has been muted by {playername} for {duration}.",
-                    icon_url="https://www.mc-heads.net/avatar/" + playername
+                    name=f"The guild chat has been muted by {event.username} for {event.duration}.",
+                    icon_url="https://www.mc-heads.net/avatar/" + event.username
                 )
-                self.dispatch("hypixel_guild_chat_muted", playername, duration)
-                await self.send_debug_message("Sending guild chat muted message")
-                await self.send_message(embed=embed)
-
-            elif "has unmuted the guild chat" in message:
-                splitmsg = message.split()
-                playername = splitmsg[0]
-                if ("[VIP]" in splitmsg or "[VIP+]" in splitmsg or
-                        "[MVP]" in splitmsg or "[MVP+]" in splitmsg or "[MVP++]" in splitmsg):
-                    playername = splitmsg[1]
+                self.dispatch("hypixel_guild_chat_muted", event.username, event.duration)
+                self.debug("Sending guild chat muted message")
+                await self.send_message(lane=lane, embed=embed)
+
+            elif category is ChatCategory.GUILD_CHAT_UNMUTED:
                 embed = Embed(colour=0x1ABC9C)
                 embed.set_author(
-                    name=f"The guild chat has been unmuted by {playername}.",
-                    icon_url="https://www.mc-heads.net/avatar/" + playername
+                    name=f"The guild chat has been unmuted by {event.username}.",
+                    icon_url="https://www.mc-heads.net/avatar/" + event.username
                 )
-                self.dispatch("hypixel_guild_chat_unmuted", playername)
-                await self.send_debug_message("Sending guild chat unmuted message")
-                await self.send_message(embed=embed)
+                self.dispatch("hypixel_guild_chat_unmuted", event.username)
+                self.debug("Sending guild chat unmuted message")
+                await self.send_message(lane=lane, embed=embed)
 
             # personal mutes
-            elif "has muted" in message:
-                _regex = r"(?:\[[A-Z+]+\] )?([a-zA-Z0-9_]+) has muted (?:\[[A-Z+]+\] )?([a-zA-Z0-9_]+) for ([a-zA-Z0-9_]+)"
-                matches = re.match(_regex, message)
-                muter = matches.group(1)
-                muted = matches.group(2)
-                duration = matches.group(3)
-                self.dispatch("hypixel_guild_member_muted", muter, muted, duration)
+            elif category is ChatCategory.MEMBER_MUTE:
+                self.dispatch("hypixel_guild_member_muted", event.muter, event.muted, event.duration)
                 embed = Embed(colour=0x1ABC9C)
                 embed.set_author(
-                    name=f"{muter} has muted {muted} for {duration}.",
-                    icon_url="https://www.mc-heads.net/avatar/" + muter
+                    name=f"{event.muter} has muted {event.muted} for {event.duration}.",
+                    icon_url="https://www.mc-heads.net/avatar/" + event.muter
                 )
-                await self.send_debug_message("Sending member muted message")
-                await self.send_message(embed=embed, officer=True)
-
-            elif "has unmuted" in message:
-                _regex = r"(?:\[[A-Z+]+\] )?([a-zA-Z0-9_]+) has unmuted (?:\[[A-Z+]+\] )?([a-zA-Z0-9_]+)"
-                matches = re.match(_regex, message)
-                muter = matches.group(1)
-                muted = matches.group(2)
-                self.dispatch("hypixel_guild_member_unmuted", muter, muted)
+                self.debug("Sending member muted message")
+                await self.send_message(lane=lane, embed=embed, officer=True)
+
+            elif category is ChatCategory.MEMBER_UNMUTE:
+                self.dispatch("hypixel_guild_member_unmuted", event.muter, event.muted)
                 embed = Embed(colour=0x1ABC9C)
                 embed.set_author(
-                    name=f"{muter} has unmuted {muted}.",
-                    icon_url="https://www.mc-heads.net/avatar/" + muter
+                    name=f"{event.muter} has unmuted {event.muted}.",
+                    icon_url="https://www.mc-heads.net/avatar/" + event.muter
                 )
-                await self.send_debug_message("Sending member unmuted message")
-                await self.send_message(embed=embed, officer=True)
+                self.debug("Sending member unmuted message")
+                await self.send_message(lane=lane, embed=embed, officer=True)
 
-            elif "You're currently guild muted for" in message:
-                duration_remaining = message.split()[-1][:-1]
+            elif category is ChatCategory.BOT_GUILD_MUTED:
                 self.dispatch("hypixel_guild_message_send_failed")
                 embed = Embed(colour=0x1ABC9C)
                 embed.set_author(
-                    name=f"The bot is currently guild muted for {duration_remaining}.",
+                    name=f"The bot is currently guild muted for {event.remaining}.",
                 )
-                await self.send_debug_message("Sending bot is guild muted message")
-                await self.send_message(embed=embed)
+                self.debug("Sending bot is guild muted message")
+                await self.send_message(lane=lane, embed=embed)
 
             # hypixel mute
-            elif "Your mute will expire in " in message:
-                duration_remaining = " ".join(message.split()[5:])
+            elif category is ChatCategory.BOT_MUTED:
                 embed = Embed(color=discord.Color.red())
                 embed.set_author(
-                    name=f"The bot is currently muted for {duration_remaining}.",
+                    name=f"The bot is currently muted for {event.remaining}.",
                 )
-                await self.send_debug_message("Sending bot is muted message")
-                await self.send_message(embed=embed)
-            elif "Mute ID: " in message:
+                self.debug("Sending bot is muted message")
+                await self.send_message(lane=lane, embed=embed)
+            elif category is ChatCategory.MUTE_ID:
                 print(f"{Color.CYAN}Discord{Color.RESET} > {message}")
 
             # Bot recieved guild invite
-            elif "Click here to accept or type /guild accept " in message:
-                if "[VIP]" in message or "[VIP+]" in message or "[MVP]" in message or "[MVP+]" in message or "[MVP++]" in message:
-                    playername = message.split()[2]
-                else:
-                    playername = message.split()[1]
-
+            elif category is ChatCategory.GUILD_INVITE_RECEIVED:
                 embed = Embed(timestamp=discord.utils.utcnow(), colour=0x1ABC9C)
                 embed.set_author(
-                    name=f"{playername} invited me to a guild!",
-                    icon_url="https://www.mc-heads.net/avatar/" + playername
+                    name=f"{event.username} invited me to a guild!",
+                    icon_url="https://www.mc-heads.net/avatar/" + event.username
                 )
+                self.dispatch("hypixel_guild_invite_recieved", event.username)
+                self.debug("Sending invite recieved message")
+                await self.send_message(lane=lane, embed=embed)
 
-                self.dispatch("hypixel_guild_invite_recieved", playername)
-                await self.send_debug_message("Sending invite recieved message")
-                await self.send_message(embed=embed)
-
-            elif "We blocked your comment" in message:
-                content = message.split("\"")[1]
-                user, message = content.split(": ")
+            elif category is ChatCategory.COMMENT_BLOCKED:
                 embed = Embed(color=discord.Color.red())
                 embed.set_author(
-                    name=f"{user}'s message \"{message}\" was blocked by Hypixel.",
+                    name=f"{event.username}'s message \"{event.message}\" was blocked by Hypixel.",
                 )
-                await self.send_debug_message("Sending message blocked message")
-                await self.send_message(embed=embed)
+                self.debug("Sending message blocked message")
+                await self.send_message(lane=lane, embed=embed)
 
             elif message.strip() == "":
                 return
 
             # /g info
-            elif "Created:" in message and "Members:" in message:
-                lines = message.splitlines()
-                guild_name = lines[1].strip()
-                date, time, _ = lines[3].split(": ")[1].split(" ")  # 2025-11-11 10:12 EST
-                year, month, day = date.split("-")
-                hour, minute = time.split(":")
-                created = datetime.datetime(
-                    int(year),
-                    int(month),
-                    int(day),
-                    int(hour),
-                    int(minute),
-                    tzinfo=zoneinfo.ZoneInfo("America/New_York"),
-                )
-                members = lines[4].split(": ")[1]
-                description = lines[5].split(": ")[1]
-                guild_exp = lines[8].split(": ")[1].split(" ")[0]
-                guild_rank = lines[8].split("(")[1].rstrip(")")
-                guild_level = lines[9].split(": ")[1]
-                exp_history = lines[11:-1]
+            elif category is ChatCategory.GUILD_INFO:
                 embed = Embed(
                     colour=0x1ABC9C,
-                    description=f"# {guild_name}\n"
-                                f"Description: {description}\n"
-                                f"Created: <t:{int(created.timestamp())}:F>\n"
-                                f"Members: {members}\n"
-                                f"Guild Experience: {guild_exp} (Rank {guild_rank})\n"
-                                f"Guild Level: {guild_level}\n"
+                    description=f"# {event.name}\n"
+                                f"Description: {event.description}\n"
+                                f"Created: <t:{int(event.created.timestamp())}:F>\n"
+                                f"Members: {event.members}\n"
+                                f"Guild Experience: {event.experience} (Rank {event.experience_rank})\n"
+                                f"Guild Level: {event.level}\n"
                 )
-                labels = []
-                values = []
-                for entry in exp_history:
-                    label, value = entry.split(":")
-                    labels.insert(0, label.strip())
-                    values.insert(0, int(value.strip().rstrip(" Guild Experience")))
+                labels = [label for label, _ in event.experience_history]
+                values = [value for _, value in event.experience_history]
                 line_chart = pygal.Line(interpolate='cubic')
                 line_chart.show_legend = False
                 line_chart.value_formatter = lambda x: f"{int(x):,}"
@@ -972,22 +933,21 @@ class DiscordBridgeBot(commands.Bot):
                 for label, value in zip(labels, values):
                     desc += f"{label}: {value:,}, "
                 desc.rstrip(", ")
-                file = discord.File(
+                file = functools.partial(
+                    discord.File,
                     filename,
                     filename="gexp_chart.png",
                     description=desc,
                 )
                 embed.set_image(url="attachment://gexp_chart.png")
-                await self.send_message(embed=embed, file=file)
-                # remove the file when we're done with it
-                os.remove(filename)
+                delivered = await self.send_message(lane=lane, embed=embed, file=file)
+                # remove the file once it's been sent (or given up on), retries read it again
+                delivered.add_done_callback(lambda _: os.remove(filename))
 
             # /g online | list
-            elif "Offline Members:" in message or "Online Members:" in message:
-                lines = message.splitlines()
-                guild_name = lines[1].split(": ")[1]
-                to_send = f"# {guild_name}"
-                for line in lines[3:]:
+            elif category is ChatCategory.GUILD_LIST:
+                to_send = f"# {event.name}"
+                for line in event.lines:
                     if line.strip().startswith("--"):
                         to_send += f"\n## {line.strip().strip('-').strip()}"
                     elif "●" in line:
@@ -1004,30 +964,23 @@ class DiscordBridgeBot(commands.Bot):
                     colour=0x1ABC9C,
                     description=to_send,
                 )
-                await self.send_message(embed=embed)
+                await self.send_message(lane=lane, embed=embed)
 
             # /g top
-            elif "Top Guild Experience" in message:
-                lines = message.splitlines()
-                title = lines[1]
-                month, day, year = title.split()[3].split("/")
-                date = datetime.date(month=int(month), day=int(day), year=int(year))
-                to_send = f"# Top Guild Experience: {date.strftime('%B %d, %Y')}"
-                for line in lines[2:]:
-                    split = line.split()
-                    if len(split) == 6:
-                        place, rank, name, amount, _, _ = split
+            elif category is ChatCategory.GUILD_TOP:
+                to_send = f"# Top Guild Experience: {event.date.strftime('%B %d, %Y')}"
+                for place, rank, name, amount in event.entries:
+                    if rank is not None:
                         to_send += f"\n{place} **{rank} {name}** {amount} Guild XP"
                     else:
-                        place, name, amount, _, _ = split
                         to_send += f"\n{place} **{name}** {amount} Guild XP"
                 embed = Embed(
                     colour=0x1ABC9C,
                     description=to_send,
                 )
-                await self.send_message(embed=embed)
+                await self.send_message(lane=lane, embed=embed)
 
-            elif "No one earned guild experience on" in message:
+            elif category is ChatCategory.NO_GUILD_EXPERIENCE:
                 line = next(
                     (
                         l.strip()
@@ -1040,10 +993,10 @@ class DiscordBridgeBot(commands.Bot):
                     colour=0x1ABC9C,
                     description=line,
                 )
-                await self.send_message(embed=embed)
+                await self.send_message(lane=lane, embed=embed)
             else:
-                await self.send_debug_message(f"Normal message: `{message}`")
+                self.debug(f"Normal message: `{message}`")
                 embed = discord.Embed(colour=0x1ABC9C, description=discord.utils.escape_markdown(message))
-                await self.send_message(embed=embed)
+                await self.send_message(lane=lane, embed=embed)
         except Exception as e:
             await self.on_error("minecraft_message", message, e)
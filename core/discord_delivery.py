@@ -0,0 +1,287 @@
+import asyncio
+import collections
+import enum
+import random
+import time
+import traceback
+from typing import Callable, Hashable
+
+import aiohttp
+import discord
+
+from core.colors import Color
+
+__all__ = ("DeliveryLane", "DiscordDelivery")
+
+# Discord's limits for a single message
+MAX_EMBEDS = 10
+MAX_EMBED_CHARS = 6000
+
+
+class DeliveryLane(enum.IntEnum):
+    """Discord delivery priority, lower goes first."""
+    URGENT = 0  # officer chat and moderation results
+    CHAT = 1
+    NOTICE = 2  # join/leave notices
+    DEBUG = 3
+
+
+class _Delivery:
+    __slots__ = ("send", "future", "queued_at", "attempts", "embeds", "group", "held")
+
+    def __init__(
+            self, send: Callable, future: asyncio.Future, embeds: list[discord.Embed] = None, group: Hashable = None
+    ):
+        self.send = send
+        self.future = future
+        self.queued_at = time.perf_counter()
+        self.attempts = 0
+        self.embeds = embeds
+        self.group = group
+        self.held = False
+
+
+class _Destination:
+    """One webhook or channel, with its own rate limit bucket and worker."""
+
+    def __init__(self, key: str, burst: int, per: float):
+        self.key = key
+        self.burst = burst
+        self.rate = burst / per
+        self.tokens = float(burst)
+        self.refilled_at = time.perf_counter()
+        self.lanes: dict[DeliveryLane, collections.deque[_Delivery]] = {
+            lane: collections.deque() for lane in DeliveryLane
+        }
+        self.wakeup = asyncio.Event()
+        self.task: asyncio.Task | None = None
+
+    def __len__(self):
+        return sum(len(queue) for queue in self.lanes.values())
+
+    def next(self) -> tuple[DeliveryLane, _Delivery] | None:
+        for lane, queue in self.lanes.items():
+            if queue:
+                return lane, queue[0]
+        return None
+
+    async def take_token(self):
+        while True:
+            now = time.perf_counter()
+            self.tokens = min(self.burst, self.tokens + (now - self.refilled_at) * self.rate)
+            self.refilled_at = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class _LaneStats:
+    __slots__ = ("sent", "failed", "wait_total", "wait_max")
+
+    def __init__(self):
+        self.sent = 0
+        self.failed = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+
+class DiscordDelivery:
+    """
+    Sends everything the bridge posts to Discord, paced per webhook and channel.
+
+    Each destination has its own token bucket and worker, so a rate limited webhook
+    only holds up its own messages. Within a destination messages are taken from the
+    highest priority `DeliveryLane` first and are otherwise delivered in order; a
+    failed send is retried in place with jittered exponential backoff, so nothing
+    behind it overtakes it.
+
+    Embed-only messages queued back to back in a lane are packed into one send of up
+    to `MAX_EMBEDS` embeds. That happens by itself whenever a backlog builds up, with
+    `batch_window` set a lone embed also waits that long for others to join it.
+
+    Connection errors call `on_connection_error` (to rebuild the webhooks) before
+    retrying, errors that retrying can't fix drop the message.
+    """
+
+    def __init__(
+            self,
+            *,
+            retries: int = 5,
+            base_delay: float = 1.0,
+            max_delay: float = 30.0,
+            batch_window: float = 0.0,
+            on_connection_error: Callable[[], None] = None,
+    ):
+        self.retries = retries
+        self.batch_window = batch_window
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.on_connection_error = on_connection_error
+        self.retried = 0
+        self.batches = 0
+        self.batched = 0
+        self._destinations: dict[str, _Destination] = {}
+        self._stats = {lane: _LaneStats() for lane in DeliveryLane}
+        self._closed = False
+
+    def __len__(self):
+        return sum(len(destination) for destination in self._destinations.values())
+
+    def submit(
+            self,
+            key: str,
+            lane: DeliveryLane,
+            send: Callable,
+            *,
+            limit: tuple[int, float] = (5, 2.0),
+            embeds: list[discord.Embed] = None,
+            group: Hashable = None,
+    ) -> asyncio.Future:
+        """
+        Queue `send` for the destination `key`, rate limited to `limit` (requests, per seconds).
+
+        If `embeds` is given the message can be packed with others of the same `group`,
+        `send` is then called with the list of embeds to post instead of no arguments.
+        Returns a future with the result of `send`, or None if it could not be delivered.
+        """
+        destination = self._destinations.get(key)
+        if destination is None:
+            destination = self._destinations[key] = _Destination(key, *limit)
+        future = asyncio.get_running_loop().create_future()
+        destination.lanes[lane].append(_Delivery(send, future, embeds, group))
+        if not self._closed and (destination.task is None or destination.task.done()):
+            destination.task = asyncio.create_task(self._run(destination))
+        destination.wakeup.set()
+        return future
+
+    async def close(self, timeout: float = 5.0):
+        """Give queued messages `timeout` seconds to go out, then stop the workers."""
+        self._closed = True
+        deadline = time.perf_counter() + timeout
+        while len(self) and time.perf_counter() < deadline:
+            await asyncio.sleep(0.1)
+        for destination in self._destinations.values():
+            if destination.task is not None:
+                destination.task.cancel()
+            for queue in destination.lanes.values():
+                while queue:
+                    delivery = queue.popleft()
+                    if not delivery.future.done():
+                        delivery.future.set_result(None)
+
+    def stats(self) -> dict:
+        stats = {
+            "destinations": len(self._destinations),
+            "retried": self.retried,
+            "batches": self.batches,
+            "batched": self.batched,
+        }
+        for lane in DeliveryLane:
+            lane_stats = self._stats[lane]
+            name = lane.name.lower()
+            stats[f"{name}_pending"] = sum(len(d.lanes[lane]) for d in self._destinations.values())
+            stats[f"{name}_sent"] = lane_stats.sent
+            stats[f"{name}_failed"] = lane_stats.failed
+            stats[f"{name}_wait_avg"] = lane_stats.wait_total / lane_stats.sent if lane_stats.sent else 0.0
+            stats[f"{name}_wait_max"] = lane_stats.wait_max
+        return stats
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        return random.uniform(delay / 2, delay)
+
+    @staticmethod
+    def _retryable(error: Exception) -> bool:
+        if isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError)):
+            return True
+        if isinstance(error, discord.HTTPException):
+            return error.status == 429 or error.status >= 500
+        return False
+
+    @staticmethod
+    def _collect(queue: collections.deque[_Delivery]) -> list[_Delivery]:
+        """The head of `queue` and whatever queued right behind it fits in the same send."""
+        head = queue[0]
+        if head.embeds is None:
+            return [head]
+        batch = []
+        embeds = chars = 0
+        for delivery in queue:
+            if delivery.embeds is None or delivery.group != head.group:
+                break
+            size = sum(len(embed) for embed in delivery.embeds)
+            if batch and (embeds + len(delivery.embeds) > MAX_EMBEDS or chars + size > MAX_EMBED_CHARS):
+                break
+            batch.append(delivery)
+            embeds += len(delivery.embeds)
+            chars += size
+        return batch
+
+    async def _deliver(self, destination: _Destination, lane: DeliveryLane, batch: list[_Delivery]):
+        lane_stats = self._stats[lane]
+        head = batch[0]
+        while True:
+            await destination.take_token()
+            head.attempts += 1
+            try:
+                if head.embeds is None:
+                    result = await head.send()
+                else:
+                    result = await head.send([embed for delivery in batch for embed in delivery.embeds])
+            except Exception as e:
+                if not self._retryable(e) or head.attempts > self.retries:
+                    lane_stats.failed += len(batch)
+                    print(f"{Color.CYAN}Discord{Color.RESET} > Failed to deliver message to {destination.key}: {e}")
+                    traceback.print_exc()
+                    for delivery in batch:
+                        if not delivery.future.done():
+                            delivery.future.set_result(None)
+                    return
+                self.retried += 1
+                if isinstance(e, aiohttp.ClientError) and self.on_connection_error is not None:
+                    self.on_connection_error()
+                delay = self._backoff(head.attempts)
+                print(
+                    f"{Color.CYAN}Discord{Color.RESET} > Delivery to {destination.key} failed ({e}), "
+                    f"retrying in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+                continue
+            now = time.perf_counter()
+            if len(batch) > 1:
+                self.batches += 1
+                self.batched += len(batch)
+            for delivery in batch:
+                wait = now - delivery.queued_at
+                lane_stats.sent += 1
+                lane_stats.wait_total += wait
+                lane_stats.wait_max = max(lane_stats.wait_max, wait)
+                if not delivery.future.done():
+                    delivery.future.set_result(result)
+            return
+
+    async def _run(self, destination: _Destination):
+        try:
+            while True:
+                await destination.wakeup.wait()
+                destination.wakeup.clear()
+                while (found := destination.next()) is not None:
+                    lane, delivery = found
+                    queue = destination.lanes[lane]
+                    if delivery.embeds is not None and self.batch_window and not delivery.held:
+                        # give a lone embed a moment to pick up company, then look again
+                        delivery.held = True
+                        if len(self._collect(queue)) < MAX_EMBEDS:
+                            await asyncio.sleep(self.batch_window)
+                            continue
+                    batch = self._collect(queue)
+                    try:
+                        await self._deliver(destination, lane, batch)
+                    finally:
+                        # only dequeued once done, so a retry keeps its place
+                        for done in batch:
+                            if queue and queue[0] is done:
+                                queue.popleft()
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,124 @@
+import asyncio
+import os
+import time
+import traceback
+from typing import Callable
+
+from core.colors import Color
+
+__all__ = ("ErrorAggregator",)
+
+
+def fingerprint(source: str, error: BaseException) -> tuple[str, str, str]:
+    """(source, exception type, innermost frame) - the same bug thrown by every chat line matches."""
+    location = "?"
+    # walk_tb doesn't read source lines, unlike extract_tb
+    for frame, lineno in traceback.walk_tb(error.__traceback__):
+        location = f"{os.path.basename(frame.f_code.co_filename)}:{lineno} in {frame.f_code.co_name}"
+    return source, type(error).__qualname__, location
+
+
+class _ErrorEntry:
+    __slots__ = ("reported", "suppressed", "total", "first", "last", "last_seen")
+
+    def __init__(self):
+        self.reported = 0
+        self.suppressed = 0
+        self.total = 0
+        self.first: str | None = None
+        self.last: str | None = None
+        self.last_seen = 0.0
+
+
+class ErrorAggregator:
+    """
+    Keeps an error storm from flooding the debug webhook.
+
+    Errors are fingerprinted by where they were caught, their type and the innermost
+    stack frame. The first `burst` of each fingerprint per `interval` seconds are
+    reported in full by the caller. The rest are only counted, and every `interval`
+    seconds `post` gets one summary per fingerprint with the count and the first and
+    last messages seen.
+    """
+
+    def __init__(self, post: Callable[[str], None], *, interval: float = 60.0, burst: int = 1):
+        self.post = post
+        self.interval = interval
+        self.burst = burst
+        self.suppressed = 0
+        self._entries: dict[tuple[str, str, str], _ErrorEntry] = {}
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self.running:
+            self._task.cancel()
+        self._task = None
+        self.summarize()
+
+    def record(self, source: str, error: BaseException) -> bool:
+        """Count `error`, returns whether the caller should report it in full."""
+        key = fingerprint(source, error)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _ErrorEntry()
+        entry.total += 1
+        entry.last_seen = time.monotonic()
+        if entry.reported < self.burst:
+            entry.reported += 1
+            return True
+        self.suppressed += 1
+        entry.suppressed += 1
+        sample = (str(error) or type(error).__name__)[:200]
+        if entry.first is None:
+            entry.first = sample
+        entry.last = sample
+        return False
+
+    def summarize(self):
+        """Post a summary for every fingerprint with suppressed errors and start a new window."""
+        now = time.monotonic()
+        for key, entry in list(self._entries.items()):
+            if entry.suppressed:
+                source, error_type, location = key
+                summary = (
+                    f"`{error_type}` in {source} at {location}: {entry.suppressed} more in the last "
+                    f"{self.interval:g}s ({entry.total} total)\nfirst: `{entry.first}`"
+                )
+                if entry.suppressed > 1:
+                    summary += f"\nlast: `{entry.last}`"
+                print(f"{Color.CYAN}Discord{Color.RESET} > {Color.RED}[ERROR]{Color.RESET}", summary.replace("\n", ", "))
+                try:
+                    self.post(summary)
+                except Exception:
+                    traceback.print_exc()
+            elif now - entry.last_seen > self.interval:
+                # quiet for a whole window, the next one is reported in full again
+                del self._entries[key]
+                continue
+            entry.reported = 0
+            entry.suppressed = 0
+            entry.first = entry.last = None
+
+    def stats(self) -> dict:
+        return {
+            "fingerprints": len(self._entries),
+            "suppressed": self.suppressed,
+            "pending": sum(entry.suppressed for entry in self._entries.values()),
+        }
+
+    async def _run(self):
+        try:
+            while True:
+                await asyncio.sleep(self.interval)
+                self.summarize()
+        except asyncio.CancelledError:
+            pass
@@ -9,6 +9,11 @@ class InvalidConfig(BridgeBotException):
     pass
 
 
+class BridgeUnavailable(BridgeBotException):
+    """Raised when a call to the Node bridge is refused because it stopped responding."""
+    pass
+
+
 def send_debug_message(*args, **kwargs) -> None:
     """Send a debug message to the debug channel."""
     from core.config import DiscordConfig
@@ -0,0 +1,22 @@
+// Microsoft auth helpers for the bridge.
+//
+// Every Authflow here uses the same title and flow as minecraft-protocol's own
+// microsoft auth, so they all read and write the one token cache in profilesFolder.
+
+function authflow (auth, options, extra = {}) {
+  const flowOptions = Object.assign({
+    authTitle: auth.Titles.MinecraftNintendoSwitch,
+    deviceType: 'Nintendo',
+    flow: 'live'
+  }, options, extra)
+  return new auth.Authflow(options.username, options.profilesFolder, flowOptions)
+}
+
+// Refresh the cached tokens now, instead of during the next connect.
+async function refresh (auth, options) {
+  const flow = authflow(auth, options, { forceRefresh: true })
+  const { profile } = await flow.getMinecraftJavaToken({ fetchProfile: true })
+  return profile.name
+}
+
+module.exports = { authflow, refresh }
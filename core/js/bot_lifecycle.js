@@ -0,0 +1,13 @@
+// Tear down a mineflayer bot without restarting the Node runtime, so a relog
+// only has to create a new bot and log in again.
+
+module.exports.dispose = function dispose (bot) {
+  // our Python listeners go with this, the JS finalizer releases their refs
+  bot.removeAllListeners()
+  // nobody is listening any more, don't let a late socket error crash the process
+  bot.on('error', () => {})
+  bot._client.on('error', () => {})
+  try {
+    bot.end('relog')
+  } catch (e) {}
+}
@@ -0,0 +1,95 @@
+// Chat pre-filter for the bridge.
+//
+// Runs inside the Node runtime so lines the bridge doesn't care about (lobby spam,
+// party/friend messages, DMs) never cross the pythonia bridge. Relevant lines are
+// re-emitted on the bot as `eventName` with the plain string as the only argument.
+//
+// Dash-framed command output (/g info, /g list, /g top) is let through as a whole,
+// framing is done again on the Python side.
+//
+// With `source: 'packet'` the raw 1.8.9 chat packet is used instead of mineflayer's
+// messagestr, so no ChatMessage tree is built for lines we throw away.
+
+function isOpen (line) {
+  return line.startsWith('-----') && line.endsWith('-----')
+}
+
+function isClose (line) {
+  return line.startsWith('----------') || line.endsWith('----------')
+}
+
+// Only what the bridge needs: text, extra and simple translations. Formatting,
+// click/hover events and scores are ignored.
+function flatten (component) {
+  if (typeof component === 'string') return component
+  if (Array.isArray(component)) return component.map(flatten).join('')
+  if (component === null || typeof component !== 'object') return ''
+  let text = ''
+  if (component.text !== undefined) {
+    text += component.text
+  } else if (component.translate !== undefined) {
+    const args = (component.with || []).map(flatten)
+    let i = 0
+    text += component.translate.replace(/%(?:(\d+)\$)?s/g, (_, n) => args[n ? n - 1 : i++] ?? '')
+  }
+  if (component.extra) {
+    for (const part of component.extra) text += flatten(part)
+  }
+  return text
+}
+
+function packetText (raw) {
+  let text
+  try {
+    text = flatten(JSON.parse(raw))
+  } catch (e) {
+    text = raw
+  }
+  // legacy formatting codes, messagestr strips these too
+  return text.replace(/\u00a7./g, '')
+}
+
+module.exports = function install (bot, options) {
+  const pattern = new RegExp(options.pattern, 'i')
+  const passAll = Boolean(options.passAll)
+  const blockTimeout = options.blockTimeout * 1000
+  const blockLines = options.blockLines
+  const eventName = options.eventName
+
+  let blockUntil = 0
+  let lines = 0
+
+  function relevant (message) {
+    if (passAll) return true
+    const now = Date.now()
+    if (now < blockUntil) {
+      lines++
+      if (isClose(message) || lines >= blockLines) blockUntil = 0
+      return true
+    }
+    if (isOpen(message)) {
+      blockUntil = now + blockTimeout
+      lines = 0
+      return true
+    }
+    return pattern.test(message)
+  }
+
+  if (options.source === 'packet') {
+    const listener = (packet) => {
+      // 2 is the action bar
+      if (packet.position === 2) return
+      const message = packetText(packet.message)
+      if (relevant(message)) bot.emit(eventName, message)
+    }
+    bot._client.on('chat', listener)
+    return () => bot._client.removeListener('chat', listener)
+  }
+
+  const listener = (message, position) => {
+    if (position === 'game_info') return
+    if (relevant(message)) bot.emit(eventName, message)
+  }
+  bot.on('messagestr', listener)
+  return () => bot.removeListener('messagestr', listener)
+}
@@ -0,0 +1,30 @@
+// Connect phase timing for the bridge.
+//
+// The listeners have to be attached in the same tick as createBot, auth with a
+// cached session can finish before a call from Python would get here.
+
+module.exports.createBot = function createBot (mineflayer, options) {
+  const started = Date.now()
+  const bot = mineflayer.createBot(options)
+  const marks = {}
+  const mark = (name) => () => {
+    if (!(name in marks)) marks[name] = Date.now()
+  }
+  bot._client.once('session', mark('auth'))
+  bot._client.once('connect', mark('connect'))
+  bot.once('login', mark('login'))
+  bot.once('spawn', mark('spawn'))
+  bot.connectPhases = function connectPhases () {
+    // seconds spent in each phase, in order; offline auth has no auth phase
+    const phases = {}
+    let last = started
+    for (const name of ['auth', 'connect', 'login', 'spawn']) {
+      if (name in marks) {
+        phases[name] = (marks[name] - last) / 1000
+        last = marks[name]
+      }
+    }
+    return JSON.stringify(phases)
+  }
+  return bot
+}
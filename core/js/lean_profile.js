@@ -0,0 +1,91 @@
+// Chat-only profile for the bridge.
+//
+// The bot sits in limbo and only needs login, keepalive and chat, so world,
+// entity and chunk packets are dropped before protodef parses them. The plugins
+// that would consume them are disabled through the createBot options on the
+// Python side (see LEAN_BOT_OPTIONS in core/minecraft_bot.py).
+
+const DROPPED_PACKETS = new Set([
+  'map_chunk',
+  'map_chunk_bulk',
+  'block_change',
+  'multi_block_change',
+  'block_action',
+  'block_break_animation',
+  'tile_entity_data',
+  'update_sign',
+  'map',
+  'explosion',
+  'world_event',
+  'world_particles',
+  'named_sound_effect',
+  'spawn_entity',
+  'spawn_entity_living',
+  'spawn_entity_painting',
+  'spawn_entity_experience_orb',
+  'spawn_entity_weather',
+  'named_entity_spawn',
+  'entity_destroy',
+  'entity',
+  'rel_entity_move',
+  'entity_look',
+  'entity_move_look',
+  'entity_teleport',
+  'entity_head_rotation',
+  'entity_velocity',
+  'entity_metadata',
+  'entity_equipment',
+  'entity_effect',
+  'remove_entity_effect',
+  'entity_update_attributes',
+  'entity_status',
+  'attach_entity',
+  'animation',
+  'collect',
+  'window_items',
+  'set_slot',
+  'statistics',
+  'scoreboard_objective',
+  'scoreboard_score',
+  'scoreboard_display_objective',
+  'scoreboard_team'
+])
+
+function droppedIds (protocol) {
+  // play.toClient.types.packet is ["container", [{ name: "name", type: ["mapper", { mappings }] }, ...]]
+  const mappings = protocol.play.toClient.types.packet[1][0].type[1].mappings
+  const ids = new Set()
+  for (const [id, name] of Object.entries(mappings)) {
+    if (DROPPED_PACKETS.has(name)) ids.add(parseInt(id, 16))
+  }
+  return ids
+}
+
+function patchDeserializer (deserializer, ids) {
+  const parse = deserializer.parsePacketBuffer.bind(deserializer)
+  deserializer.parsePacketBuffer = (buffer) => {
+    // all 1.8 play packet ids fit in a single varint byte
+    if (ids.has(buffer[0])) {
+      return {
+        data: { name: 'bridge_dropped', params: {} },
+        metadata: { size: buffer.length },
+        buffer,
+        fullBuffer: buffer
+      }
+    }
+    return parse(buffer)
+  }
+}
+
+module.exports = function install (bot) {
+  let ids = null
+  bot._client.on('state', (state) => {
+    if (state !== 'play') return
+    try {
+      if (ids === null) ids = droppedIds(bot.registry.protocol)
+      patchDeserializer(bot._client.deserializer, ids)
+    } catch (e) {
+      console.error('Lean profile: could not install the packet filter', e)
+    }
+  })
+}
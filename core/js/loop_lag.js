@@ -0,0 +1,31 @@
+// Node event-loop delay for the bridge's latency metrics.
+//
+// `start` is called when a runtime comes up with metrics enabled, each sample
+// reports the delay since the previous one and starts a new window.
+
+const { monitorEventLoopDelay } = require('perf_hooks')
+
+let histogram = null
+
+module.exports.start = function start () {
+  if (histogram !== null) return
+  histogram = monitorEventLoopDelay({ resolution: 20 })
+  histogram.enable()
+}
+
+module.exports.sample = function sample () {
+  if (histogram === null) {
+    // metrics were enabled after this runtime came up, measure from now on
+    module.exports.start()
+  }
+  // nanoseconds to seconds, NaN/Infinity before the first tick
+  const seconds = (value) => (Number.isFinite(value) ? value / 1e9 : 0)
+  const result = {
+    mean: seconds(histogram.mean),
+    p50: seconds(histogram.percentile(50)),
+    p99: seconds(histogram.percentile(99)),
+    max: seconds(histogram.max)
+  }
+  histogram.reset()
+  return JSON.stringify(result)
+}
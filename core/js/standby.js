@@ -0,0 +1,57 @@
+// Hot standby for the bridge.
+//
+// Keeps a Microsoft session for the account ready between connects, so after a
+// kick the next bot only has to open the connection to the server. The session
+// is handed to minecraft-protocol through a custom `auth` function, which does
+// what its microsoft auth does minus the token round trips.
+
+const { authflow } = require('./auth_cache.js')
+const connectTiming = require('./connect_timing.js')
+
+module.exports.create = function create (auth, options, maxAge = 30 * 60 * 1000) {
+  const flow = authflow(auth, options)
+
+  const standby = {
+    session: null,
+    refreshedAt: 0,
+
+    fresh () {
+      return standby.session !== null && Date.now() - standby.refreshedAt < maxAge
+    },
+
+    async refresh () {
+      const { token, profile } = await flow.getMinecraftJavaToken({ fetchProfile: true })
+      if (!profile || profile.error) {
+        throw new Error(`No Minecraft profile for this account: ${profile && profile.errorMessage}`)
+      }
+      standby.session = { accessToken: token, selectedProfile: profile, availableProfile: [profile] }
+      standby.refreshedAt = Date.now()
+      return profile.name
+    },
+
+    invalidate () {
+      standby.session = null
+    },
+
+    auth (client, clientOptions) {
+      const ready = standby.fresh() ? Promise.resolve(standby.session) : standby.refresh().then(() => standby.session)
+      ready.then((session) => {
+        client.session = session
+        client.username = session.selectedProfile.name
+        clientOptions.accessToken = session.accessToken
+        clientOptions.haveCredentials = true
+        client.emit('session', session)
+        clientOptions.connect(client)
+      }, (err) => {
+        // a rejected token must not be reused by the next attempt
+        standby.session = null
+        client.emit('error', err)
+      })
+    },
+
+    createBot (mineflayer, botOptions) {
+      return connectTiming.createBot(mineflayer, Object.assign({}, botOptions, { auth: standby.auth }))
+    }
+  }
+  return standby
+}
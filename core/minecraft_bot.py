@@ -1,4 +1,6 @@
 import asyncio
+import gc
+import hashlib
 import json
 import sys
 import time
@@ -8,21 +10,150 @@ import traceback
 
 import javascript
 from javascript import require, On, config
+from javascript.proxy import Proxy
+from javascript.pyi import PyInterface
 
+from core.bridge_metrics import bridge_metrics
+from core.chat_classifier import ChatCategory, classify, prefilter_pattern, FORWARDED_CATEGORIES
+from core.chat_scheduler import ChatLane
 from core.colors import Color
 from core.config import ServerConfig, SettingsConfig, AccountConfig
 
+# emitted on the mineflayer bot by js/chat_filter.js
+FILTERED_CHAT_EVENT = "bridge_chat"
+
+# Chat-only profile: the bot idles in limbo, so only login, keepalive, kick and
+# chat handling are kept. js/lean_profile.js drops the packets these plugins would
+# have consumed before they are parsed.
+LEAN_BOT_OPTIONS = {
+    "physicsEnabled": False,
+    "plugins": {
+        plugin: False
+        for plugin in (
+            "anvil", "bed", "block_actions", "blocks", "book", "boss_bar", "breath", "chest",
+            "command_block", "craft", "creative", "digging", "enchantment_table", "experience",
+            "explosion", "fishing", "furnace", "generic_place", "inventory", "particle",
+            "place_block", "place_entity", "rain", "ray_trace", "scoreboard", "simple_inventory",
+            "sound", "spawn_point", "team", "time", "title", "villager",
+        )
+    },
+}
+
+
+# token cache shared by minecraft-protocol and js/auth_cache.js
+PROFILES_FOLDER = "/root/.minecraft/nmp-cache"
+
+# js/standby.js handle with a pre-authenticated session, only used with `hotStandby`.
+# It lives in the Node runtime, so it's dropped whenever the runtime is terminated.
+_standby = None
+
+
+def release_python_refs():
+    """
+    Drop the Python objects a terminated JS runtime was still referencing.
+
+    pythonia keeps them in a class-level map that survives `javascript.terminate()`,
+    so every restart would otherwise keep the old callbacks (and the manager and
+    proxies they close over) alive for the lifetime of the process.
+    """
+    for ffid in [ffid for ffid in PyInterface.m if ffid != 0]:
+        del PyInterface.m[ffid]
+
+
+def terminate_runtime():
+    """Kill the Node runtime; the next `javascript.init()` starts a fresh one."""
+    global _standby
+    _standby = None
+    javascript.terminate()
+    release_python_refs()
+
+
+def runtime_alive() -> bool:
+    """Whether the Node runtime is up and answering bridge calls."""
+    if javascript.config.event_loop is None:
+        return False
+    try:
+        javascript.config.global_jsi.needsNodePatches()
+    except Exception:
+        return False
+    return True
+
+
+def _bot_options() -> dict:
+    options = {
+        "host": ServerConfig.host,
+        "port": ServerConfig.port,
+        "version": "1.8.9",
+        "username": AccountConfig.email,
+        "auth": "microsoft",
+        "profilesFolder": PROFILES_FOLDER,
+        "viewDistance": "tiny",
+    }
+    if SettingsConfig.leanProfile:
+        options.update(LEAN_BOT_OPTIONS)
+    return options
+
+
+def token_expiry() -> float | None:
+    """
+    When the cached Minecraft access token expires, as a unix timestamp.
+
+    Read from the prismarine-auth cache file, None if there is no usable cache yet.
+    """
+    account = hashlib.sha1(AccountConfig.email.encode()).hexdigest()[:6]
+    try:
+        with open(os.path.join(PROFILES_FOLDER, f"{account}_mca-cache.json")) as f:
+            token = json.load(f)["mca"]
+        return (token["obtainedOn"] + token["expires_in"] * 1000) / 1000
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def start_loop_lag_monitor():
+    """Start measuring the Node event-loop delay in this runtime. Blocking."""
+    javascript.require("./js/loop_lag.js").start()
+
+
+def sample_loop_lag() -> dict:
+    """Node event-loop delay since the last sample, in seconds. Blocking."""
+    return json.loads(javascript.require("./js/loop_lag.js").sample())
+
+
+def _is_own_line(message: str, username: str) -> bool:
+    """Whether a "Guild > [RANK] name [Guild rank]: text" / "Officer > ..." chat line was said by `username`."""
+    channel, _, rest = message.partition(" > ")
+    if channel not in ("Guild", "Officer"):
+        return False
+    if rest.startswith("["):
+        rest = rest.partition("] ")[2]
+    if rest.startswith(username + ": "):
+        return True
+    # "name [Guild rank]: text", presence lines ("name joined.") aren't chat
+    return rest.startswith(username + " [") and "]: " in rest
+
+
+def _node_memory_usage():
+    # kept free of locals, eval_js sends the caller's locals over the bridge
+    return javascript.eval_js("JSON.stringify(process.memoryUsage())")
+
 
 class MinecraftBotManager:
     def __init__(self, client, bot):
         self.client = client
         self.bot = bot
-        self.wait_response = False
-        self.buffer_start = 0
-        self.message_buffer = []
         self.auto_restart = True
         self._online = False
         self._starting = False
+        # snapshot of stable bot properties, taken on login so the hot path
+        # doesn't need a bridge round trip for every chat line
+        self.username: str | None = None
+        self.uuid: str | None = None
+        self.version: str | None = None
+        self.host: str = ServerConfig.host
+        # seconds spent in each phase of the (re)connect that created this bot
+        self.relog_timings: dict[str, float] = {}
+        self._relog_started = time.perf_counter()
+        self._stopped = False
         if SettingsConfig.printChat:
             print(f"{Color.GREEN}Minecraft{Color.RESET} > {Color.YELLOW}[WARNING]{Color.RESET} Chat logging is enabled!")
 
@@ -35,12 +166,23 @@ class MinecraftBotManager:
     def is_starting(self):
         return self._starting
 
-    async def chat(self, message):
+    async def chat(self, message, *, lane: ChatLane = None, coalesce: bool = False) -> bool:
+        """
+        Say something in Minecraft, paced by the client's `ChatScheduler`.
+
+        The lane is guessed from the command if not given. Waits until the line was
+        sent and returns False if it was dropped instead.
+        """
+        return await self.client.chat_scheduler.send(self, message, lane, coalesce=coalesce)
+
+    def _say(self, message):
+        # on the bridge thread, stamped right before it's handed to Node
+        self.client.rtt_probe.sending(message)
+        self.bot.chat(message)
+
+    async def send_chat(self, message):
         try:
-            await asyncio.wait_for(
-                self.client.loop.run_in_executor(None, self.bot.chat, message),
-                timeout=15,
-            )
+            await self.client.bridge.run(self._say, message, name="chat")
         except asyncio.TimeoutError:
             print(f"{Color.GREEN}Minecraft{Color.RESET} > chat() timed out - message may not have been sent")
         except Exception as e:
@@ -49,57 +191,152 @@ class MinecraftBotManager:
             else:
                 raise
 
-    def stop(self, restart: bool = True):
-        print(f"{Color.GREEN}Minecraft{Color.RESET} > Stopping bot...")
-        # idk why but this literally never works
-        # so skip it and force terminate the js environment
-        # try:
-        #     self.bot.quit()
-        # except Exception as e:
-        #     pass
+    def stop(self, restart: bool = True, *, terminate: bool = False):
+        """
+        Ask the supervisor to stop this bot, and connect a new one if `restart` is set.
+
+        Safe to call from any thread, the actual teardown happens in `shutdown`.
+        """
         self._starting = restart
         self._online = False
         # Clear reference so Redis knows bot is offline during restart
-        self.client.mineflayer_bot = None
-        javascript.terminate()
-        if restart:
-            time.sleep(3)
-            print(f"{Color.GREEN}Minecraft{Color.RESET} > Restarting...")
+        if self.client.mineflayer_bot is self:
+            self.client.mineflayer_bot = None
+        self.client.loop.call_soon_threadsafe(self.client.minecraft.disconnected, self, restart, terminate)
+
+    def detach(self) -> bool:
+        """Mark this bot stopped without touching the runtime. Returns False if it already was."""
+        if self._stopped:
+            return False
+        self._stopped = True
+        print(f"{Color.GREEN}Minecraft{Color.RESET} > Stopping bot...")
+        self._online = False
+        if self.client.mineflayer_bot is self:
+            self.client.mineflayer_bot = None
+        return True
+
+    def shutdown(self, terminate: bool = False) -> bool:
+        """
+        Tear this bot down. Blocking, run it on the bridge executor.
+
+        The Node runtime is kept for the next bot unless `terminate` is set or the
+        runtime stopped responding. Returns whether it was terminated.
+        """
+        if not self.detach():
+            return terminate
+        if not terminate and runtime_alive():
             try:
-                self.createbot(self.client)
+                javascript.require("./js/bot_lifecycle.js").dispose(self.bot)
             except Exception as e:
-                print(f"{Color.GREEN}Minecraft{Color.RESET} > Error: {e}")
-                traceback.print_exc()
-                raise
+                print(f"{Color.GREEN}Minecraft{Color.RESET} > Could not dispose the bot, restarting the JS runtime: {e}")
+                terminate = True
+        else:
+            terminate = True
+        if terminate:
+            terminate_runtime()
+        return terminate
+
+    def runtime_stats(self) -> dict:
+        """
+        Gauges for the pythonia bridge and the Node process.
 
+        Reading the Node heap is a blocking bridge call, run this in an executor.
+        """
+        loop = javascript.config.event_loop
+        stats = {
+            "proxies": sum(1 for obj in gc.get_objects() if type(obj) is Proxy),
+            "pending_frees": len(loop.freeable) if loop is not None else 0,
+            "callbacks": len(loop.callbacks) if loop is not None else 0,
+            "python_refs": len(PyInterface.m) - 1,
+        }
+        try:
+            memory = json.loads(_node_memory_usage())
+        except Exception as e:
+            stats["node_error"] = str(e)
+        else:
+            stats["node_rss"] = memory["rss"]
+            stats["node_heap_used"] = memory["heapUsed"]
+            stats["node_heap_total"] = memory["heapTotal"]
+        return stats
 
-    def send_to_discord(self, message):
+    def send_to_discord(self, message, category: ChatCategory = None):
         if SettingsConfig.printChat:
             print(f"{Color.GREEN}Minecraft{Color.RESET} > Dispatching to Discord")
-        asyncio.run_coroutine_threadsafe(self.client.send_discord_message(message), self.client.loop)
+        if category is None:
+            category = classify(message)
+        self.client.chat_relay.push(message, category)
+
+    def _repeat_rejected(self, message: str, at: float):
+        # on the loop, straight from the chat callback
+        if self.client.chat_scheduler.rejected(at):
+            self.client.debug("Resending a message refused as a repeat")
+        else:
+            self.send_to_discord(message, ChatCategory.SAME_MESSAGE_TWICE)
+
+    def refresh_snapshot(self):
+        """Re-read the bot properties that only change on (re)login."""
+        with bridge_metrics.timed("get"):
+            username = self.bot.username
+        if username is not None and not isinstance(username, str):
+            try:
+                username = "".join(username)
+            except Exception:
+                username = str(username)
+        self.username = username
+        try:
+            with bridge_metrics.timed("get"):
+                self.uuid = self.bot._client.uuid
+        except Exception:
+            self.uuid = None
+        try:
+            with bridge_metrics.timed("get"):
+                self.version = self.bot.version
+        except Exception:
+            self.version = None
+
+    def _on(self, event: str):
+        """`javascript.On` for this bot, timed as an `on` bridge call."""
+        def decorator(handler):
+            with bridge_metrics.timed("on"):
+                return javascript.On(self.bot, event)(handler)
+        return decorator
 
     def oncommands(self):
-        message_buffer = []
+        @self._on("login")
+        def on_login(*args):
+            self.refresh_snapshot()
 
-        @javascript.On(self.bot, "spawn")
+        @self._on("spawn")
         def login():
+            if self.username is None:
+                # missed the login event (e.g. registered too late)
+                self.refresh_snapshot()
+            if "total" not in self.relog_timings:
+                self.relog_timings["total"] = time.perf_counter() - self._relog_started
+                try:
+                    # auth, connect, login and spawn, timed in JS by js/connect_timing.js
+                    self.relog_timings.update(json.loads(self.bot.connectPhases()))
+                except Exception as e:
+                    print(f"{Color.GREEN}Minecraft{Color.RESET} > Could not read connect timings: {e}")
+                print(
+                    f"{Color.GREEN}Minecraft{Color.RESET} > Connected in {self.relog_timings['total']:.2f}s ("
+                    + ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in self.relog_timings.items() if phase != "total")
+                    + ")"
+                )
             if not self._online:
                 self.send_to_discord("Bot Online\n" + "\n".join(self.client.startup_messages))
-                print(f"{Color.GREEN}Minecraft{Color.RESET} > Bot is logged in as", self.bot.username)
+                print(f"{Color.GREEN}Minecraft{Color.RESET} > Bot is logged in as", self.username)
             self._online = True
-            self.client.dispatch("minecraft_ready")
-            time.sleep(3)
-            self.bot.chat("/limbo")
+            # the supervisor dispatches minecraft_ready and sends us to limbo
+            self.client.loop.call_soon_threadsafe(self.client.minecraft.connected, self)
 
-        @javascript.On(self.bot, "end")
+        @self._on("end")
         def end(reason):
-            time.sleep(3)
             print(f"{Color.GREEN}Minecraft{Color.RESET} > Bot offline: {reason}")
             self.send_to_discord("Bot Offline")
-            self.client.dispatch("minecraft_disconnected")
             self.stop(self.auto_restart)
 
-        @javascript.On(self.bot, "kicked")
+        @self._on("kicked")
         def kicked(reason, loggedIn):
             if isinstance(reason, str):
                 try:
@@ -111,105 +348,85 @@ class MinecraftBotManager:
             else:
                 reason_text = reason.get("text", "") + "".join([e.get("text", "") for e in reason.get("extra", [])])
             print(f"{Color.GREEN}Minecraft{Color.RESET} > Bot kicked: {reason_text}")
-            self.client.dispatch("minecraft_disconnected")
             if loggedIn:
                 self.send_to_discord(f"Bot kicked from the server.")
                 self.stop(True)
             else:
                 self.send_to_discord(f"Bot kicked before logging in to the server.")
-                self.stop(False)
+                if _standby is not None:
+                    # the server may have rejected the session, don't hand it out again
+                    try:
+                        _standby.invalidate()
+                    except Exception:
+                        pass
+                # e.g. throttled or "already connected", retried with backoff as a failed attempt
+                self.stop(True)
 
-        @javascript.On(self.bot, "error")
+        @self._on("error")
         def error(reason):
             print(reason)
-            self.client.dispatch("minecraft_error")
+            self.client.loop.call_soon_threadsafe(self.client.dispatch, "minecraft_error")
 
-        @javascript.On(self.bot, "messagestr")
-        def chat(message, _, raw_message, *args):
-            if self.bot.username is None:
-                pass
-            else:
-                if SettingsConfig.printChat:
-                    print(f"{Color.GREEN}Minecraft{Color.RESET} > Chat: {message}")
-                username = self.bot.username
-                if not isinstance(username, str):
-                    try:
-                        username = "".join(username)
-                    except Exception:
-                        username = str(username)
-                if message.startswith("Guild > " + username) or message.startswith(
-                        "Officer > " + username
-                ):
-                    return
-                if message.startswith("Guild >") or message.startswith("Officer >"):
-                    self.send_to_discord(message)
-                    return
-
-                if "Unknown command" in message:
-                    self.send_to_discord(message)
-                elif "Click here to accept or type /guild accept " in message:
-                    self.send_to_discord(message)
-                elif " is already in another guild!" in message or \
-                        ("You invited" in message and "to your guild. They have 5 minutes to accept." in message) or \
-                        "You sent an offline invite to " in message or \
-                        " joined the guild!" in message or \
-                        " left the guild!" in message or \
-                        " was promoted from " in message or \
-                        " was demoted from " in message or \
-                        " was kicked from the guild!" in message or \
-                        " was kicked from the guild by " in message or \
-                        "You cannot invite this player to your guild!" in message or \
-                        "Disabled guild join/leave notifications!" in message or \
-                        "Enabled guild join/leave notifications!" in message or \
-                        "You cannot say the same message twice!" in message or \
-                        "You don't have access to the officer chat!" in message or \
-                        "Your guild is full!" in message or \
-                        "is already in your guild!" in message or \
-                        ("has muted" in message and "for" in message) or \
-                        "has unmuted" in message or \
-                        "You're currently guild muted" in message or \
-                        "Guild Log" in message or \
-                        ("You've already invited" in message and "to your guild! Wait for them to accept!" in message) or \
-                        " has requested to join the guild!" in message.lower() or \
-                        "Your mute will expire in " in message or \
-                        "Mute ID: " in message or \
-                        "No one earned guild experience on" in message or \
-                        "We blocked your comment" in message:
-                    # Guild log is sent as one fat message
-                    self.send_to_discord(message)
-                else:
-                    # large block messages, these should never conflict with above I think
-                    # Drop a stale buffer that was never properly closed, otherwise the
-                    # opening dashes of the next block get consumed as its "close".
-                    if self.wait_response and (time.time() - self.buffer_start) > 10:
-                        if SettingsConfig.printChat:
-                            print(f"{Color.GREEN}Minecraft{Color.RESET} > Stale chat buffer timed out, discarding")
-                        self.wait_response = False
-                        message_buffer.clear()
-                    if self.wait_response and (message.startswith("----------") or message.endswith("----------")):
-                        if SettingsConfig.printChat:
-                            print(f"{Color.GREEN}Minecraft{Color.RESET} > End of chat buffer")
-                        self.wait_response = False
-                        text = "\n".join(message_buffer)
-                        if (
-                                "Guild Name: " in text or
-                                "Top Guild Experience" in text or
-                            "No one earned guild experience on" in text or
-                                "Created: " in text
-                        ):
-                            self.send_to_discord(text)
-                        else:
-                            if SettingsConfig.printChat:
-                                print(f"{Color.GREEN}Minecraft{Color.RESET} > No useful text found, discarding")
-                        message_buffer.clear()
-                    elif message.startswith("-----") and message.endswith("-----") and not self.wait_response:
-                        self.wait_response = True
-                        self.buffer_start = time.time()
-                        if SettingsConfig.printChat:
-                            print(f"{Color.GREEN}Minecraft{Color.RESET} > Buffering chat...")
-                    if self.wait_response:
-                        message_buffer.append(message)
-                        return
+        def chat(message, *args):
+            self.handle_chat(message)
+
+        try:
+            self.install_chat_filter()
+        except Exception as e:
+            if "Call to 'on' timed out" in str(e):
+                raise
+            print(f"{Color.GREEN}Minecraft{Color.RESET} > Chat filter unavailable, filtering in Python: {e}")
+            self._on("messagestr")(chat)
+        else:
+            self._on(FILTERED_CHAT_EVENT)(chat)
+
+    def handle_chat(self, message: str):
+        """Route one chat line, called on the JS thread for every line the filter lets through."""
+        username = self.username
+        if username is None:
+            return
+        if SettingsConfig.printChat:
+            print(f"{Color.GREEN}Minecraft{Color.RESET} > Chat: {message}")
+        if _is_own_line(message, username):
+            # the echo of a line we sent, it went through
+            self.client.loop.call_soon_threadsafe(self.client.chat_scheduler.confirmed, message)
+            return
+        category = classify(message)
+        if category is ChatCategory.UNKNOWN_COMMAND and self.client.rtt_probe.awaiting_reply:
+            # the reply to our own /ping, measured and kept out of Discord
+            self.client.loop.call_soon_threadsafe(self.client.rtt_probe.pong, time.perf_counter())
+            self.client.loop.call_soon_threadsafe(self.client.dispatch, "minecraft_pong")
+        elif category is ChatCategory.COMMANDS_TOO_FAST:
+            self.client.loop.call_soon_threadsafe(self.client.chat_scheduler.throttled)
+        elif category is ChatCategory.SAME_MESSAGE_TWICE:
+            # timestamped here, the relay may be behind
+            self.client.loop.call_soon_threadsafe(self._repeat_rejected, message, time.perf_counter())
+        elif category in FORWARDED_CATEGORIES:
+            # Guild log is sent as one fat message
+            self.send_to_discord(message, category)
+        else:
+            # large block messages (/g info, /g list, /g top), framed on the event loop.
+            # Forwarded lines never enter the assembler, so chat interleaved with
+            # a block still goes out straight away.
+            self.client.chat_relay.push(message, None)
+
+    def install_chat_filter(self):
+        """
+        Filter chat inside Node so only relevant lines cross the bridge, as plain strings.
+
+        The pattern is built from the classifier, with chat logging enabled every line is passed.
+        With `rawChatPackets` the chat packet is flattened in JS instead of using messagestr.
+        """
+        chat_filter = javascript.require("./js/chat_filter.js")
+        assembler = self.client.chat_relay.assembler
+        chat_filter(self.bot, {
+            "pattern": prefilter_pattern(),
+            "passAll": bool(SettingsConfig.printChat),
+            "blockTimeout": assembler.timeout,
+            "blockLines": assembler.max_lines,
+            "eventName": FILTERED_CHAT_EVENT,
+            "source": "packet" if SettingsConfig.rawChatPackets else "messagestr",
+        })
 
     def send_minecraft_message(self, discord, message, type):
         if type == "General":
@@ -225,35 +442,83 @@ class MinecraftBotManager:
         message = message.replace("!o ", "/")
         self.bot.chat(message)
 
+    @staticmethod
+    def prepare_standby() -> str:
+        """
+        Warm up the Node runtime and refresh the standby session for the next connect.
+
+        Blocking, run it on the bridge executor. Returns the account's username.
+        """
+        global _standby
+        javascript.init()
+        javascript.require("mineflayer")
+        if _standby is None:
+            _standby = javascript.require("./js/standby.js").create(
+                javascript.require("prismarine-auth"), _bot_options()
+            )
+        return _standby.refresh(timeout=120)
+
+    @staticmethod
+    def refresh_tokens() -> str:
+        """
+        Refresh the cached Microsoft/Xbox/Minecraft tokens ahead of their expiry.
+
+        Blocking, run it on the bridge executor. Returns the account's username.
+        """
+        javascript.init()
+        username = javascript.require("./js/auth_cache.js").refresh(
+            javascript.require("prismarine-auth"), _bot_options(), timeout=120
+        )
+        if _standby is not None:
+            # the standby session still holds the old access token
+            _standby.invalidate()
+        return username
+
     @classmethod
-    def createbot(cls, client):
+    def createbot(cls, client, *, timings: dict = None, started: float = None):
+        timings = {} if timings is None else timings
+        started = time.perf_counter() if started is None else started
+        phase = time.perf_counter()
         javascript.init()
-        mineflayer = javascript.require("mineflayer")
+        timings["init"] = time.perf_counter() - phase
+        phase = time.perf_counter()
+        with bridge_metrics.timed("require"):
+            mineflayer = javascript.require("mineflayer")
+        if bridge_metrics.enabled:
+            # a fresh runtime, so the first report window has lag samples too
+            start_loop_lag_monitor()
+        timings["require"] = time.perf_counter() - phase
+        phase = time.perf_counter()
         print(f"{Color.GREEN}Minecraft{Color.RESET} > Creating the bot...")
-        bot = mineflayer.createBot(
-            {
-                "host": ServerConfig.host,
-                "port": ServerConfig.port,
-                "version": "1.8.9",
-                "username": AccountConfig.email,
-                "auth": "microsoft",
-                "profilesFolder": "/root/.minecraft/nmp-cache",
-                "viewDistance": "tiny",
-            }
-        )
+        options = _bot_options()
+        if SettingsConfig.hotStandby:
+            if _standby is None:
+                cls.prepare_standby()
+                timings["standby"] = time.perf_counter() - phase
+                phase = time.perf_counter()
+            # skips the Microsoft login while the standby session is fresh
+            bot = _standby.createBot(mineflayer, options)
+        else:
+            bot = javascript.require("./js/connect_timing.js").createBot(mineflayer, options)
+        if SettingsConfig.leanProfile:
+            javascript.require("./js/lean_profile.js")(bot)
+            print(f"{Color.GREEN}Minecraft{Color.RESET} > Using the chat-only bot profile")
         print(f"{Color.GREEN}Minecraft{Color.RESET} > Initialized")
+        timings["create"] = time.perf_counter() - phase
         botcls = cls(client, bot)
-        client.mineflayer_bot = botcls
+        botcls.relog_timings = timings
+        botcls._relog_started = started
+        # not published as `client.mineflayer_bot` until it spawns, see MinecraftSupervisor.connected
         botcls._starting = True
+        phase = time.perf_counter()
         try:
             botcls.oncommands()
         except Exception as e:
             if "Call to 'on' timed out" in str(e):
-                print(f"{Color.GREEN}Minecraft{Color.RESET} > Error: {e}")
-                print(f"{Color.GREEN}Minecraft{Color.RESET} > Restarting...")
-                botcls.stop()
-                return cls.createbot(client)
+                # the runtime is wedged, the supervisor retries with a fresh one
+                botcls.shutdown(terminate=True)
             raise
+        timings["register"] = time.perf_counter() - phase
         print(f"{Color.GREEN}Minecraft{Color.RESET} > Events registered")
         botcls._starting = False
         return botcls
@@ -0,0 +1,252 @@
+import asyncio
+import collections
+import enum
+import functools
+import random
+import time
+import traceback
+
+from core.bridge_executor import BreakerState
+from core.colors import Color
+from core.config import SettingsConfig
+from core.errors import BridgeUnavailable
+from core.minecraft_bot import MinecraftBotManager, terminate_runtime
+
+__all__ = ("ConnectionState", "MinecraftSupervisor")
+
+
+class ConnectionState(enum.Enum):
+    STOPPED = "stopped"
+    CONNECTING = "connecting"
+    ONLINE = "online"
+    BACKOFF = "backoff"
+    FAILED = "failed"
+
+
+class MinecraftSupervisor:
+    """
+    Owns the Minecraft connection lifecycle on the event loop.
+
+    Creating and tearing down bots are blocking bridge calls, so they run on the
+    client's `BridgeExecutor` like every other call into Node; JS callbacks only
+    report back through `connected` and `disconnected`.
+    Reconnects back off exponentially with jitter, and after `max_attempts` connects
+    in a row that never reach spawn (including kicks before logging in) the supervisor
+    gives up and enters FAILED.
+
+    With `hotStandby` a pre-authenticated session is refreshed in the background
+    while the bot is online, so a failover only has to reconnect to the server.
+    The time from a disconnect to the next spawn is kept in `failovers`.
+    """
+
+    # how often the standby session is refreshed while online, well within its max age
+    STANDBY_REFRESH_INTERVAL = 20 * 60
+    # bridge call timeouts, creating a bot may start Node and load mineflayer first,
+    # and the standby refresh waits up to 120s for the Microsoft login
+    CREATE_TIMEOUT = 180.0
+    STANDBY_TIMEOUT = 150.0
+    SHUTDOWN_TIMEOUT = 30.0
+
+    def __init__(self, client, *, base_delay: float = 3.0, max_delay: float = 300.0, max_attempts: int = 10):
+        self.client = client
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self.state = ConnectionState.STOPPED
+        # connects since the last successful spawn
+        self.attempts = 0
+        self.manager: MinecraftBotManager | None = None
+        # a bot that spawned while createbot was still registering its events
+        self._spawned_early: MinecraftBotManager | None = None
+        self._events: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._limbo_task: asyncio.Task | None = None
+        self._standby_task: asyncio.Task | None = None
+        # seconds from each disconnect to the next spawn, most recent last
+        self.failovers: collections.deque[float] = collections.deque(maxlen=20)
+        self._down_since: float | None = None
+
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        if self.running:
+            return
+        self.attempts = 0
+        self._events = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    def restart(self):
+        """Relog the current bot, or start over if the supervisor stopped or gave up."""
+        if not self.running:
+            self.start()
+        elif self.manager is not None:
+            self.manager.stop(True)
+
+    async def stop(self):
+        if self.running:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        for task in (self._limbo_task, self._standby_task):
+            if task is not None:
+                task.cancel()
+        self._down_since = None
+        manager = self.manager or self.client.mineflayer_bot
+        self.manager = None
+        await self._shutdown(manager, True)
+        self.state = ConnectionState.STOPPED
+
+    def backoff(self) -> float:
+        """Delay before the next connect; the first one after a working session is immediate."""
+        if self.attempts == 0:
+            return 0.0
+        delay = min(self.max_delay, self.base_delay * 2 ** (self.attempts - 1))
+        return random.uniform(delay / 2, delay)
+
+    # called on the loop through call_soon_threadsafe by the JS callbacks
+
+    def connected(self, manager: MinecraftBotManager):
+        if manager is not self.manager:
+            if self.manager is None and self.state is ConnectionState.CONNECTING:
+                # createbot hasn't returned yet, replayed by _run once it has
+                self._spawned_early = manager
+            return
+        self.state = ConnectionState.ONLINE
+        self.attempts = 0
+        # the bot is up on a working runtime
+        self.client.bridge.reset()
+        # only a spawned bot is published, so nothing ever sees a half-connected one
+        self.client.mineflayer_bot = manager
+        if self._down_since is not None:
+            self.failovers.append(time.perf_counter() - self._down_since)
+            self._down_since = None
+            print(f"{Color.GREEN}Minecraft{Color.RESET} > Back online after {self.failovers[-1]:.2f}s")
+        self.client.dispatch("minecraft_ready")
+        if self._limbo_task is not None:
+            self._limbo_task.cancel()
+        self._limbo_task = asyncio.create_task(self._send_to_limbo(manager))
+        if SettingsConfig.hotStandby and (self._standby_task is None or self._standby_task.done()):
+            self._standby_task = asyncio.create_task(self._refresh_standby())
+
+    def bridge_wedged(self, reason: str):
+        """The bridge executor tripped, reconnect on a fresh runtime."""
+        if self.manager is not None:
+            self.manager.stop(True, terminate=True)
+
+    def disconnected(self, manager: MinecraftBotManager, restart: bool, terminate: bool):
+        if restart and manager is self.manager and self._down_since is None:
+            self._down_since = time.perf_counter()
+        if self._events is not None:
+            self._events.put_nowait((manager, restart, terminate))
+
+    async def _send_to_limbo(self, manager: MinecraftBotManager):
+        await asyncio.sleep(3)
+        if manager is self.manager and manager.is_online():
+            await manager.chat("/limbo")
+
+    async def _shutdown(self, manager: MinecraftBotManager | None, terminate: bool) -> bool:
+        """Tear `manager` down (if any) and return whether the runtime was terminated."""
+        if manager is not None and not terminate:
+            try:
+                return await self.client.bridge.run(
+                    functools.partial(manager.shutdown, terminate=False), timeout=self.SHUTDOWN_TIMEOUT, name="shutdown"
+                )
+            except (BridgeUnavailable, asyncio.TimeoutError) as e:
+                print(f"{Color.GREEN}Minecraft{Color.RESET} > Could not dispose the bot, restarting the JS runtime: {e}")
+        if manager is not None:
+            manager.detach()
+        await self._terminate_runtime()
+        return True
+
+    async def _terminate_runtime(self):
+        """Kill the Node runtime, the next bot gets a fresh one and a closed breaker."""
+        if self.client.bridge.state is BreakerState.CLOSED:
+            try:
+                await self.client.bridge.run(terminate_runtime, timeout=self.SHUTDOWN_TIMEOUT, name="terminate")
+                return
+            except (BridgeUnavailable, asyncio.TimeoutError):
+                pass
+        # The one call made beside the bridge thread: that thread is stuck in (or was
+        # abandoned with) a call into the runtime being replaced, so queueing behind it
+        # would never run. Killing Node makes no bridge round trip and is what frees it.
+        await asyncio.get_running_loop().run_in_executor(None, terminate_runtime)
+        # the breaker tripped on the old runtime, the new one starts with a clean slate
+        self.client.bridge.reset()
+
+    async def _refresh_standby(self):
+        while self.state is ConnectionState.ONLINE:
+            try:
+                await self.client.bridge.run(
+                    MinecraftBotManager.prepare_standby, timeout=self.STANDBY_TIMEOUT, name="prepare_standby"
+                )
+            except Exception as e:
+                print(f"{Color.GREEN}Minecraft{Color.RESET} > Could not refresh the standby session: {e}")
+            await asyncio.sleep(self.STANDBY_REFRESH_INTERVAL)
+
+    async def _wait_for_disconnect(self, manager: MinecraftBotManager) -> tuple[bool, bool]:
+        while True:
+            reporter, restart, terminate = await self._events.get()
+            # ignore stale managers, and "end" following "kicked"
+            if reporter is manager:
+                return restart, terminate
+
+    async def _run(self):
+        old, restart, terminate = None, True, False
+        while True:
+            started = time.perf_counter()
+            timings = {}
+            if old is not None:
+                self.client.dispatch("minecraft_disconnected")
+                terminated = await self._shutdown(old, terminate)
+                timings["stop"] = time.perf_counter() - started
+                old = None
+                if terminated and restart:
+                    # give the old node process a moment to exit
+                    await asyncio.sleep(3)
+            if not restart:
+                self.state = ConnectionState.STOPPED
+                return
+            if self.attempts >= self.max_attempts:
+                self.state = ConnectionState.FAILED
+                print(
+                    f"{Color.GREEN}Minecraft{Color.RESET} > {Color.RED}[ERROR]{Color.RESET} "
+                    f"Giving up after {self.attempts} failed connection attempts"
+                )
+                return
+            delay = self.backoff()
+            if delay:
+                self.state = ConnectionState.BACKOFF
+                print(f"{Color.GREEN}Minecraft{Color.RESET} > Reconnecting in {delay:.1f}s (attempt {self.attempts + 1})")
+                await asyncio.sleep(delay)
+            self.state = ConnectionState.CONNECTING
+            self.attempts += 1
+            try:
+                manager = await self.client.bridge.run(
+                    functools.partial(MinecraftBotManager.createbot, self.client, timings=timings, started=started),
+                    timeout=self.CREATE_TIMEOUT,
+                    name="createbot",
+                )
+            except Exception as e:
+                self._spawned_early = None
+                print(f"{Color.GREEN}Minecraft{Color.RESET} > Failed to start the bot: {e}")
+                traceback.print_exc()
+                # start the next attempt with a fresh runtime
+                await self._terminate_runtime()
+                continue
+            self.manager = manager
+            spawned_early, self._spawned_early = self._spawned_early, None
+            if spawned_early is manager and manager.is_online():
+                self.connected(manager)
+            restart, terminate = await self._wait_for_disconnect(manager)
+            if self.manager is manager:
+                self.manager = None
+            if self.state is not ConnectionState.ONLINE:
+                print(f"{Color.GREEN}Minecraft{Color.RESET} > Disconnected before spawning")
+            else:
+                self.state = ConnectionState.CONNECTING
+            old = manager
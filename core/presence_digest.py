@@ -0,0 +1,111 @@
+import asyncio
+import enum
+import traceback
+from typing import Awaitable, Callable
+
+import discord
+
+from core.colors import Color
+
+__all__ = ("DigestKind", "PresenceDigest")
+
+
+class DigestKind(enum.Enum):
+    # (summary heading, embed colour)
+    ONLINE = ("members joined", 0x56F98A)
+    OFFLINE = ("members left", 0xFF6347)
+    GUILD_JOIN = ("players joined the guild", 0x1ABC9C)
+    GUILD_LEAVE = ("players left the guild", 0x1ABC9C)
+
+    @property
+    def heading(self) -> str:
+        return self.value[0]
+
+    @property
+    def colour(self) -> int:
+        return self.value[1]
+
+
+class PresenceDigest:
+    """
+    Folds storms of presence and guild join/leave notices into one embed per kind.
+
+    The first notice after a quiet spell is sent straight away. Notices arriving within
+    `window` seconds of it are held and sent together when the window closes: a single
+    one as its own embed, several as e.g. "12 members joined: ...". The window stays open
+    while notices keep arriving. A `window` of 0 sends every notice as it comes.
+    """
+
+    def __init__(self, send: Callable[[discord.Embed], Awaitable], *, window: float = 0.0):
+        self.send = send
+        self.window = window
+        self.digests = 0
+        self.digested = 0
+        self._pending: list[tuple[DigestKind, str, discord.Embed]] = []
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    async def add(self, kind: DigestKind, username: str, embed: discord.Embed):
+        if not self.window:
+            await self.send(embed)
+            return
+        if self.running:
+            self._pending.append((kind, username, embed))
+            return
+        self._task = asyncio.create_task(self._run())
+        await self.send(embed)
+
+    async def close(self):
+        """Stop the window and send whatever it was holding."""
+        if self.running:
+            self._task.cancel()
+        self._task = None
+        await self.flush()
+
+    async def flush(self):
+        pending, self._pending = self._pending, []
+        by_kind: dict[DigestKind, list[tuple[str, discord.Embed]]] = {}
+        for kind, username, embed in pending:
+            by_kind.setdefault(kind, []).append((username, embed))
+        for kind, entries in by_kind.items():
+            if len(entries) == 1:
+                await self.send(entries[0][1])
+                continue
+            self.digests += 1
+            self.digested += len(entries)
+            await self.send(self._summary(kind, [username for username, _ in entries]))
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "digests": self.digests,
+            "digested": self.digested,
+        }
+
+    @staticmethod
+    def _summary(kind: DigestKind, usernames: list[str]) -> discord.Embed:
+        heading = f"**{len(usernames)} {kind.heading}:** "
+        names = [discord.utils.escape_markdown(username) for username in usernames]
+        description = heading + ", ".join(names)
+        # embed descriptions are capped at 4096 characters
+        while len(description) > 4000:
+            names.pop()
+            description = heading + ", ".join(names) + f" and {len(usernames) - len(names)} more"
+        return discord.Embed(description=description, colour=kind.colour, timestamp=discord.utils.utcnow())
+
+    async def _run(self):
+        try:
+            while True:
+                await asyncio.sleep(self.window)
+                if not self._pending:
+                    return
+                try:
+                    await self.flush()
+                except Exception as e:
+                    print(f"{Color.CYAN}Discord{Color.RESET} > Failed to send presence digest: {e}")
+                    traceback.print_exc()
+        except asyncio.CancelledError:
+            pass
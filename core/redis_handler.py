@@ -4,6 +4,7 @@ import traceback
 import uuid
 import redis.asyncio as redis
 
+from core.chat_scheduler import ChatLane
 from core.colors import Color
 from core.config import RedisConfig
 
@@ -45,16 +46,20 @@ class RedisManager:
         return getattr(self.bot, "mineflayer_bot", None)
 
     async def process_request(self, message_data):
+        if message_data["endpoint"] == "stats":
+            return {"success": True, "data": await self.bot.collect_stats()}
         mineflayer_bot = self.mineflayer_bot
         if mineflayer_bot is None:
             return {"success": False, "error": "bot not connected"}
         if message_data["endpoint"] == "alive":
-            await mineflayer_bot.chat("/ping")
-            try:
-                await self.bot.wait_for("minecraft_pong", timeout=10)
-            except asyncio.TimeoutError:
+            rtt_probe = self.bot.rtt_probe
+            # answer from the background probe if it heard back recently
+            if rtt_probe.fresh() and rtt_probe.rtts:
+                return {"success": True, "rtt": rtt_probe.rtts[-1], "age": rtt_probe.age()}
+            rtt = await rtt_probe.probe(ChatLane.COMMAND)
+            if rtt is None:
                 return {"success": False, "error": "timeout"}
-            return {"success": True}
+            return {"success": True, "rtt": rtt, "age": 0.0}
         elif message_data["endpoint"] == "kick":
             await mineflayer_bot.chat("/g kick " + message_data["data"]["username"] + " " + message_data["data"]["reason"])
             try:
@@ -201,20 +206,24 @@ class RedisManager:
         except redis.ConnectionError as e:
             print(f"{Color.MAGENTA}Redis{Color.RESET} > Redis connection error: {e}")
         except Exception as e:  # pylint: disable=broad-exception-caught
-            print(f"{Color.MAGENTA}Redis{Color.RESET} > Critical error occurred\n" + str(e))
-            traceback.print_exc()
-            content = f"Critical error occurred in RedisManager: {e}"
-            content += "\n```\n" + traceback.format_exc() + "\n```"
-            if len(content) > 2000:
-                # remove end codeblock, send first chunk, then send rest w/ block
-                content = content[:-4]
-                for i in range(0, len(content), 2000):
-                    if i == 0:
-                        await self.bot.send_debug_message(content[i:i + 1996] + "\n```")
-                    else:
-                        await self.bot.send_debug_message("```\n" + content[i:i + 1992] + "\n```")
+            if not self.bot.error_aggregator.record("RedisManager", e):
+                # same error as the last one reported, it's counted in the next summary
+                print(f"{Color.MAGENTA}Redis{Color.RESET} > Critical error occurred again: {e}")
             else:
-                await self.bot.send_debug_message(content)
+                print(f"{Color.MAGENTA}Redis{Color.RESET} > Critical error occurred\n" + str(e))
+                traceback.print_exc()
+                content = f"Critical error occurred in RedisManager: {e}"
+                content += "\n```\n" + traceback.format_exc() + "\n```"
+                if len(content) > 2000:
+                    # remove end codeblock, send first chunk, then send rest w/ block
+                    content = content[:-4]
+                    for i in range(0, len(content), 2000):
+                        if i == 0:
+                            await self.bot.send_debug_message(content[i:i + 1996] + "\n```")
+                        else:
+                            await self.bot.send_debug_message("```\n" + content[i:i + 1992] + "\n```")
+                else:
+                    await self.bot.send_debug_message(content)
         finally:
             if self.redis is not None:
                 try:
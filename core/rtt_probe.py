@@ -0,0 +1,137 @@
+import asyncio
+import collections
+import time
+
+from core.chat_scheduler import ChatLane
+from core.colors import Color
+
+__all__ = ("RttProbe", "PROBE_LINE")
+
+PROBE_LINE = "/ping"
+
+
+class RttProbe:
+    """
+    Measures the chat round trip to Hypixel in the background.
+
+    Every `interval` seconds, if nothing else is waiting to be said, "/ping" is sent on
+    the idle lane and the time until Hypixel's "Unknown command" reply is recorded. Both
+    ends are timestamped where they cross the bridge (`sending` and `pong`), so queueing
+    on either side isn't counted. The reply to a probe in flight is consumed by the chat
+    callback, it never reaches Discord. The last `samples` round trips are kept, so health
+    checks can answer from recent data instead of probing themselves.
+    """
+
+    def __init__(self, client, *, interval: float = 60.0, timeout: float = 10.0, samples: int = 60):
+        self.client = client
+        self.interval = interval
+        self.timeout = timeout
+        self.rtts: collections.deque[float] = collections.deque(maxlen=samples)
+        self.failures = 0
+        # time.time() of the last answered probe
+        self.last_pong: float | None = None
+        # the round trip of the probe in flight, and when its line was handed to Node
+        self._pending: asyncio.Future | None = None
+        self._sent_at: float | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self.running:
+            self._task.cancel()
+        self._task = None
+
+    def age(self) -> float | None:
+        """Seconds since the last answered probe."""
+        return time.time() - self.last_pong if self.last_pong is not None else None
+
+    def fresh(self, max_age: float = None) -> bool:
+        """Whether Hypixel answered a probe within `max_age` seconds, two intervals by default."""
+        age = self.age()
+        return age is not None and age <= (max_age if max_age is not None else self.interval * 2)
+
+    def quantile(self, q: float) -> float | None:
+        if not self.rtts:
+            return None
+        ordered = sorted(self.rtts)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def stats(self) -> dict:
+        return {
+            "last": self.rtts[-1] if self.rtts else None,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "max": max(self.rtts) if self.rtts else None,
+            "samples": len(self.rtts),
+            "failures": self.failures,
+            "age": self.age(),
+        }
+
+    @property
+    def awaiting_reply(self) -> bool:
+        """Whether a probe line has been said and its reply is due, read from the JS thread."""
+        return self._sent_at is not None
+
+    def sending(self, message: str):
+        """Called on the bridge thread right before a line is said, stamps the probe's."""
+        if message == PROBE_LINE and self._pending is not None and self._sent_at is None:
+            self._sent_at = time.perf_counter()
+
+    def pong(self, at: float):
+        """An "Unknown command" reply arrived at `at` (perf_counter), answers the probe in flight."""
+        pending, sent_at = self._pending, self._sent_at
+        if pending is None or pending.done() or sent_at is None or at < sent_at:
+            # not ours, e.g. the reply to a mistyped game command
+            return
+        pending.set_result(at - sent_at)
+
+    async def probe(self, lane: ChatLane = ChatLane.IDLE) -> float | None:
+        """Send one probe and return the round trip, None if Hypixel didn't answer."""
+        if self._pending is not None:
+            # share the one in flight, a second /ping couldn't tell the replies apart
+            return await asyncio.shield(self._pending)
+        mineflayer_bot = self.client.mineflayer_bot
+        if mineflayer_bot is None or not mineflayer_bot.is_online():
+            return None
+        self._pending = pending = asyncio.get_running_loop().create_future()
+        self._sent_at = None
+        try:
+            if not await mineflayer_bot.chat(PROBE_LINE, lane=lane):
+                pending.set_result(None)
+                return None
+            rtt = await asyncio.wait_for(asyncio.shield(pending), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.failures += 1
+            if not pending.done():
+                pending.set_result(None)
+            return None
+        finally:
+            if not pending.done():
+                pending.set_result(None)
+            self._pending = None
+            self._sent_at = None
+        self.rtts.append(rtt)
+        self.last_pong = time.time()
+        return rtt
+
+    async def _run(self):
+        try:
+            while True:
+                await asyncio.sleep(self.interval)
+                # only probe while the chat queue is idle
+                while len(self.client.chat_scheduler):
+                    await asyncio.sleep(5)
+                try:
+                    await self.probe()
+                except Exception as e:
+                    print(f"{Color.GREEN}Minecraft{Color.RESET} > RTT probe failed: {e}")
+        except asyncio.CancelledError:
+            pass
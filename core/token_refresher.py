@@ -0,0 +1,99 @@
+import asyncio
+import time
+import traceback
+from typing import Callable
+
+from core.colors import Color
+from core.minecraft_bot import MinecraftBotManager, token_expiry
+
+
+class TokenRefresher:
+    """
+    Refreshes the cached Microsoft auth tokens before they expire.
+
+    minecraft-protocol only refreshes lazily while connecting, which puts the
+    Microsoft/Xbox round trips on the reconnect's critical path. This task reads
+    the cached token's expiry and refreshes it `lead` seconds ahead instead.
+
+    The refresh runs on the Node runtime the bot uses, through `bridge` like every
+    other call into it, and only while `when` returns True; connecting or tearing
+    down the bot may start or kill that runtime.
+    """
+
+    # the login itself gives up after 120s
+    REFRESH_TIMEOUT = 150.0
+
+    def __init__(self, bridge, *, lead: int = 3600, retry: int = 300):
+        self.bridge = bridge
+        self.lead = lead
+        self.retry = retry
+        self.refreshed_at: float | None = None
+        self.last_error: str | None = None
+        self._should_refresh: Callable[[], bool] | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    def start(self, *, when: Callable[[], bool] = None):
+        if self.running:
+            return
+        self._should_refresh = when
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self.running:
+            self._task.cancel()
+        self._task = None
+
+    def stats(self) -> dict:
+        expires_at = token_expiry()
+        return {
+            "expires_in": expires_at - time.time() if expires_at is not None else None,
+            "refreshed_ago": time.time() - self.refreshed_at if self.refreshed_at is not None else None,
+            "last_error": self.last_error,
+        }
+
+    async def refresh(self):
+        started = time.perf_counter()
+        username = await self.bridge.run(
+            MinecraftBotManager.refresh_tokens, timeout=self.REFRESH_TIMEOUT, name="refresh_tokens"
+        )
+        self.refreshed_at = time.time()
+        self.last_error = None
+        expires_at = token_expiry()
+        print(
+            f"{Color.GREEN}Minecraft{Color.RESET} > Refreshed auth tokens for {username} "
+            f"in {time.perf_counter() - started:.2f}s"
+            + (f", valid for {(expires_at - time.time()) / 3600:.1f}h" if expires_at is not None else "")
+        )
+
+    async def _run(self):
+        try:
+            while True:
+                expires_at = token_expiry()
+                if expires_at is None:
+                    # no cache until the first login has gone through
+                    await asyncio.sleep(self.retry)
+                    continue
+                delay = expires_at - self.lead - time.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if self._should_refresh is not None and not self._should_refresh():
+                    # the runtime may be starting or going away under us, try again later
+                    await asyncio.sleep(self.retry)
+                    continue
+                try:
+                    await self.refresh()
+                except Exception as e:
+                    self.last_error = str(e) or type(e).__name__
+                    print(f"{Color.GREEN}Minecraft{Color.RESET} > Auth token refresh failed: {e}")
+                    traceback.print_exc()
+                    await asyncio.sleep(self.retry)
+                else:
+                    if token_expiry() == expires_at:
+                        # nothing was refreshed, don't spin until it actually expires
+                        await asyncio.sleep(self.retry)
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,119 @@
+import asyncio
+import json
+import os
+import time
+import traceback
+
+import aiohttp
+
+from core.colors import Color
+from core.config import DataConfig
+
+GITHUB_COMMITS_URL = "https://api.github.com/repos/SkyKings-Network/GuildBridgeBot/commits/{branch}"
+
+
+async def get_latest_commit_sha(session: aiohttp.ClientSession = None) -> str:
+    """Fetch the latest commit SHA from GitHub using the API"""
+    close_session = session is None
+    if session is None:
+        session = aiohttp.ClientSession()
+    try:
+        current_branch = os.getenv("GIT_BRANCH", "main")
+        url = GITHUB_COMMITS_URL.format(branch=current_branch)
+        async with session.get(url, headers={'Accept': 'application/vnd.github.v3+json'}) as resp:
+            data = await resp.json()
+            return data['sha']
+    except Exception as e:
+        print(f"{Color.CYAN}Discord{Color.RESET} > Failed to get latest git SHA: {e}")
+        return "unknown"
+    finally:
+        if close_session:
+            await session.close()
+
+
+class UpdateChecker:
+    """
+    Keeps track of whether this bridge is behind the latest commit on GitHub.
+
+    The GitHub API is only queried from a background task every `interval` seconds,
+    the result is kept in memory and persisted in the `data` config section so a
+    restart doesn't need to hit the API again. Readers just check `outdated`.
+    """
+
+    def __init__(self, interval: int = 3600):
+        self.interval = max(interval, 60)
+        self.current_sha = os.getenv("GIT_SHA", "unknown")
+        self.latest_sha = DataConfig.latest_sha or "unknown"
+        self.checked_at = DataConfig.last_update_check or 0
+        # a cached sha other than ours predates this deploy, which may well be the
+        # latest commit by now, so check again right away instead of trusting it
+        if self.latest_sha != self.current_sha:
+            self.checked_at = 0
+        self.outdated = False
+        self._task: asyncio.Task | None = None
+
+    def _compare(self) -> bool:
+        if self.current_sha == "unknown" or self.latest_sha == "unknown":
+            return False
+        return self.current_sha != self.latest_sha
+
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        if self.running:
+            return
+        if self.current_sha == "unknown":
+            # not a tagged build, there is nothing to compare against
+            return
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self.running:
+            self._task.cancel()
+        self._task = None
+
+    async def refresh(self) -> bool:
+        latest_sha = await get_latest_commit_sha()
+        self.checked_at = int(time.time())
+        # keep the last known result if github could not be reached
+        if latest_sha != "unknown":
+            self.latest_sha = latest_sha
+            self.outdated = self._compare()
+            self._persist()
+        return self.outdated
+
+    def _persist(self):
+        DataConfig.latest_sha = self.latest_sha
+        DataConfig.last_update_check = self.checked_at
+        try:
+            with open("config.json", "r") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            data = {}
+        data.setdefault("data", {})
+        data["data"]["latest_sha"] = self.latest_sha
+        data["data"]["last_update_check"] = self.checked_at
+        try:
+            with open("config.json", "w") as f:
+                json.dump(data, f, indent=4)
+        except OSError as e:
+            print(f"{Color.CYAN}Discord{Color.RESET} > Failed to save update check result: {e}")
+
+    async def _run(self):
+        try:
+            while True:
+                delay = self.checked_at + self.interval - time.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                try:
+                    if await self.refresh():
+                        print(f"{Color.CYAN}Discord{Color.RESET} > A bridge update is available!")
+                except Exception as e:
+                    print(f"{Color.CYAN}Discord{Color.RESET} > Update check failed: {e}")
+                    traceback.print_exc()
+                    # don't spin on persistent failures
+                    self.checked_at = int(time.time())
+        except asyncio.CancelledError:
+            pass
@@ -5,12 +5,21 @@ import discord
 from discord.ext import commands, tasks
 from core.config import DiscordConfig, SettingsConfig, DataConfig, ServerConfig, AccountConfig, RedisConfig
 from core.checks import has_override_role, has_command_role
+from core.minecraft_supervisor import ConnectionState
 
 import json
 import aiohttp
 from datetime import datetime
 
 
+def _format_stat(key: str, value) -> str:
+    if isinstance(value, int) and key.startswith("node_"):
+        return f"{value / 1024 / 1024:.1f} MiB"
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return str(value)
+
+
 class Admin(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -101,7 +110,7 @@ class Admin(commands.Cog):
         embedVar = discord.Embed(color=0x1ABC9C).set_author(name="Restarting the bot...")
         await ctx.send(embed=embedVar)
         try:
-            self.bot.mineflayer_bot.stop(True)
+            self.bot.minecraft.restart()
         except Exception as e:
             print(e)
             embedVar = discord.Embed(color=0x1ABC9C).set_author(name="Error while restarting the bot!")
@@ -253,16 +262,32 @@ class Admin(commands.Cog):
         embedVar.set_footer(text=f"Requested by {ctx.author}")
         await ctx.send(embed=embedVar)
 
+    @commands.command()
+    @has_override_role
+    async def stats(self, ctx):
+        """Shows relay and bridge runtime gauges."""
+        stats = await self.bot.collect_stats()
+        embedVar = discord.Embed(
+            title="📈 Bridge Stats",
+            color=0x1ABC9C,
+            timestamp=discord.utils.utcnow()
+        )
+        for section, values in stats.items():
+            embedVar.add_field(
+                name=section.replace("_", " ").title(),
+                value="\n".join(f"**{key}:** `{_format_stat(key, value)}`" for key, value in values.items()) or "`-`",
+                inline=False
+            )
+        await ctx.send(embed=embedVar)
+
     @tasks.loop(seconds=60)
     async def check_bot_status(self):
         try:
-            if self.bot.mineflayer_bot is not None:
-                if self.bot.mineflayer_bot.is_online() or self.bot.mineflayer_bot.is_starting():
-                    pass
-                else:
-                    print("Discord > Bot is offline!")
-                    await self.bot.close()
-                    await asyncio.sleep(10)
+            # reconnects are handled by the supervisor, only give up once it has
+            if self.bot.minecraft.state is ConnectionState.FAILED:
+                print("Discord > Bot is offline!")
+                await self.bot.close()
+                await asyncio.sleep(10)
         except Exception as e:
             print(e)
 
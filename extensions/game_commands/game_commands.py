@@ -10,6 +10,7 @@ import traceback
 import time
 import re
 
+from core.chat_scheduler import ChatLane
 from core.colors import Color
 
 from discord.ext import commands
@@ -139,7 +140,7 @@ class GameCommands(commands.Cog):
         msg = f"[CMD] {name}: {content}"
         if GameCommandConfig.use_antispam:
             msg += f" / {self.antispam}"
-        await self.bot.mineflayer_bot.chat(cmd + msg)
+        await self.bot.mineflayer_bot.chat(cmd + msg, lane=ChatLane.COMMAND)
         try:
             await self.bot.wait_for("hypixel_guild_message_send_failed", timeout=1)
             print("Command output blocked.")
@@ -147,7 +148,9 @@ class GameCommands(commands.Cog):
             pass
         else:
             while True:
-                await self.bot.mineflayer_bot.chat(cmd + "Output blocked, check Discord. / " + self.antispam)
+                await self.bot.mineflayer_bot.chat(
+                    cmd + "Output blocked, check Discord. / " + self.antispam, lane=ChatLane.COMMAND
+                )
                 try:
                     await self.bot.wait_for("hypixel_guild_message_send_failed", timeout=1)
                 except asyncio.TimeoutError:
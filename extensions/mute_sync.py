@@ -9,6 +9,7 @@ import traceback
 
 import discord
 
+from core.chat_events import parse_duration
 from core.colors import Color
 
 import aiohttp
@@ -115,9 +116,11 @@ class MuteSync(commands.Cog):
 
     async def get_guild_mutes(self):
         # wait for this to be populated
-        while self.bot.mineflayer_bot.bot.username is None:
+        while self.bot.mineflayer_bot is None or self.bot.mineflayer_bot.username is None:
             await asyncio.sleep(.5)
-        bot_uuid = await self.get_uuid(self.bot.mineflayer_bot.bot.username)
+        bot_uuid = self.bot.mineflayer_bot.uuid
+        if bot_uuid is None:
+            bot_uuid = await self.get_uuid(self.bot.mineflayer_bot.username)
         session = await self.get_session()
         mute_data = []
         async with session.get(
@@ -235,14 +238,8 @@ class MuteSync(commands.Cog):
     @commands.Cog.listener()
     async def on_hypixel_guild_member_muted(self, _, player, duration):
         print(f"{Color.MAGENTA}Mute Sync{Color.RESET} > Received mute for {player} for {duration}")
-        # hypixel does not allow specific durations (e.g. 1d 1h, only 1h or 1d)
-        if duration[-1] == "d":
-            delta = datetime.timedelta(days=int(duration[:-1]))
-        elif duration[-1] == "h":
-            delta = datetime.timedelta(hours=int(duration[:-1]))
-        elif duration[-1] == "m":
-            delta = datetime.timedelta(minutes=int(duration[:-1]))
-        else:
+        delta = parse_duration(duration)
+        if delta is None:
             raise Exception("Invalid duration")
         await self.process_new_mute(player, delta)
 
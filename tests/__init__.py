@@ -0,0 +1,10 @@
+import os
+import tempfile
+
+# core.config loads its settings at import time and may write config.json to the
+# working directory, so run the tests from a scratch directory on env config
+os.environ.setdefault("BRIDGE_USE_ENV_CONFIG", "1")
+os.environ.setdefault("BRIDGE_ACCOUNT_EMAIL", "bridge@example.com")
+os.environ.setdefault("BRIDGE_DISCORD_TOKEN", "token")
+os.environ.setdefault("BRIDGE_DISCORD_CHANNEL", "1")
+os.chdir(tempfile.mkdtemp(prefix="bridge-tests-"))
@@ -0,0 +1,45 @@
+import asyncio
+
+from core.chat_classifier import ChatCategory
+from core.chat_scheduler import ChatScheduler
+from core.minecraft_bot import MinecraftBotManager
+from core.rtt_probe import RttProbe
+
+
+class FakeRelay:
+    def __init__(self):
+        self.pushed: list[tuple[str, ChatCategory]] = []
+
+    def push(self, message, category):
+        self.pushed.append((message, category))
+
+
+class FakeClient:
+    """The parts of DiscordBridgeBot the Minecraft side talks to, create it on a running loop."""
+
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.chat_relay = FakeRelay()
+        self.chat_scheduler = ChatScheduler()
+        self.rtt_probe = RttProbe(self, timeout=0.5)
+        self.mineflayer_bot = None
+        self.dispatched: list[str] = []
+
+    def dispatch(self, event, *args):
+        self.dispatched.append(event)
+
+    def debug(self, message):
+        pass
+
+
+class FakeManager(MinecraftBotManager):
+    """An online bot that records what it says instead of going through Node."""
+
+    def __init__(self, client, username: str = "Bot"):
+        super().__init__(client, None)
+        self.username = username
+        self._online = True
+        self.said: list[str] = []
+
+    async def send_chat(self, message):
+        self.said.append(message)
@@ -0,0 +1,131 @@
+import asyncio
+import unittest
+
+from core.block_assembler import BlockAssembler
+from core.chat_classifier import ChatCategory
+
+DASHES = "-----------------------------------------------------"
+
+GUILD_INFO = [
+    DASHES,
+    "                         Bridge Guild",
+    "",
+    "Created: 2025-11-11 10:12 EST",
+    "Members: 12/125",
+    "Description: Guild",
+    "MOTD:",
+    "",
+    "Guild Exp: 1000 (#1)",
+    "Guild Level: 10",
+    "Daily Exp:",
+    "  2025-11-11: 100 Guild Experience",
+    DASHES,
+]
+
+GUILD_LIST = [
+    DASHES,
+    "Guild Name: Bridge Guild",
+    "",
+    "-- Guild Master --",
+    "[MVP+] Player ●",
+    "",
+    "Total Members: 1",
+    "Online Members: 1",
+    DASHES,
+]
+
+GUILD_TOP = [
+    DASHES,
+    "Top Guild Experience",
+    "2025-11-11 (today)",
+    "1. [MVP+] Player 100 Guild Experience",
+    "2. [VIP] Other 50 Guild Experience",
+    "3. Someone 10 Guild Experience",
+    DASHES,
+]
+
+UNKNOWN = [
+    DASHES,
+    "Some other box",
+    "with lines",
+    "nobody",
+    "recognises",
+    "at all",
+    DASHES,
+]
+
+
+class BlockAssemblerTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.emitted: list[tuple[str, ChatCategory]] = []
+        self.assembler = BlockAssembler(
+            lambda text, category: self.emitted.append((text, category)), timeout=0.05, max_lines=100
+        )
+
+    def feed(self, lines):
+        for line in lines:
+            self.assembler.feed(line)
+
+    def categories(self):
+        return [category for _, category in self.emitted]
+
+    async def test_blocks_are_emitted_on_close(self):
+        self.feed(GUILD_INFO + GUILD_LIST + GUILD_TOP)
+        self.assertEqual(
+            self.categories(), [ChatCategory.GUILD_INFO, ChatCategory.GUILD_LIST, ChatCategory.GUILD_TOP]
+        )
+        self.assertFalse(self.assembler.open)
+        self.assertFalse(self.assembler.draining)
+
+    async def test_timed_out_info_is_dropped_and_its_close_swallowed(self):
+        self.feed(GUILD_INFO[:6])
+        await asyncio.sleep(0.06)
+        self.assertTrue(self.assembler.draining)
+        self.feed(GUILD_INFO[6:])
+        self.feed(GUILD_LIST)
+        self.feed(GUILD_INFO)
+        self.assertEqual(self.categories(), [ChatCategory.GUILD_LIST, ChatCategory.GUILD_INFO])
+        self.assertFalse(self.assembler.open)
+
+    async def test_timed_out_top_is_emitted_once(self):
+        self.feed(GUILD_TOP[:4])
+        await asyncio.sleep(0.06)
+        self.feed(GUILD_TOP[4:])
+        self.feed(GUILD_LIST)
+        self.assertEqual(self.categories(), [ChatCategory.GUILD_TOP, ChatCategory.GUILD_LIST])
+        self.assertEqual(self.emitted[0][0], "\n".join(GUILD_TOP[:4]))
+
+    async def test_overflow_drains_the_rest_of_the_block(self):
+        self.assembler.max_lines = 4
+        self.feed(GUILD_TOP)
+        self.assertEqual(self.categories(), [ChatCategory.GUILD_TOP])
+        self.assembler.max_lines = 100
+        self.feed(GUILD_LIST)
+        self.assertEqual(self.categories(), [ChatCategory.GUILD_TOP, ChatCategory.GUILD_LIST])
+
+    async def test_overflowing_list_is_not_emitted(self):
+        self.assembler.max_lines = 4
+        self.feed(GUILD_LIST)
+        self.assertEqual(self.emitted, [])
+        self.assembler.max_lines = 100
+        self.feed(GUILD_INFO)
+        self.assertEqual(self.categories(), [ChatCategory.GUILD_INFO])
+
+    async def test_unknown_block_is_drained(self):
+        self.feed(UNKNOWN)
+        self.assertEqual(self.emitted, [])
+        self.assertFalse(self.assembler.draining)
+        self.feed(GUILD_INFO + GUILD_LIST)
+        self.assertEqual(self.categories(), [ChatCategory.GUILD_INFO, ChatCategory.GUILD_LIST])
+
+    async def test_drain_gives_up_without_a_close(self):
+        self.feed(UNKNOWN[:-1])
+        self.assertTrue(self.assembler.draining)
+        await asyncio.sleep(0.06)
+        self.assertFalse(self.assembler.draining)
+        self.feed(GUILD_LIST)
+        self.assertEqual(self.categories(), [ChatCategory.GUILD_LIST])
+
+
+if __name__ == "__main__":
+    unittest.main()
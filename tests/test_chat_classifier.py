@@ -0,0 +1,111 @@
+import re
+import unittest
+
+from core.chat_classifier import _PHRASES, FORWARDED_CATEGORIES, ChatCategory, classify, prefilter_pattern
+
+CASES = [
+    ("Guild > [MVP+] Player [Staff]: hello there", ChatCategory.GUILD_CHAT),
+    ("Guild > Player joined.", ChatCategory.GUILD_PRESENCE),
+    ("Guild > Player left.", ChatCategory.GUILD_PRESENCE),
+    ("Officer > [VIP] Player [Officer]: hi", ChatCategory.OFFICER_CHAT),
+    ("Guild Log (Page 1 of 10)", ChatCategory.GUILD_LOG),
+    ("[VIP] Player joined the guild!", ChatCategory.MEMBER_JOIN),
+    ("[VIP] Player left the guild!", ChatCategory.MEMBER_LEAVE),
+    ("[VIP] Player was promoted from Member to Officer", ChatCategory.MEMBER_PROMOTE),
+    ("[VIP] Player was demoted from Officer to Member", ChatCategory.MEMBER_DEMOTE),
+    ("[VIP] Player was kicked from the guild by [MVP+] Other!", ChatCategory.MEMBER_KICK),
+    ("[VIP] Player was kicked from the guild!", ChatCategory.MEMBER_KICK),
+    ("Disabled guild join/leave notifications!", ChatCategory.NOTIFICATIONS_DISABLED),
+    ("Enabled guild join/leave notifications!", ChatCategory.NOTIFICATIONS_ENABLED),
+    ("You cannot say the same message twice!", ChatCategory.SAME_MESSAGE_TWICE),
+    ("You are sending commands too fast! Please slow down.", ChatCategory.COMMANDS_TOO_FAST),
+    ("You don't have access to the officer chat!", ChatCategory.NO_OFFICER_ACCESS),
+    (
+        "You invited [VIP] Player to your guild. They have 5 minutes to accept.",
+        ChatCategory.INVITE_SENT,
+    ),
+    ("You sent an offline invite to [VIP] Player! They will have 5 minutes", ChatCategory.INVITE_SENT),
+    ("[VIP] Player is already in another guild!", ChatCategory.INVITE_IN_OTHER_GUILD),
+    ("[VIP] Player is already in your guild!", ChatCategory.INVITE_IN_THIS_GUILD),
+    ("You cannot invite this player to your guild!", ChatCategory.INVITE_BLOCKED),
+    (
+        "You've already invited [VIP] Player to your guild! Wait for them to accept!",
+        ChatCategory.INVITE_ALREADY_SENT,
+    ),
+    ("[VIP] Player has requested to join the Guild!", ChatCategory.JOIN_REQUEST),
+    ("Your guild is full!", ChatCategory.GUILD_FULL),
+    ("[MVP+] Player has muted the guild chat for 1h", ChatCategory.GUILD_CHAT_MUTED),
+    ("[MVP+] Player has unmuted the guild chat!", ChatCategory.GUILD_CHAT_UNMUTED),
+    ("[MVP+] Player has muted [VIP] Other for 1h", ChatCategory.MEMBER_MUTE),
+    ("[MVP+] Player has unmuted [VIP] Other", ChatCategory.MEMBER_UNMUTE),
+    ("You're currently guild muted for 1h!", ChatCategory.BOT_GUILD_MUTED),
+    ("Your mute will expire in 29d", ChatCategory.BOT_MUTED),
+    ("Mute ID: #ab12cd34", ChatCategory.MUTE_ID),
+    ("Click here to accept or type /guild accept Player!", ChatCategory.GUILD_INVITE_RECEIVED),
+    ("We blocked your comment as it breaks our rules", ChatCategory.COMMENT_BLOCKED),
+    ("Created: 2025-11-11 10:12 EST\nMembers: 12/125", ChatCategory.GUILD_INFO),
+    ("Guild Name: Bridge\n\nTotal Members: 1\nOnline Members: 1", ChatCategory.GUILD_LIST),
+    ("Top Guild Experience\n2025-11-11 (today)", ChatCategory.GUILD_TOP),
+    ("No one earned guild experience on 2025-11-11", ChatCategory.NO_GUILD_EXPERIENCE),
+    ("Unknown command. Type \"/help\" for help.", ChatCategory.UNKNOWN_COMMAND),
+    ("[VIP] Player: hello", ChatCategory.OTHER),
+    ("", ChatCategory.OTHER),
+]
+
+# A higher priority phrase sitting inside the span a greedy lower priority phrase
+# matches still wins, wherever it is in the line.
+OVERLAPPING = [
+    ("You invited Guild Log to your guild. They have 5 minutes to accept.", ChatCategory.GUILD_LOG),
+    ("Created: today [VIP] Player joined the guild! Members: 2/125", ChatCategory.MEMBER_JOIN),
+    ("[MVP+] Player has muted Player left the guild! for 1h", ChatCategory.MEMBER_LEAVE),
+    ("[MVP+] Player has muted [VIP] Other for 1h, Unknown command", ChatCategory.MEMBER_MUTE),
+]
+
+
+def _reference(message: str) -> ChatCategory:
+    # the obvious, slow way: every phrase on its own, in priority order
+    for category, pattern in _PHRASES:
+        if re.search(pattern, message):
+            return category
+    return ChatCategory.OTHER
+
+
+def _nested() -> list[str]:
+    """Every pair of phrase lines, one spliced into the other at each word boundary."""
+    phrases = {category for category, _ in _PHRASES}
+    samples = [message for message, category in CASES if category in phrases]
+    lines = []
+    for outer in samples:
+        words = outer.split(" ")
+        for inner in samples:
+            for cut in range(len(words) + 1):
+                lines.append(" ".join(words[:cut] + [inner] + words[cut:]))
+    return lines
+
+
+class ClassifyTest(unittest.TestCase):
+    def test_categories(self):
+        for message, category in CASES:
+            with self.subTest(message=message):
+                self.assertIs(classify(message), category)
+
+    def test_priority_ignores_position(self):
+        for message, category in OVERLAPPING:
+            with self.subTest(message=message):
+                self.assertIs(classify(message), category)
+
+    def test_single_scan_matches_priority_order(self):
+        for message in _nested():
+            with self.subTest(message=message):
+                self.assertIs(classify(message), _reference(message))
+
+    def test_prefilter_keeps_every_forwarded_line(self):
+        prefilter = re.compile(prefilter_pattern(), re.IGNORECASE)
+        for message, category in CASES + OVERLAPPING:
+            if category in FORWARDED_CATEGORIES:
+                with self.subTest(message=message):
+                    self.assertIsNotNone(prefilter.search(message))
+
+
+if __name__ == "__main__":
+    unittest.main()
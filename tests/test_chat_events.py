@@ -0,0 +1,32 @@
+import unittest
+
+from core.chat_classifier import ChatCategory
+from core.chat_events import GuildChat, MemberPresence, Notice, OfficerChat, parse_event
+
+
+class ParseChatTest(unittest.TestCase):
+    def test_chat(self):
+        event = parse_event("Guild > [MVP+] Player [Staff]: hello: there")
+        self.assertIsInstance(event, GuildChat)
+        self.assertEqual((event.username, event.rank, event.guild_rank), ("Player", "MVP+", "Staff"))
+        self.assertEqual(event.message, "hello: there")
+        self.assertIsInstance(parse_event("Officer > Player: hi"), OfficerChat)
+
+    def test_presence(self):
+        event = parse_event("Guild > [VIP] Player joined.")
+        self.assertIsInstance(event, MemberPresence)
+        self.assertEqual((event.username, event.joined), ("Player", True))
+        event = parse_event("Guild > [VIP] Player went somewhere")
+        self.assertEqual((event.username, event.joined), ("Player", False))
+
+    def test_unexpected_lines_fall_back_to_a_notice(self):
+        for message in ("Guild > Rank changed: see /g log", "Officer > :)", "Guild >", "Guild >   "):
+            with self.subTest(message=message):
+                event = parse_event(message)
+                self.assertIsInstance(event, Notice)
+                self.assertIs(event.category, ChatCategory.OTHER)
+                self.assertEqual(event.text, message)
+
+
+if __name__ == "__main__":
+    unittest.main()
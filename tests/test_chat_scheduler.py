@@ -0,0 +1,63 @@
+import asyncio
+import unittest
+
+from core.chat_classifier import ChatCategory
+from core.chat_scheduler import ChatLane
+from tests.fakes import FakeClient, FakeManager
+
+REFUSED = "You cannot say the same message twice!"
+
+
+class RepeatRejectionTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.client = FakeClient()
+        self.scheduler = self.client.chat_scheduler
+        self.scheduler.start()
+        self.manager = FakeManager(self.client)
+
+    async def asyncTearDown(self):
+        self.scheduler.stop()
+
+    async def say(self, message, lane=None):
+        self.assertTrue(await self.scheduler.send(self.manager, message, lane))
+
+    async def hear(self, line):
+        self.manager.handle_chat(line)
+        # the callback hands over to the loop
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+    async def test_refused_command_output_is_reported(self):
+        await self.say("/gc [CMD] Alice: 5 coins", ChatLane.COMMAND)
+        await self.say("/gc Bob: hello")
+        await self.hear(REFUSED)
+        # belongs to the game command line, which GameCommands handles on its own
+        self.assertEqual(self.client.chat_relay.pushed, [(REFUSED, ChatCategory.SAME_MESSAGE_TWICE)])
+        # the relayed line behind it is still the next one waiting for its echo
+        await self.hear(REFUSED)
+        await asyncio.sleep(0.05)
+        self.assertEqual(len(self.client.chat_relay.pushed), 1)
+        self.assertEqual(len(self.manager.said), 3)
+        self.assertTrue(self.manager.said[2].startswith("/gc Bob: hello "))
+
+    async def test_presence_lines_are_not_echoes(self):
+        await self.say("/gc Bob: hello")
+        await self.hear("Guild > Bot joined.")
+        await self.hear("Guild > [VIP] Bot left.")
+        # the chat line is still unconfirmed, so the refusal is about it
+        await self.hear(REFUSED)
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.client.chat_relay.pushed[-1:], [("Guild > [VIP] Bot left.", ChatCategory.GUILD_PRESENCE)])
+        self.assertEqual(len(self.manager.said), 2)
+
+    async def test_echo_confirms_the_line(self):
+        await self.say("/gc Bob: hello")
+        await self.hear("Guild > [MVP+] Bot [Staff]: Bob: hello")
+        await self.hear(REFUSED)
+        # nothing left to match, so it's reported
+        self.assertEqual(self.client.chat_relay.pushed, [(REFUSED, ChatCategory.SAME_MESSAGE_TWICE)])
+        self.assertEqual(len(self.manager.said), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import asyncio
+import unittest
+
+from core.chat_classifier import ChatCategory
+from tests.fakes import FakeClient, FakeManager
+
+UNKNOWN_COMMAND = 'Unknown command. Type "/help" for help.'
+
+
+class FakeBot:
+    """Says lines instantly and has Hypixel answer each with `reply`."""
+
+    def __init__(self, client, manager, reply):
+        self.client = client
+        self.manager = manager
+        self.reply = reply
+
+    def is_online(self):
+        return True
+
+    async def chat(self, message, *, lane=None):
+        self.client.rtt_probe.sending(message)
+        if self.reply is not None:
+            self.client.loop.call_later(0.01, self.manager.handle_chat, self.reply)
+        return True
+
+
+class RttProbeTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.client = FakeClient()
+        self.manager = FakeManager(self.client)
+
+    async def test_probe_reply_is_not_forwarded(self):
+        self.client.mineflayer_bot = FakeBot(self.client, self.manager, UNKNOWN_COMMAND)
+        rtt = await self.client.rtt_probe.probe()
+        await asyncio.sleep(0)
+        self.assertIsNotNone(rtt)
+        self.assertEqual(self.client.chat_relay.pushed, [])
+        self.assertIn("minecraft_pong", self.client.dispatched)
+        self.assertFalse(self.client.rtt_probe.awaiting_reply)
+
+    async def test_other_unknown_command_is_forwarded(self):
+        self.manager.handle_chat(UNKNOWN_COMMAND)
+        await asyncio.sleep(0)
+        self.assertEqual(self.client.chat_relay.pushed, [(UNKNOWN_COMMAND, ChatCategory.UNKNOWN_COMMAND)])
+
+    async def test_unanswered_probe(self):
+        self.client.mineflayer_bot = FakeBot(self.client, self.manager, None)
+        self.client.rtt_probe.timeout = 0.05
+        self.assertIsNone(await self.client.rtt_probe.probe())
+        self.assertEqual(self.client.rtt_probe.failures, 1)
+        # a late reply is nobody's now and goes to Discord like any other
+        self.manager.handle_chat(UNKNOWN_COMMAND)
+        self.assertEqual(len(self.client.chat_relay.pushed), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()